@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after ``ttl_seconds``.
+
+    Every ``get`` and ``set`` first sweeps out all entries that have expired, not only
+    the one asked for; the sweep is skipped until the earliest expiry is due, so it
+    costs nothing most of the time. ``expire()`` runs the same sweep for callers that
+    must not rely on traffic (e.g. from a timer). When the cache is full the least
+    recently used entry is evicted. ``on_evict(key, value)`` is called for every entry
+    that leaves the cache (eviction, expiry, invalidation or clear). Hit, miss, eviction
+    and expiry counts are kept for ``stats()``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # no entry expires before this, so sweeps until then can be skipped
+        self._next_expiry = float("inf")
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _drop(self, key: Hashable, counter: str):
+        _, value = self._data.pop(key)
+        self._counts[counter] += 1
+        if self._on_evict:
+            self._on_evict(key, value)
+
+    def _sweep(self, now: float) -> int:
+        if now < self._next_expiry:
+            return 0
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            self._drop(key, "expirations")
+        self._next_expiry = min((expires_at for expires_at, _ in self._data.values()), default=float("inf"))
+        return len(expired)
+
+    def expire(self) -> int:
+        """Drop every expired entry now; returns how many were dropped."""
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._sweep(self._clock())
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._counts["misses"] += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                self._drop(key, "expirations")
+                self._counts["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._counts["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store ``value``; ``ttl_seconds`` overrides the cache TTL for this entry."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            if key in self._data:
+                self._drop(key, "invalidations")
+            self._data[key] = (now + ttl, value)
+            self._next_expiry = min(self._next_expiry, now + ttl)
+            while len(self._data) > self.maxsize:
+                self._drop(next(iter(self._data)), "evictions")
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._drop(key, "invalidations")
+            return True
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._drop(key, "invalidations")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                **self._counts,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": self._counts["hits"] / lookups if lookups else 0.0,
+            }
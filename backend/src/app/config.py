@@ -15,6 +15,14 @@ class Settings(BaseSettings):
     AUTH0_API_DEFAULT_AUDIENCE: str
     AUTH0_APPLICATION_CLIENT_ID: str
     AUTH0_APPLICATION_CLIENT_SECRET: str
+    AUTH_JWKS_REFRESH_SECONDS: float = 3600.0  # background refetch interval for the Auth0 JWKS
+    AUTH_JWKS_MIN_REFETCH_SECONDS: float = 30.0  # minimum gap between refetches triggered by an unknown kid
+    AUTH_CLAIMS_CACHE_SIZE: int = 4096  # verified bearer tokens remembered (LRU beyond this)
+    AUTH_CLAIMS_CACHE_TTL_SECONDS: float = 300.0  # longest a verified token skips re-verification (never past exp)
+    AUTH_USERINFO_CACHE_SIZE: int = 1024  # Auth0 userinfo responses remembered per bearer token (LRU beyond this)
+    AUTH_USERINFO_CACHE_TTL_SECONDS: float = 900.0  # longest a profile is reused before asking Auth0 again (never past exp)
+    USER_ID_CACHE_SIZE: int = 10000  # Auth0 sub -> local user id mappings kept in process (LRU beyond this)
+    USER_ID_CACHE_TTL_SECONDS: float = 3600.0  # re-read a user's id after this; upsert_user invalidates sooner
     #AUTH0_TEST_USERNAME: str
     #AUTH0_TEST_PASSWORD: str
     
@@ -25,10 +33,53 @@ class Settings(BaseSettings):
     # Plaid configuration
     PLAID_CLIENT_ID: str
     PLAID_SECRET: str
-    PLAID_ENV: str = "sandbox"  # sandbox, development, or production
+    PLAID_ENV: str = "sandbox"  # sandbox, development, production, or local (infra/plaid_standin.py)
+    PLAID_LOCAL_HOST: str = "http://127.0.0.1:8100"  # Plaid stand-in used when PLAID_ENV=local
+    PLAID_SYNC_QUEUE_SIZE: int = 2  # pages buffered between fetcher and writer in pipelined sync
+    PLAID_SYNC_MAX_PAGE_SIZE: int = 500  # transactions/sync count for backfills (Plaid's maximum)
+    PLAID_SYNC_INCREMENTAL_PAGE_SIZE: int = 100  # starting count when resuming from a stored cursor
+    PLAID_SYNC_MIN_PAGE_SIZE: int = 50  # floor for the adaptive page size
+    PLAID_SYNC_TARGET_PAGE_SECONDS: float = 5.0  # pages slower than this (fetch + write) shrink the next count
+    PLAID_SYNC_MAX_WORKERS: int = 4  # items synced concurrently by the scheduler
+    PLAID_SYNC_PER_INSTITUTION: int = 2  # concurrent syncs against a single institution
+    PLAID_RATE_LIMIT_PER_MINUTE: int = 1000  # Plaid requests per minute across all syncs
+    PLAID_HTTP_POOL_SIZE: int = 20  # max pooled connections for the async Plaid client
+    PLAID_HTTP_KEEPALIVE: int = 10  # idle keep-alive connections kept in the pool
+    PLAID_HTTP_TIMEOUT_SECONDS: float = 30.0
+    PLAID_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    PLAID_ACCOUNTS_CONCURRENCY: int = 4  # connections queried at once by GET /plaid/accounts
+    PLAID_ACCOUNTS_TIMEOUT_SECONDS: float = 8.0  # per-connection budget before it is reported as an error
+    PLAID_ACCOUNTS_CACHE_TTL_SECONDS: float = 300.0  # how long /accounts/get results are reused per item
+    PLAID_ACCOUNTS_CACHE_SIZE: int = 1024  # items kept in the accounts cache (LRU beyond this)
+    PLAID_RETRY_MAX_ATTEMPTS: int = 4  # tries per Plaid call for retryable errors (rate limits, outages)
+    PLAID_RETRY_BASE_DELAY_SECONDS: float = 0.5  # first backoff ceiling; doubles per attempt, full jitter
+    PLAID_RETRY_MAX_DELAY_SECONDS: float = 20.0  # longest single wait; a longer Retry-After gives up instead
+    PLAID_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive institution outages before its circuit opens
+    PLAID_BREAKER_RESET_SECONDS: float = 60.0  # how long an open circuit rejects calls before a trial call
+    INSTITUTION_CACHE_SIZE: int = 512  # institution names kept in process (LRU beyond this)
+    INSTITUTION_CACHE_TTL_SECONDS: float = 86400.0  # re-read from the institutions table after this
+
+    # Background sync jobs
+    SYNC_JOBS_DB_PATH: str = "sync_jobs.db"  # local SQLite file holding the job queue
+    SYNC_JOB_WORKERS: int = 2  # item syncs run concurrently by the job queue
+    SYNC_JOB_HEARTBEAT_SECONDS: float = 10.0  # how often a worker process marks its running jobs alive
+    SYNC_JOB_STALE_SECONDS: float = 60.0  # running jobs without a heartbeat for this long are requeued
+    PLAID_WEBHOOK_DEBOUNCE_SECONDS: float = 5.0  # window in which webhooks for one item collapse into one sync
+    PLAID_WEBHOOK_URL: str = ""  # public URL of /plaid/webhook, registered on items at Link time (empty: no webhooks)
+    PLAID_WEBHOOK_VERIFICATION: bool = True  # check the Plaid-Verification JWT; always on when PLAID_ENV=production
+    PLAID_WEBHOOK_MAX_AGE_SECONDS: float = 300.0  # webhooks signed longer ago than this are rejected as replays
     
     # Encryption key for sensitive data
     ENCRYPTION_KEY: str = "your-32-byte-encryption-key-here"  # Should be 32 bytes for AES-256
+    ENCRYPTION_OLD_KEYS: str = ""  # comma-separated retired keys, still accepted for decryption during rotation
+    TOKEN_CACHE_SIZE: int = 256  # decrypted Plaid access tokens kept in memory
+    TOKEN_CACHE_TTL_SECONDS: float = 60.0  # plaintext tokens are wiped from the cache after this
+
+    # Metrics
+    METRICS_TOKEN: str = ""  # bearer token GET /metrics requires; empty turns the endpoint off (404)
+
+    # Startup
+    STARTUP_WARM_UP: bool = True  # build JWKS, encryption keys and the DB engine in the background at startup
 
     # Azure SQL connection string
     AZURE_SQL_CONN: str
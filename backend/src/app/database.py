@@ -1,32 +1,44 @@
 from contextlib import contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from app.config import get_settings
-
-settings = get_settings()
+from app.lazy import Lazy
 
 from urllib.parse import quote_plus
 
-connection_string = settings.AZURE_SQL_CONN
-params = quote_plus(connection_string)
-DATABASE_URL = f"mssql+pyodbc:///?odbc_connect={params}"
 
-print("Conn str: ", DATABASE_URL)
+def _create_engine() -> Engine:
+    params = quote_plus(get_settings().AZURE_SQL_CONN)
+    return create_engine(f"mssql+pyodbc:///?odbc_connect={params}", pool_pre_ping=True)
+
+
+# the engine (and the pyodbc dialect) is only set up when the first session is opened
+_engine = Lazy(_create_engine)
+
+
+def get_engine() -> Engine:
+    return _engine.get()
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine,
 )
 
 Base = declarative_base()
 
 
+def _new_session() -> Session:
+    # bind on first use unless something (a benchmark, a script) already bound another engine
+    if SessionLocal.kw.get("bind") is None:
+        SessionLocal.configure(bind=get_engine())
+    return SessionLocal()
+
+
 # Dependency for FastAPI
 def get_db() -> Session:
-    db = SessionLocal()
+    db = _new_session()
     try:
         yield db
     finally:
@@ -34,7 +46,7 @@ def get_db() -> Session:
 
 @contextmanager
 def get_db_session():
-    db = SessionLocal()
+    db = _new_session()
     try:
         yield db
     finally:
@@ -1,6 +1,10 @@
 from auth0 import authentication, management
+from fastapi import Depends, HTTPException, status
 
 from app.config import get_settings, Settings
+from app.repositories.user_repository import user_repository
+from app.security.access_token import AccessToken
+from app.security.utils import get_verified_token
 
 def get_auth0_token_client() -> authentication.GetToken:
     """
@@ -34,4 +38,15 @@ def get_auth0_management_client() -> management.Auth0:
     return auth0
 
 
+def get_current_user_id(token: AccessToken = Depends(get_verified_token)) -> int:
+    """
+    Return the local user id for the verified token's sub (cached; see user_id_cache).
+    """
+    user_id = user_repository.resolve_id(token.sub)
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user_id
 
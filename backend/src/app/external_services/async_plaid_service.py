@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import get_settings
+from app.external_services.plaid_service import (
+    cache_accounts,
+    get_cached_accounts,
+    get_plaid_host,
+    to_plaid_account,
+    to_plaid_transaction,
+)
+from app.external_services.plaid_retry import CircuitOpenError, PlaidError, plaid_error_from_response, plaid_retrier
+from app.models.plaid_models import PlaidAccount, PlaidTransaction
+from app.sync.page_size import AdaptivePageSize
+
+logger = logging.getLogger(__name__)
+
+PLAID_API_VERSION = "2020-09-14"
+
+# What a failed Plaid call raises here (after retries); wrapped like PlaidService wraps ApiException
+PLAID_FAILURES = (httpx.HTTPError, PlaidError, CircuitOpenError)
+
+
+class AsyncPlaidService:
+    """asyncio-native Plaid client for use from ``async def`` endpoints.
+
+    Talks to the Plaid REST API over one shared ``httpx.AsyncClient`` so requests reuse
+    keep-alive connections, and many Plaid calls can be in flight on one worker without
+    blocking the event loop. Pool size and timeouts come from settings. Like
+    ``PlaidService`` it expects plaintext access tokens.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client on first use."""
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = httpx.AsyncClient(
+                        base_url=get_plaid_host(self.settings.PLAID_ENV),
+                        headers={"Plaid-Version": PLAID_API_VERSION},
+                        limits=httpx.Limits(
+                            max_connections=self.settings.PLAID_HTTP_POOL_SIZE,
+                            max_keepalive_connections=self.settings.PLAID_HTTP_KEEPALIVE,
+                        ),
+                        timeout=httpx.Timeout(
+                            self.settings.PLAID_HTTP_TIMEOUT_SECONDS,
+                            connect=self.settings.PLAID_HTTP_CONNECT_TIMEOUT_SECONDS,
+                        ),
+                    )
+        return self._client
+
+    async def aclose(self):
+        """Close pooled connections; called on application shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, path: str, body: Dict[str, Any], institution: Optional[str] = None) -> Dict[str, Any]:
+        """POST to Plaid through ``plaid_retrier``; error responses raise PlaidError.
+
+        Public methods wrap PLAID_FAILURES the way PlaidService does, so async and sync
+        callers see the same exceptions for the same failure.
+        """
+        client = await self._get_client()
+        payload = {
+            "client_id": self.settings.PLAID_CLIENT_ID,
+            "secret": self.settings.PLAID_SECRET,
+            **body,
+        }
+
+        async def send() -> Dict[str, Any]:
+            response = await client.post(path, json=payload)
+            if response.status_code >= 400:
+                raise plaid_error_from_response(path, response)
+            return response.json()
+
+        return await plaid_retrier.acall(send, institution=institution, operation=path)
+
+    async def exchange_public_token(self, public_token: str) -> Dict[str, str]:
+        """Exchange public token for access token and item ID."""
+        try:
+            return await self._post("/item/public_token/exchange", {"public_token": public_token})
+        except PLAID_FAILURES as e:
+            logger.error(f"Error exchanging public token: {e}")
+            raise Exception(f"Failed to exchange public token: {str(e)}")
+
+    async def get_accounts(
+        self, access_token: str, item_id: Optional[str] = None, institution: Optional[str] = None
+    ) -> List[PlaidAccount]:
+        """Get accounts for a given access token, through the shared accounts cache when ``item_id`` is given."""
+        cached = get_cached_accounts(item_id)
+        if cached is not None:
+            return cached
+        try:
+            response = await self._post("/accounts/get", {"access_token": access_token}, institution=institution)
+            accounts = [to_plaid_account(account) for account in response["accounts"]]
+            cache_accounts(item_id, accounts)
+            return accounts
+        except PLAID_FAILURES as e:
+            logger.error(f"Error getting accounts: {e}")
+            raise Exception(f"Failed to get accounts: {str(e)}")
+
+    async def iter_sync_transactions(
+        self,
+        access_token: str,
+        account_ids: Optional[List[str]] = None,
+        count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[List[PlaidTransaction], Optional[str]]]:
+        """Stream the transactions/sync cursor loop one page at a time.
+
+        Yields ``(transactions, cursor)`` per page like ``PlaidService.iter_sync_transactions``,
+        holding only one page in memory. Without a fixed ``count`` pages are sized by
+        ``AdaptivePageSize``.
+        """
+        try:
+            next_cursor = cursor
+            sizer = AdaptivePageSize.for_sync(cursor) if not count else None
+            while True:
+                body: Dict[str, Any] = {"access_token": access_token}
+                if next_cursor:
+                    body["cursor"] = next_cursor
+                if account_ids:
+                    body["options"] = {"account_ids": account_ids}
+                body["count"] = sizer.size if sizer else count
+
+                started = time.perf_counter()
+                response = await self._post("/transactions/sync", body)
+                if sizer:
+                    rows = sum(len(response.get(key, [])) for key in ("added", "modified", "removed"))
+                    sizer.record_page(rows, time.perf_counter() - started)
+                next_cursor = response.get("next_cursor") or next_cursor
+
+                yield [to_plaid_transaction(transaction) for transaction in response.get("added", [])], next_cursor
+
+                if not response.get("has_more", False):
+                    break
+        except PLAID_FAILURES as e:
+            logger.error(f"Error getting transactions: {e}")
+            raise Exception(f"Failed to get transactions: {str(e)}")
+
+    async def sync_transactions(
+        self,
+        access_token: str,
+        account_ids: Optional[List[str]] = None,
+        count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run the transactions/sync cursor loop; returns {'transactions': [...], 'cursor': final_cursor}.
+
+        Collects every page; use ``iter_sync_transactions`` to process large histories
+        page by page instead.
+        """
+        transactions: List[PlaidTransaction] = []
+        next_cursor = cursor
+        async for page, next_cursor in self.iter_sync_transactions(
+            access_token, account_ids=account_ids, count=count, cursor=cursor
+        ):
+            transactions.extend(page)
+        return {"transactions": transactions, "cursor": next_cursor}
+
+    async def get_item_institution_id(self, access_token: str) -> Optional[str]:
+        """Get the institution_id of the item behind an access token."""
+        try:
+            item = await self._post("/item/get", {"access_token": access_token})
+            return item["item"]["institution_id"]
+        except Exception as e:
+            logger.error(f"Error getting item institution: {e}")
+            return None
+
+    async def get_institution_name_by_id(self, institution_id: str) -> Optional[str]:
+        """Get an institution's display name."""
+        try:
+            institution = await self._post(
+                "/institutions/get_by_id",
+                {"institution_id": institution_id, "country_codes": ["US"]},
+            )
+            return institution["institution"]["name"]
+        except Exception as e:
+            logger.error(f"Error getting institution name: {e}")
+            return None
+
+    async def get_institution_name(self, access_token: str) -> Optional[str]:
+        """Get institution name for a given access token."""
+        institution_id = await self.get_item_institution_id(access_token)
+        if not institution_id:
+            return None
+        return await self.get_institution_name_by_id(institution_id)
+
+    async def get_webhook_verification_key(self, key_id: str) -> Dict[str, Any]:
+        """Get the JWK Plaid signs webhooks with, for the ``kid`` of a Plaid-Verification JWT."""
+        response = await self._post("/webhook_verification_key/get", {"key_id": key_id})
+        return response["key"]
+
+# Global instance
+async_plaid_service = AsyncPlaidService()
@@ -0,0 +1,87 @@
+"""Normalization of Plaid date / datetime values into timezone-aware UTC datetimes.
+
+Plaid sends ``date`` as ``YYYY-MM-DD`` (a ``datetime.date`` once the SDK has parsed the
+payload) and ``datetime`` / ``authorized_datetime`` as ISO 8601 strings that may carry a
+``Z`` suffix or more than six fractional digits. The common shapes take fast paths: date
+objects and date strings are memoized, since a sync page only spans a few distinct days.
+"""
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, List
+
+_ISO_DATETIME = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2})?)"  # date and time
+    r"(?:\.(\d+))?"                                     # fraction, any number of digits
+    r"(Z|[+-]\d{2}(?::?\d{2})?)?$"                      # offset
+)
+
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def _from_date(value: date) -> datetime:
+    return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _from_string(value: str) -> datetime:
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        return datetime(int(value[:4]), int(value[5:7]), int(value[8:10]), tzinfo=timezone.utc)
+
+    match = _ISO_DATETIME.match(value)
+    if not match:
+        raise ValueError(f"Unrecognized Plaid date/datetime: {value!r}")
+    main, fraction, offset = match.groups()
+    text = main
+    if fraction:
+        text += "." + fraction[:6].ljust(6, "0")
+    if offset and offset != "Z":
+        text += offset if ":" in offset or len(offset) == 3 else offset[:3] + ":" + offset[3:]
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def to_datetime(value: Any) -> Any:
+    """Normalize a Plaid date/datetime into a timezone-aware UTC datetime.
+
+    Accepts ``date``, ``datetime`` (naive values are taken as UTC), ``YYYY-MM-DD`` and ISO
+    8601 strings. ``None`` is returned as-is, as is any other type.
+    """
+    kind = type(value)
+    if kind is date:
+        return _from_date(value)
+    if kind is str:
+        return _from_string(value)
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, date):
+        return _from_date(date(value.year, value.month, value.day))
+    return value
+
+
+def to_datetimes(values: Iterable[Any], naive_utc: bool = False) -> List[Any]:
+    """Normalize a whole page of values at once.
+
+    Each distinct value is converted only once. With ``naive_utc=True`` the results have
+    their tzinfo dropped (still in UTC), which is what DATETIME2 columns take.
+    """
+    seen = {}
+    out = []
+    append = out.append
+    for value in values:
+        result = seen.get(value, _MISSING)
+        if result is _MISSING:
+            result = to_datetime(value)
+            if naive_utc and isinstance(result, datetime):
+                result = result.replace(tzinfo=None)
+            seen[value] = result
+        append(result)
+    return out
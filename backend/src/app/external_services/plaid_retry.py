@@ -0,0 +1,358 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import urllib3
+from plaid.exceptions import ApiException
+
+from app.config import get_settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Transient on Plaid's side: retry with backoff
+RETRYABLE_ERROR_TYPES = {"RATE_LIMIT_EXCEEDED", "API_ERROR"}
+RETRYABLE_ERROR_CODES = {
+    "INTERNAL_SERVER_ERROR",
+    "PLANNED_MAINTENANCE",
+    "PRODUCT_NOT_READY",
+    "INSTITUTION_DOWN",
+    "INSTITUTION_NOT_RESPONDING",
+    "INSTITUTION_NOT_AVAILABLE",
+}
+# The bank itself is degraded: counts toward that institution's circuit breaker
+INSTITUTION_FAULT_CODES = {"INSTITUTION_DOWN", "INSTITUTION_NOT_RESPONDING", "INSTITUTION_NOT_AVAILABLE"}
+# Calls that must not be replayed after an ambiguous failure (a 5xx or a lost response may
+# mean Plaid already did the work): only an explicit rate limit, which Plaid rejected
+# before doing anything, is retried. Keyed by the ``operation`` passed to the retrier,
+# client method names for PlaidService and REST paths for AsyncPlaidService.
+NON_IDEMPOTENT_OPERATIONS = {
+    "item_public_token_exchange",
+    "/item/public_token/exchange",
+    "link_token_create",
+    "/link/token/create",
+}
+
+
+class PlaidError(Exception):
+    """A classified Plaid failure (API error body, HTTP status or transport error)."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        error_type: Optional[str] = None,
+        error_code: Optional[str] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.error_code = error_code
+        self.retry_after = retry_after
+
+    @property
+    def code(self) -> str:
+        return self.error_code or self.error_type or (f"HTTP_{self.status}" if self.status else "TRANSPORT_ERROR")
+
+    @property
+    def retryable(self) -> bool:
+        if self.error_code in RETRYABLE_ERROR_CODES or self.error_type in RETRYABLE_ERROR_TYPES:
+            return True
+        if self.error_code or self.error_type:
+            return False
+        # no Plaid error body: transport failures, 429s and 5xx are worth another try
+        return self.status is None or self.status == 429 or self.status >= 500
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.error_type == "RATE_LIMIT_EXCEEDED" or self.error_code == "RATE_LIMIT_EXCEEDED" or self.status == 429
+
+    @property
+    def institution_fault(self) -> bool:
+        return self.error_code in INSTITUTION_FAULT_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Plaid while an institution's breaker is open."""
+
+
+def _retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _from_body(message: str, status: Optional[int], body: Any, headers) -> PlaidError:
+    error: Dict[str, Any] = {}
+    if body:
+        try:
+            parsed = json.loads(body) if isinstance(body, (str, bytes)) else body
+            if isinstance(parsed, dict):
+                error = parsed
+        except ValueError:
+            pass
+    return PlaidError(
+        error.get("error_message") or message,
+        status=status,
+        error_type=error.get("error_type"),
+        error_code=error.get("error_code"),
+        retry_after=_retry_after(headers),
+    )
+
+
+def plaid_error_from_response(path: str, response: httpx.Response) -> PlaidError:
+    return _from_body(f"Plaid {path} returned {response.status_code}", response.status_code, response.text, response.headers)
+
+
+def classify(exc: BaseException) -> Optional[PlaidError]:
+    """Map an exception raised by a Plaid call to a PlaidError; None if it is not a Plaid failure."""
+    if isinstance(exc, PlaidError):
+        return exc
+    if isinstance(exc, ApiException):
+        return _from_body(str(exc.reason), exc.status, exc.body, exc.headers)
+    if isinstance(exc, (httpx.TransportError, urllib3.exceptions.HTTPError)):
+        return PlaidError(f"{type(exc).__name__}: {exc}")
+    return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: opens after ``failure_threshold`` failures, retries after ``reset_seconds``.
+
+    While open every call is rejected; once ``reset_seconds`` have passed a single trial
+    call is let through (half-open) and its outcome closes or re-opens the breaker. The
+    caller holding the trial must ``release_trial`` it however the call ends, so a trial
+    that is rate limited, fails for an unrelated reason or is cancelled lets the next
+    call try instead of leaving the breaker stuck half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def before_call(self, name: str) -> Optional[int]:
+        """Raise CircuitOpenError if the call may not proceed; returns a trial token for the half-open trial."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return None
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trials += 1
+                return self._trials
+            raise CircuitOpenError(f"Circuit open for institution {name}; not calling Plaid")
+
+    def release_trial(self, trial: int):
+        """Free the half-open trial slot taken by ``trial`` if its outcome was not recorded."""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._trials == trial:
+                self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class PlaidRetrier:
+    """Runs Plaid calls with classified retries and per-institution circuit breakers.
+
+    Retryable errors (rate limits, Plaid API errors, institution outages, transport
+    failures) are retried up to ``max_attempts`` times with full-jitter exponential
+    backoff; a Retry-After hint is honored as a lower bound, and a hint longer than
+    ``max_delay`` ends the retries. Other errors are raised immediately. Operations in
+    ``non_idempotent_operations`` are retried only when rate limited. When an
+    ``institution`` is given, institution-fault errors feed that institution's breaker.
+    The original exception is re-raised once retries are exhausted.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        failure_threshold: int,
+        reset_seconds: float,
+        non_idempotent_operations=NON_IDEMPOTENT_OPERATIONS,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.non_idempotent_operations = set(non_idempotent_operations)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._retries_by_code: Counter = Counter()
+
+    def breaker(self, institution: Optional[str]) -> Optional[CircuitBreaker]:
+        if not institution:
+            return None
+        with self._lock:
+            breaker = self._breakers.get(institution)
+            if breaker is None:
+                breaker = self._breakers[institution] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            return breaker
+
+    def _count(self, key: str, code: Optional[str] = None):
+        with self._lock:
+            self._counts[key] += 1
+            if code:
+                self._retries_by_code[code] += 1
+
+    def _before(self, breaker: Optional[CircuitBreaker], institution: Optional[str]) -> Optional[int]:
+        self._count("calls")
+        if breaker:
+            try:
+                return breaker.before_call(institution)
+            except CircuitOpenError:
+                self._count("rejected_open")
+                raise
+        return None
+
+    def _after_error(
+        self,
+        exc: BaseException,
+        attempt: int,
+        breaker: Optional[CircuitBreaker],
+        institution: Optional[str],
+        operation: str,
+    ) -> float:
+        """Decide what to do after a failed attempt: return the delay before retrying, or re-raise."""
+        error = classify(exc)
+        if error is None:
+            raise exc
+        if breaker:
+            if error.institution_fault:
+                if breaker.record_failure():
+                    self._count("breaker_opened")
+                    logger.warning(f"Opened Plaid circuit for institution {institution} after {error.code}")
+            elif error.error_type != "RATE_LIMIT_EXCEEDED":
+                # the institution answered; only our request or the item was at fault
+                breaker.record_success()
+            # a rate limit says nothing about the institution; a half-open trial is just released
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        breaker_open = breaker is not None and breaker.state == CircuitBreaker.OPEN
+        retryable = error.rate_limited if operation in self.non_idempotent_operations else error.retryable
+        if not retryable or attempt >= self.max_attempts or delay > self.max_delay or breaker_open:
+            self._count("gave_up")
+            raise exc
+
+        self._count("retries", error.code)
+        logger.warning(
+            f"Plaid {operation or 'call'} failed with {error.code} (attempt {attempt}/{self.max_attempts}); "
+            f"retrying in {delay:.2f}s"
+        )
+        return delay
+
+    def call(self, fn: Callable[[], T], institution: Optional[str] = None, operation: str = "") -> T:
+        breaker = self.breaker(institution)
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = self._before(breaker, institution)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._after_error(e, attempt, breaker, institution, operation)
+            else:
+                if breaker:
+                    breaker.record_success()
+                return result
+            finally:
+                # covers cancellation and errors that are not Plaid's, which record no outcome
+                if trial is not None:
+                    breaker.release_trial(trial)
+            time.sleep(delay)
+
+    async def acall(
+        self, fn: Callable[[], Awaitable[T]], institution: Optional[str] = None, operation: str = ""
+    ) -> T:
+        breaker = self.breaker(institution)
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = self._before(breaker, institution)
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._after_error(e, attempt, breaker, institution, operation)
+            else:
+                if breaker:
+                    breaker.record_success()
+                return result
+            finally:
+                # covers cancellation and errors that are not Plaid's, which record no outcome
+                if trial is not None:
+                    breaker.release_trial(trial)
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = {
+                name: {"state": b.state, "consecutive_failures": b.failures}
+                for name, b in self._breakers.items()
+            }
+            return {
+                **{key: self._counts.get(key, 0) for key in ("calls", "retries", "gave_up", "rejected_open", "breaker_opened")},
+                "retries_by_code": dict(self._retries_by_code),
+                "breakers": breakers,
+            }
+
+
+_settings = get_settings()
+
+# Global instance
+plaid_retrier = PlaidRetrier(
+    max_attempts=_settings.PLAID_RETRY_MAX_ATTEMPTS,
+    base_delay=_settings.PLAID_RETRY_BASE_DELAY_SECONDS,
+    max_delay=_settings.PLAID_RETRY_MAX_DELAY_SECONDS,
+    failure_threshold=_settings.PLAID_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=_settings.PLAID_BREAKER_RESET_SECONDS,
+)
+metrics.register("plaid_retries", plaid_retrier.stats)
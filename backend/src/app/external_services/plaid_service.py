@@ -1,12 +1,16 @@
 import logging
 import os
 import json
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from plaid.api import plaid_api
 from plaid.model.transactions_sync_request import TransactionsSyncRequest
 from plaid.model.accounts_get_request import AccountsGetRequest
 from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+from plaid.model.item_get_request import ItemGetRequest
+from plaid.model.item_webhook_update_request import ItemWebhookUpdateRequest
+from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
 from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
 from plaid.model.country_code import CountryCode
@@ -15,12 +19,92 @@ from plaid.configuration import Configuration
 from plaid.api_client import ApiClient
 from plaid.exceptions import ApiException
 
+from app.cache import TTLCache
 from app.config import get_settings
+from app.external_services.plaid_retry import plaid_retrier
+from app.metrics import metrics
+from app.sync.page_size import AdaptivePageSize
 from app.models.plaid_models import PlaidAccount, PlaidTransaction
-# Tokens are decrypted at the DB boundary by the repository; this service expects plaintext tokens
+# Tokens are decrypted by the PlaidUser.access_token model property when read; this service expects plaintext tokens
 
 logger = logging.getLogger(__name__)
 
+PLAID_HOSTS = {
+    'sandbox': 'https://sandbox.plaid.com',
+    'development': 'https://development.plaid.com',
+    'production': 'https://production.plaid.com'
+}
+
+
+def get_plaid_host(plaid_env: str) -> str:
+    """Get the Plaid host for an environment name, defaulting to sandbox.
+
+    ``local`` points at the stand-in server (infra/plaid_standin.py) on PLAID_LOCAL_HOST.
+    """
+    if plaid_env == 'local':
+        return get_settings().PLAID_LOCAL_HOST
+    return PLAID_HOSTS.get(plaid_env, PLAID_HOSTS['sandbox'])
+
+
+def to_plaid_account(account) -> PlaidAccount:
+    """Map an /accounts/get account (SDK model or JSON dict) to PlaidAccount."""
+    return PlaidAccount(
+        account_id=account['account_id'],
+        name=account['name'],
+        type=str(account['type']),
+        subtype=str(account.get('subtype')),
+        balance=account['balances']['current'] or 0.0,
+        balance_available=account['balances'].get('available'),
+        currency=account['balances']['iso_currency_code'] or 'USD'
+    )
+
+_settings = get_settings()
+
+# /accounts/get results keyed by item_id; invalidated by a successful sync or a webhook
+accounts_cache = TTLCache(
+    maxsize=_settings.PLAID_ACCOUNTS_CACHE_SIZE,
+    ttl_seconds=_settings.PLAID_ACCOUNTS_CACHE_TTL_SECONDS,
+)
+metrics.register("plaid_accounts_cache", accounts_cache.stats)
+
+
+def get_cached_accounts(item_id: Optional[str]) -> Optional[List[PlaidAccount]]:
+    """Return copies of the cached /accounts/get result for ``item_id``, if fresh."""
+    if not item_id:
+        return None
+    cached = accounts_cache.get(item_id)
+    if cached is None:
+        return None
+    return [account.model_copy() for account in cached]
+
+
+def cache_accounts(item_id: Optional[str], accounts: List[PlaidAccount]):
+    if item_id:
+        accounts_cache.set(item_id, [account.model_copy() for account in accounts])
+
+
+def to_plaid_transaction(transaction: dict) -> PlaidTransaction:
+    """Map a transactions/sync transaction dict to PlaidTransaction."""
+    # category: prefer personal_finance_category.primary, else category list
+    category_val = None
+    if transaction.get('personal_finance_category'):
+        pfc = transaction.get('personal_finance_category')
+        category_val = [pfc.get('primary')] if pfc else None
+    elif transaction.get('category'):
+        category_val = transaction.get('category')
+
+    return PlaidTransaction(
+        transaction_id=transaction.get('transaction_id'),
+        account_id=transaction.get('account_id'),
+        amount=transaction.get('amount'),
+        date=transaction.get('date'),
+        name=transaction.get('name'),
+        merchant_name=transaction.get('merchant_name'),
+        category=category_val or [],
+        pending=transaction.get('pending', False)
+    )
+
+
 class PlaidService:
     """Service for interacting with Plaid API."""
     
@@ -42,17 +126,16 @@ class PlaidService:
     
     def _get_plaid_host(self):
         """Get the appropriate Plaid host based on environment."""
-        env_mapping = {
-            'sandbox': 'https://sandbox.plaid.com',
-            'development': 'https://development.plaid.com',
-            'production': 'https://production.plaid.com'
-        }
-        return env_mapping.get(self.settings.PLAID_ENV, 'https://sandbox.plaid.com')
+        return get_plaid_host(self.settings.PLAID_ENV)
     
     def create_link_token(self, user_id: str, user_email: Optional[str] = None) -> str:
-        """Create a link token for Plaid Link initialization."""
+        """Create a link token for Plaid Link initialization.
+
+        Items linked with it send their webhooks to PLAID_WEBHOOK_URL when that is set.
+        """
         print("Calling plaid API")
         try:
+            webhook = {"webhook": self.settings.PLAID_WEBHOOK_URL} if self.settings.PLAID_WEBHOOK_URL else {}
             request = LinkTokenCreateRequest(
                 #client_id=os.getenv("PLAID_CLIENT_ID"),
                 #client_secret=os.getenv("PLAID_SECRET"),
@@ -60,11 +143,12 @@ class PlaidService:
                 client_name="Personal Finance Agent",
                 country_codes=[CountryCode('US')],
                 language='en',
-                user=LinkTokenCreateRequestUser(client_user_id=user_id)
+                user=LinkTokenCreateRequestUser(client_user_id=user_id),
+                **webhook
             )
 
             
-            response = self.client.link_token_create(request)
+            response = plaid_retrier.call(lambda: self.client.link_token_create(request), operation="link_token_create")
             print("Got response")
             return response['link_token']
             
@@ -72,11 +156,22 @@ class PlaidService:
             logger.error(f"Error creating link token: {e}")
             raise Exception(f"Failed to create link token: {str(e)}")
     
+    def update_item_webhook(self, access_token: str, webhook: str):
+        """Point an already linked item's webhooks at ``webhook``."""
+        try:
+            request = ItemWebhookUpdateRequest(access_token=access_token, webhook=webhook)
+            plaid_retrier.call(lambda: self.client.item_webhook_update(request), operation="item_webhook_update")
+        except ApiException as e:
+            logger.error(f"Error updating item webhook: {e}")
+            raise Exception(f"Failed to update item webhook: {str(e)}")
+
     def exchange_public_token(self, public_token: str) -> Dict[str, str]:
         """Exchange public token for access token and item ID."""
         try:
             request = ItemPublicTokenExchangeRequest(public_token=public_token)
-            response = self.client.item_public_token_exchange(request)
+            response = plaid_retrier.call(
+                lambda: self.client.item_public_token_exchange(request), operation="item_public_token_exchange"
+            )
             return response
             
             
@@ -84,135 +179,134 @@ class PlaidService:
             logger.error(f"Error exchanging public token: {e}")
             raise Exception(f"Failed to exchange public token: {str(e)}")
     
-    def get_accounts(self, access_token: str) -> List[PlaidAccount]:
-        """Get accounts for a given access token."""
+    def get_accounts(
+        self, access_token: str, item_id: Optional[str] = None, institution: Optional[str] = None
+    ) -> List[PlaidAccount]:
+        """Get accounts for a given access token.
+
+        When ``item_id`` is given the result is served from / stored in ``accounts_cache``.
+        ``institution`` selects the circuit breaker outages are counted against.
+        """
+        cached = get_cached_accounts(item_id)
+        if cached is not None:
+            return cached
         try:
-            # PlaidRepository now decrypts tokens at the DB boundary. This service expects a plaintext token.
+            # Callers pass PlaidUser.access_token, which the model property decrypts on read.
             request = AccountsGetRequest(access_token=access_token)
-            response = self.client.accounts_get(request)
-            
-            accounts = []
-            for account in response['accounts']:
-                plaid_account = PlaidAccount(
-                    account_id=account['account_id'],
-                    name=account['name'],
-                    type=str(account['type']),
-                    subtype=str(account.get('subtype')),
-                    balance=account['balances']['current'] or 0.0,
-                    currency=account['balances']['iso_currency_code'] or 'USD'
-                )
-                accounts.append(plaid_account)
+            response = plaid_retrier.call(
+                lambda: self.client.accounts_get(request), institution=institution, operation="accounts_get"
+            )
             
+            accounts = [to_plaid_account(account) for account in response['accounts']]
+            cache_accounts(item_id, accounts)
             return accounts
             
         except ApiException as e:
             logger.error(f"Error getting accounts: {e}")
             raise Exception(f"Failed to get accounts: {str(e)}")
     
-    def sync_transactions(
-        self, 
-        access_token: str, 
-        start_date: datetime = None, 
-        end_date: datetime = None,
+    def iter_sync_transactions(
+        self,
+        access_token: str,
         account_ids: Optional[List[str]] = None,
-        count: int = 100,
-        offset: int = 0,
+        count: Optional[int] = None,
         cursor: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Run Plaid incremental transactions/sync cursor loop and return {'transactions': [...], 'cursor': final_cursor}.
+    ) -> Iterator[Tuple[List[PlaidTransaction], Optional[str]]]:
+        """Stream the transactions/sync cursor loop one page at a time.
 
-        This method always performs the incremental sync (cursor loop) and returns a dict
-        with the added transactions and the final cursor. It no longer supports the
-        legacy single-call list return format.
+        Yields ``(transactions, cursor)`` per page, where ``transactions`` are the page's
+        added transactions mapped to PlaidTransaction and ``cursor`` is the cursor reached
+        after that page. Only one page is held in memory, so callers can walk years of
+        history in bounded memory and checkpoint the cursor as they go. Without a fixed
+        ``count`` pages are sized by ``AdaptivePageSize`` from Plaid's response times.
         """
         try:
-            # PlaidRepository now decrypts tokens at the DB boundary. This service expects a plaintext token.
-            decrypted_token = access_token
-            
-            # Default to last 30 days if no dates provided
-            if not start_date:
-                start_date = datetime.now() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.now()
-            
-            # Always run the incremental sync loop and collect all 'added' transactions
-            all_added = []
+            # Callers pass PlaidUser.access_token, which the model property decrypts on read.
             next_cursor = cursor
+            sizer = AdaptivePageSize.for_sync(cursor) if not count else None
             while True:
-                req = TransactionsSyncRequest(access_token=decrypted_token)
+                req = TransactionsSyncRequest(access_token=access_token)
                 if next_cursor:
                     req.cursor = next_cursor
                 if account_ids:
                     req.account_ids = account_ids
-                if count:
-                    req.count = count
-
-                response = self.client.transactions_sync(req).to_dict()
-
-                added = response.get('added', [])
-                all_added.extend(added)
+                req.count = sizer.size if sizer else count
 
-                has_more = response.get('has_more', False)
+                started = time.perf_counter()
+                response = plaid_retrier.call(
+                    lambda: self.client.transactions_sync(req), operation="transactions_sync"
+                ).to_dict()
+                if sizer:
+                    rows = sum(len(response.get(key, [])) for key in ('added', 'modified', 'removed'))
+                    sizer.record_page(rows, time.perf_counter() - started)
                 next_cursor = response.get('next_cursor') or response.get('cursor')
 
-                if not has_more:
+                yield [to_plaid_transaction(t) for t in response.get('added', [])], next_cursor
+
+                if not response.get('has_more', False):
                     break
 
-            # map to PlaidTransaction objects
-            transactions = []
-            for transaction in all_added:
-                # category: prefer personal_finance_category.primary, else category list
-                category_val = None
-                if transaction.get('personal_finance_category'):
-                    pfc = transaction.get('personal_finance_category')
-                    category_val = [pfc.get('primary')] if pfc else None
-                elif transaction.get('category'):
-                    category_val = transaction.get('category')
-
-                plaid_transaction = PlaidTransaction(
-                    transaction_id=transaction.get('transaction_id'),
-                    account_id=transaction.get('account_id'),
-                    amount=transaction.get('amount'),
-                    date=transaction.get('date'),
-                    name=transaction.get('name'),
-                    merchant_name=transaction.get('merchant_name'),
-                    category=category_val or [],
-                    pending=transaction.get('pending', False)
-                )
-                transactions.append(plaid_transaction)
-
-            return {"transactions": transactions, "cursor": next_cursor}
-            
         except ApiException as e:
             logger.error(f"Error getting transactions: {e}")
             raise Exception(f"Failed to get transactions: {str(e)}")
+
+    def sync_transactions(
+        self, 
+        access_token: str, 
+        start_date: datetime = None, 
+        end_date: datetime = None,
+        account_ids: Optional[List[str]] = None,
+        count: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run Plaid incremental transactions/sync cursor loop and return {'transactions': [...], 'cursor': final_cursor}.
+
+        This method always performs the incremental sync (cursor loop) and returns a dict
+        with the added transactions and the final cursor. It no longer supports the
+        legacy single-call list return format. Use ``iter_sync_transactions`` to process
+        large histories page by page instead of materializing them.
+        """
+        transactions = []
+        next_cursor = cursor
+        for page, next_cursor in self.iter_sync_transactions(
+            access_token, account_ids=account_ids, count=count, cursor=cursor
+        ):
+            transactions.extend(page)
+
+        return {"transactions": transactions, "cursor": next_cursor}
     
-    def get_institution_name(self, access_token: str) -> Optional[str]:
-        """Get institution name for a given access token."""
+    def get_item_institution_id(self, access_token: str) -> Optional[str]:
+        """Get the institution_id of the item behind an access token."""
         try:
-            # Decrypt the access token if it's encrypted
-            #decrypted_token = encryption_service.decrypt(access_token)
-            
-            # Get item info first
-            from plaid.model.item_get_request import ItemGetRequest
             request = ItemGetRequest(access_token=access_token)
-            response = self.client.item_get(request)
-            
-            institution_id = response['item']['institution_id']
-            
-            # Get institution details
-            from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
+            response = plaid_retrier.call(lambda: self.client.item_get(request), operation="item_get")
+            return response['item']['institution_id']
+        except ApiException as e:
+            logger.error(f"Error getting item institution: {e}")
+            return None
+
+    def get_institution_name_by_id(self, institution_id: str) -> Optional[str]:
+        """Get an institution's display name."""
+        try:
             inst_request = InstitutionsGetByIdRequest(
                 institution_id=institution_id,
                 country_codes=[CountryCode('US')]
             )
-            inst_response = self.client.institutions_get_by_id(inst_request)
-            
+            inst_response = plaid_retrier.call(
+                lambda: self.client.institutions_get_by_id(inst_request), operation="institutions_get_by_id"
+            )
             return inst_response['institution']['name']
-            
         except ApiException as e:
             logger.error(f"Error getting institution name: {e}")
             return None
 
+    def get_institution_name(self, access_token: str) -> Optional[str]:
+        """Get institution name for a given access token."""
+        institution_id = self.get_item_institution_id(access_token)
+        if not institution_id:
+            return None
+        return self.get_institution_name_by_id(institution_id)
+
 # Global instance
-plaid_service = PlaidService()
\ No newline at end of file
+plaid_service = PlaidService()
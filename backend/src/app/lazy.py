@@ -0,0 +1,38 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """A value built by ``factory`` on first use, exactly once, from any thread.
+
+    Keeps expensive setup (network fetches, key derivation, engine creation) out of
+    import time. Concurrent first callers wait for the one build in progress. If the
+    factory raises, nothing is stored and the next ``get()`` tries again.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._ready:
+            return self._value
+        with self._lock:
+            if not self._ready:
+                self._value = self._factory()
+                self._ready = True
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def reset(self):
+        """Drop the built value so the next ``get()`` builds it again."""
+        with self._lock:
+            self._value = None
+            self._ready = False
@@ -1,8 +1,34 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import ingest, classify, insights, chat, user, plaid, accounts, households
+from app.routers import ingest, classify, insights, chat, user, plaid, accounts, households, metrics
+from app.config import get_settings
+from app.external_services.async_plaid_service import async_plaid_service
+from app.security.jwks import jwks_store
+from app.security.token_cache import token_cache
+from app.startup import warm_up
+from app.sync.jobs import sync_job_queue
+from app.sync.webhooks import webhook_coalescer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().STARTUP_WARM_UP:
+        # fetch JWKS, derive keys and build the engine off the event loop; startup does not wait
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+    sync_job_queue.start()
+    yield
+    # persist debounced webhook syncs as jobs before the workers stop
+    webhook_coalescer.flush()
+    sync_job_queue.stop(timeout=5)
+    jwks_store.stop()
+    # release pooled Plaid connections
+    await async_plaid_service.aclose()
+
 
-app = FastAPI(title="Personal Finance Agent")
+app = FastAPI(title="Personal Finance Agent", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000"
@@ -16,6 +42,14 @@ app.add_middleware(
     allow_headers=["*"],         # Authorization, Content-Type, etc.
 )
 
+
+@app.middleware("http")
+async def track_token_decryptions(request, call_next):
+    # per-request tally of Plaid tokens loaded vs. decrypted, reported on /metrics
+    with token_cache.track_request():
+        return await call_next(request)
+
+
 # Include routers
 app.include_router(ingest.router, prefix="/ingest", tags=["Ingest"])
 app.include_router(classify.router, prefix="/classify", tags=["Classification"])
@@ -24,4 +58,5 @@ app.include_router(insights.router, prefix="/insights", tags=["Insights"])
 app.include_router(chat.router, prefix="/chat", tags=["Chat"])
 app.include_router(user.router, prefix="/user", tags=["User"])
 app.include_router(plaid.router, prefix="/plaid", tags=["Plaid"])
-app.include_router(accounts.router, prefix="/accounts", tags=["Accounts"])
\ No newline at end of file
+app.include_router(accounts.router, prefix="/accounts", tags=["Accounts"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
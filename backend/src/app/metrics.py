@@ -0,0 +1,33 @@
+import logging
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """Named stats sources (caches, queues, breakers) collected for GET /metrics."""
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], dict]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, stats: Callable[[], dict]):
+        with self._lock:
+            self._sources[name] = stats
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            sources = dict(self._sources)
+        snapshot = {}
+        for name, stats in sources.items():
+            try:
+                snapshot[name] = stats()
+            except Exception as e:
+                logger.error(f"Failed to collect metrics for {name}: {e}")
+                snapshot[name] = {"error": str(e)}
+        return snapshot
+
+
+# Global instance
+metrics = MetricsRegistry()
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
+from typing import Optional
 
 Base = declarative_base()
 
@@ -34,7 +35,7 @@ class PlaidUser(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    access_token = Column(String, nullable=True)  # encrypted
+    access_token_encrypted = Column("access_token", String, nullable=True)
     item_id = Column(String, nullable=True)       # encrypted
     cursor = Column(String, nullable=True)       # Plaid transactions sync cursor
     institution_name = Column(String)                   # encrypted
@@ -49,6 +50,16 @@ class PlaidUser(Base):
         cascade="all, delete-orphan"
     )
 
+    @property
+    def access_token(self) -> Optional[str]:
+        """Plaintext access token, decrypted (through ``token_cache``) only when read."""
+        if not self.access_token_encrypted:
+            return self.access_token_encrypted
+        # imported here so tools that only need the table definitions never load settings or key material
+        from app.security.token_cache import token_cache
+
+        return token_cache.decrypt(self.access_token_encrypted)
+
 
 class Account(Base):
     __tablename__ = "accounts"
@@ -60,8 +71,10 @@ class Account(Base):
     type = Column(String, nullable=True)
     subtype = Column(String, nullable=True)
     balance_current = Column(Float, nullable=True)
+    balance_available = Column(Float, nullable=True)
     currency = Column(String, nullable=True)
     nickname = Column(String, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)  # UTC time balances were last pulled from Plaid
 
     # ✅ back reference to PlaidUser
     plaid_user = relationship(lambda: PlaidUser, back_populates="accounts")
@@ -90,6 +103,13 @@ class Transaction(Base):
 
     account = relationship(lambda: Account)
 
+class Institution(Base):
+    __tablename__ = "institutions"
+
+    institution_id = Column(String, primary_key=True)  # Plaid institution_id
+    name = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Household(Base):
     __tablename__ = "households"
 
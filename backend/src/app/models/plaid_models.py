@@ -1,7 +1,7 @@
 from pydantic import BaseModel, validator
 from fastapi import Depends
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 class TransactionIn(BaseModel):
     user_id: str
@@ -48,7 +48,9 @@ class PlaidAccount(BaseModel):
     type: str
     subtype: Optional[str] = None
     balance: float
+    balance_available: Optional[float] = None
     currency: str
+    last_synced_at: Optional[datetime] = None  # set when served from the local DB
 
 class PlaidTransaction(BaseModel):
     transaction_id: str
@@ -60,8 +62,14 @@ class PlaidTransaction(BaseModel):
     category: List[str] = []
     pending: bool = False
 
+class PlaidConnectionError(BaseModel):
+    connection_id: Optional[int] = None
+    institution_name: Optional[str] = None
+    error: str
+
 class PlaidAccountsResponse(BaseModel):
     accounts: List[PlaidAccount]
+    errors: List[PlaidConnectionError] = []  # connections that failed or timed out
 
 class PlaidTransactionsResponse(BaseModel):
     transactions: List[PlaidTransaction]
@@ -69,6 +77,26 @@ class PlaidTransactionsResponse(BaseModel):
 
 class SyncItemRequest(BaseModel):
     item_id: str
+    pipelined: bool = False  # fetch the next Plaid page while the current one is written
+
+class PlaidWebhook(BaseModel):
+    webhook_type: str
+    webhook_code: str
+    item_id: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+class SyncJob(BaseModel):
+    id: str
+    item_id: str
+    status: str  # queued, running, succeeded or failed
+    pipelined: bool = False
+    pages_fetched: int = 0
+    rows_written: int = 0
+    elapsed_s: float = 0.0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
 
 class SyncItemResponse(BaseModel):
     accounts: List[PlaidAccount]
@@ -0,0 +1,62 @@
+import logging
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.cache import TTLCache
+from app.config import get_settings
+from app.database import get_db_session
+from app.metrics import metrics
+from app.models.db_models import Institution
+
+logger = logging.getLogger(__name__)
+
+
+class InstitutionRepository:
+    """Institution names keyed by Plaid institution_id.
+
+    Reads go through an in-process LRU in front of the institutions table, so repeat links
+    to the same bank need neither a DB read nor a Plaid /institutions/get_by_id call.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    def get_name(self, institution_id: str) -> Optional[str]:
+        name = self.cache.get(institution_id)
+        if name is not None:
+            return name
+        try:
+            with get_db_session() as db:
+                row = db.query(Institution.name).filter(Institution.institution_id == institution_id).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error getting institution {institution_id}: {e}")
+            return None
+        if row is None:
+            return None
+        self.cache.set(institution_id, row.name)
+        return row.name
+
+    def save(self, institution_id: str, name: str):
+        """Insert or rename an institution and refresh the in-process entry."""
+        try:
+            with get_db_session() as db:
+                institution = db.query(Institution).filter(Institution.institution_id == institution_id).first()
+                if institution:
+                    institution.name = name
+                else:
+                    db.add(Institution(institution_id=institution_id, name=name))
+                db.commit()
+        except SQLAlchemyError as e:
+            # another link may have inserted it concurrently; the name is still cached below
+            logger.error(f"Database error saving institution {institution_id}: {e}")
+        self.cache.set(institution_id, name)
+
+
+_settings = get_settings()
+
+# Global instance
+institution_repository = InstitutionRepository(
+    TTLCache(maxsize=_settings.INSTITUTION_CACHE_SIZE, ttl_seconds=_settings.INSTITUTION_CACHE_TTL_SECONDS)
+)
+metrics.register("institution_cache", institution_repository.cache.stats)
@@ -1,26 +1,199 @@
 import logging
-from typing import Optional, List
-import logging
-from typing import Optional, List, Dict
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional, List, Dict, Iterator, Set
 import pyodbc
-from app.db import get_connection
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from app.config import get_settings
 from app.database import get_db_session
-from app.models.db_models import PlaidUser
+from app.models.db_models import Account, PlaidUser, Transaction
 from app.security.encryption import encryption_service
-from app.models.db_models import Account, Transaction
-from app.external_services.plaid_service import plaid_service
-from datetime import datetime
+from app.security.token_cache import token_cache
+from app.external_services.plaid_service import plaid_service, accounts_cache
+from app.external_services.plaid_dates import to_datetime, to_datetimes
+from app.external_services.plaid_retry import plaid_retrier
+from app.sync.page_size import AdaptivePageSize
+from app.sync.rate_limit import TokenBucket
+from app.models.plaid_models import PlaidAccount
 
 logger = logging.getLogger(__name__)
-from app.models.db_models import Account, Transaction
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-from datetime import datetime
 
-logger = logging.getLogger(__name__)
+
+def _category_str(category) -> Optional[str]:
+    """Flatten a Plaid category list into the comma separated column value."""
+    if category and isinstance(category, list):
+        return ','.join(category)
+    return category or None
+
+
+def _page_rows(resp: dict) -> int:
+    """Updates in a transactions/sync page; Plaid's ``count`` bounds added + modified + removed."""
+    return len(resp.get('added', [])) + len(resp.get('modified', [])) + len(resp.get('removed', []))
+
+
+def _map_sync_transaction(t: dict) -> dict:
+    """Map a raw transactions/sync transaction to the dict shape the upsert helpers take."""
+    # map category
+    cat = None
+    if t.get('personal_finance_category'):
+        cat = [t['personal_finance_category'].get('primary')]
+    elif t.get('category'):
+        cat = t.get('category')
+
+    return {
+        'transaction_id': t.get('transaction_id'),
+        'account_id': t.get('account_id'),
+        'amount': t.get('amount'),
+        'date': t.get('date'),
+        'merchant_name': t.get('merchant_name'),
+        'name': t.get('name'),
+        'pending': t.get('pending', False),
+        'category': cat,
+        'iso_currency_code': t.get('iso_currency_code')
+    }
+
+
+# Sentinel the pipelined fetcher puts on the queue after the last page
+_PAGES_DONE = object()
+
+
+# -----------------------------
+# Bulk upsert SQL (SQL Server)
+# -----------------------------
+# Each sync page is loaded into a session-scoped temp table with fast_executemany
+# and applied with a single MERGE keyed on transactions.transaction_id, instead of
+# two SELECTs plus an ORM flush per row.
+_TX_STAGING_COLUMNS = (
+    "transaction_id", "account_id", "amount", "date_posted", "merchant_name",
+    "description", "iso_currency_code", "category", "is_pending",
+)
+
+_TX_STAGING_CREATE = """
+IF OBJECT_ID('tempdb..#tx_staging') IS NOT NULL DROP TABLE #tx_staging;
+CREATE TABLE #tx_staging (
+    transaction_id NVARCHAR(255) NOT NULL PRIMARY KEY,
+    account_id NVARCHAR(255) NOT NULL,
+    amount DECIMAL(18,2) NOT NULL,
+    date_posted DATETIME2 NOT NULL,
+    merchant_name NVARCHAR(255) NULL,
+    description NVARCHAR(500) NULL,
+    iso_currency_code NVARCHAR(3) NULL,
+    category NVARCHAR(255) NULL,
+    is_pending BIT NOT NULL
+);
+"""
+
+_TX_STAGING_INSERT = (
+    "INSERT INTO #tx_staging (" + ", ".join(_TX_STAGING_COLUMNS) + ") "
+    "VALUES (" + ", ".join("?" for _ in _TX_STAGING_COLUMNS) + ")"
+)
+
+# Rows whose account_id is not in dbo.accounts drop out of the join and are
+# reported as skipped by the caller (staged - inserted - updated).
+_TX_MERGE = """
+SET NOCOUNT ON;
+DECLARE @actions TABLE (merge_action NVARCHAR(10));
+MERGE dbo.transactions WITH (HOLDLOCK) AS t
+USING (
+    SELECT s.*
+    FROM #tx_staging s
+    JOIN dbo.accounts a ON a.account_id = s.account_id
+) AS s
+ON t.transaction_id = s.transaction_id
+WHEN MATCHED THEN UPDATE SET
+    t.amount = s.amount,
+    t.date_posted = s.date_posted,
+    t.merchant_name = s.merchant_name,
+    t.description = s.description,
+    t.is_pending = s.is_pending,
+    t.category = s.category
+WHEN NOT MATCHED BY TARGET THEN INSERT
+    (account_id, transaction_id, amount, date_posted, merchant_name,
+     description, iso_currency_code, category, is_pending)
+    VALUES
+    (s.account_id, s.transaction_id, s.amount, s.date_posted, s.merchant_name,
+     s.description, s.iso_currency_code, s.category, s.is_pending)
+OUTPUT $action INTO @actions;
+SELECT
+    COALESCE(SUM(CASE WHEN merge_action = 'INSERT' THEN 1 ELSE 0 END), 0),
+    COALESCE(SUM(CASE WHEN merge_action = 'UPDATE' THEN 1 ELSE 0 END), 0)
+FROM @actions;
+"""
+
+# Plaid ``modified`` deltas only touch rows that already exist.
+_TX_UPDATE = """
+SET NOCOUNT ON;
+UPDATE t SET
+    t.amount = s.amount,
+    t.date_posted = s.date_posted,
+    t.merchant_name = s.merchant_name,
+    t.description = s.description,
+    t.is_pending = s.is_pending,
+    t.category = s.category
+FROM dbo.transactions t
+JOIN #tx_staging s ON t.transaction_id = s.transaction_id;
+SELECT @@ROWCOUNT;
+"""
+
+_TX_STAGING_DROP = "DROP TABLE #tx_staging;"
+
+# SQL Server allows 2100 parameters per statement; IN lists of ids are chunked below that.
+_ID_CHUNK_SIZE = 1000
+
+
+class AccountIndex:
+    """Plaid account_id -> Account map for a single PlaidUser.
+
+    A sync page only references a handful of accounts, all owned by the same item, so
+    the index resolves every account a batch needs with one IN (...) query and is
+    reused across all pages of a sync_item_transactions run. Misses are remembered too,
+    so an unknown account is queried and reported once rather than once per row.
+    """
+
+    def __init__(self, item_id: str, plaid_user_id: int):
+        self.item_id = item_id
+        self.plaid_user_id = plaid_user_id
+        self.accounts: Dict[str, Account] = {}
+        self.unknown: Set[str] = set()
+
+    def resolve(self, db, transactions: List[dict]) -> Set[str]:
+        """Load any accounts referenced by ``transactions`` that are not indexed yet.
+
+        Returns the account_ids in this batch that do not exist for the item.
+        """
+        wanted = {tx.get('account_id') for tx in transactions if tx.get('account_id')}
+        missing = wanted - self.accounts.keys() - self.unknown
+        if missing:
+            found = (
+                db.query(Account)
+                .filter(Account.plaid_user_id == self.plaid_user_id, Account.account_id.in_(missing))
+                .all()
+            )
+            for acc in found:
+                # detach so the entry survives the caller's commit (expire_on_commit)
+                db.expunge(acc)
+                self.accounts[acc.account_id] = acc
+            self.unknown.update(missing - self.accounts.keys())
+
+        unknown = wanted & self.unknown
+        if unknown:
+            skipped = sum(1 for tx in transactions if tx.get('account_id') in unknown)
+            logger.warning(
+                f"Skipping {skipped} transactions for item {self.item_id}: unknown account_ids {sorted(unknown)}"
+            )
+        return unknown
+
 
 class PlaidRepository:
     """Service for managing Plaid user data in the database."""
-    
+
+    # Bulk writes are SQL Server's staged MERGE / UPDATE. Tools that run the repository on
+    # an embedded database (infra.bench_sync, the tests) inject a stand-in here with the
+    # signature (db, rows, insert_missing) -> (inserted, updated); the app never sets it.
+    portable_writer: Optional[Callable[..., tuple]] = None
+
     def create_plaid_user(
         self, 
         user_id: int, 
@@ -36,7 +209,7 @@ class PlaidRepository:
             with get_db_session() as db:
                 new_plaid_user = PlaidUser(
                     user_id=user_id,
-                    access_token=encrypted_token,
+                    access_token_encrypted=encrypted_token,
                     item_id=item_id,
                     institution_name=institution_name
                 )
@@ -50,53 +223,114 @@ class PlaidRepository:
             raise Exception(f"Failed to create Plaid user: {str(e)}")
     
     def get_plaid_user_by_user_id(self, user_id: int) -> Optional[PlaidUser]:
-        """Get Plaid user by user ID."""
+        """Get Plaid user by user ID. ``access_token`` is decrypted when first read."""
         try:
             with get_db_session() as db:
                 plaid_user = db.query(PlaidUser).filter(PlaidUser.user_id == user_id).first()
-                # Decrypt access_token immediately after DB retrieval so callers always get plaintext
-                if plaid_user and hasattr(plaid_user, 'access_token') and plaid_user.access_token:
-                    try:
-                        plaid_user.access_token = encryption_service.decrypt(plaid_user.access_token)
-                    except Exception:
-                        # If decryption fails, leave the token as-is to surface the error later
-                        logger.exception("Failed to decrypt access token for plaid_user (user_id=%s)", user_id)
+                if plaid_user:
+                    token_cache.loaded()
                 return plaid_user
         except pyodbc.Error as e:
             logger.error(f"Database error getting Plaid user by user ID: {e}")
             raise Exception(f"Failed to get Plaid user: {str(e)}")
     
     def get_plaid_user_by_item_id(self, item_id: str) -> Optional[PlaidUser]:
-        """Get Plaid user by item ID."""
+        """Get Plaid user by item ID. ``access_token`` is decrypted when first read."""
         try:
             with get_db_session() as db:
                 plaid_user = db.query(PlaidUser).filter(PlaidUser.item_id == item_id).first()
-                if plaid_user and hasattr(plaid_user, 'access_token'):
-                    # Decrypt the access token before returning
-                    plaid_user.access_token = encryption_service.decrypt(plaid_user.access_token)
+                if plaid_user:
+                    token_cache.loaded()
                 return plaid_user
         except pyodbc.Error as e:
             logger.error(f"Database error getting Plaid user by item ID: {e}")
             raise Exception(f"Failed to get Plaid user: {str(e)}")
     
     def get_all_plaid_users_for_user(self, user_id: int) -> List[PlaidUser]:
-        """Get all Plaid connections for a user."""
+        """Get all Plaid connections for a user.
+
+        Tokens are not decrypted here; each ``access_token`` is decrypted when first read,
+        so callers that only need ids or names never pay for Fernet.
+        """
         try:
             with get_db_session() as db:
                 print("Getting all Plaid users for user id: ", user_id)
                 plaid_users = db.query(PlaidUser).filter(PlaidUser.user_id == user_id).all()
-                # Decrypt access_token on each record
-                for pu in plaid_users:
-                    if hasattr(pu, 'access_token') and pu.access_token:
-                        try:
-                            pu.access_token = encryption_service.decrypt(pu.access_token)
-                        except Exception:
-                            logger.exception("Failed to decrypt access token for plaid_user id=%s", getattr(pu, 'id', None))
+                token_cache.loaded(len(plaid_users))
                 return plaid_users
         except pyodbc.Error as e:
             logger.error(f"Database error getting all Plaid users for user: {e}")
             raise Exception(f"Failed to get Plaid users: {str(e)}")
     
+    def get_account_snapshot(
+        self,
+        user_id: int,
+        max_staleness: Optional[timedelta] = None,
+        plaid_user_ids: Optional[List[int]] = None,
+    ) -> List[dict]:
+        """Load a user's connections with their stored accounts in one query.
+
+        Returns one dict per connection: id, item_id, institution_name, accounts
+        (PlaidAccount list from the DB), last_synced_at (oldest account sync) and stale.
+        A connection is stale when it has no stored accounts, was never synced, or its
+        oldest sync is older than ``max_staleness`` (always, when ``max_staleness`` is None).
+        Only stale connections get a decrypted ``access_token``; it is None otherwise.
+        """
+        try:
+            with get_db_session() as db:
+                query = (
+                    db.query(
+                        PlaidUser.id, PlaidUser.item_id, PlaidUser.institution_name, PlaidUser.access_token_encrypted, Account
+                    )
+                    .outerjoin(Account, Account.plaid_user_id == PlaidUser.id)
+                    .filter(PlaidUser.user_id == user_id)
+                )
+                if plaid_user_ids:
+                    query = query.filter(PlaidUser.id.in_(plaid_user_ids))
+                rows = query.order_by(PlaidUser.id).all()
+
+                connections: Dict[int, dict] = {}
+                for plaid_user_id, item_id, institution_name, access_token, account in rows:
+                    conn = connections.setdefault(plaid_user_id, {
+                        "id": plaid_user_id,
+                        "item_id": item_id,
+                        "institution_name": institution_name,
+                        "access_token": access_token,
+                        "accounts": [],
+                        "synced": [],
+                    })
+                    if account is not None:
+                        conn["accounts"].append(PlaidAccount(
+                            account_id=account.account_id,
+                            connection_id=plaid_user_id,
+                            name=account.name or "",
+                            type=account.type or "",
+                            subtype=account.subtype,
+                            balance=float(account.balance_current or 0.0),
+                            balance_available=float(account.balance_available) if account.balance_available is not None else None,
+                            currency=account.currency or "USD",
+                            last_synced_at=account.last_synced_at,
+                        ))
+                        conn["synced"].append(account.last_synced_at)
+        except pyodbc.Error as e:
+            logger.error(f"Database error getting account snapshot for user: {e}")
+            raise Exception(f"Failed to get accounts: {str(e)}")
+
+        cutoff = datetime.utcnow() - max_staleness if max_staleness is not None else None
+        token_cache.loaded(len(connections))
+        snapshot = []
+        for conn in connections.values():
+            synced = conn.pop("synced")
+            last_synced_at = None if not synced or None in synced else min(synced)
+            conn["last_synced_at"] = last_synced_at
+            conn["stale"] = cutoff is None or last_synced_at is None or last_synced_at < cutoff
+            if conn["stale"] and conn["access_token"]:
+                conn["access_token"] = token_cache.decrypt(conn["access_token"])
+            else:
+                conn["access_token"] = None
+            snapshot.append(conn)
+        return snapshot
+
     def update_institution_name(self, plaid_user_id: int, institution_name: str) -> bool:
         """Update institution name for a Plaid user."""
         try:
@@ -112,6 +346,21 @@ class PlaidRepository:
             logger.error(f"Database error updating institution name: {e}")
             raise Exception(f"Failed to update institution name: {str(e)}")
     
+    def list_items(self) -> List[Dict]:
+        """List every linked Plaid item as {id, user_id, item_id, institution_name}; tokens are not loaded."""
+        try:
+            with get_db_session() as db:
+                rows = (
+                    db.query(PlaidUser.id, PlaidUser.user_id, PlaidUser.item_id, PlaidUser.institution_name)
+                    .filter(PlaidUser.item_id.isnot(None))
+                    .order_by(PlaidUser.id)
+                    .all()
+                )
+                return [dict(row._mapping) for row in rows]
+        except pyodbc.Error as e:
+            logger.error(f"Database error listing Plaid items: {e}")
+            raise Exception(f"Failed to list Plaid items: {str(e)}")
+
     def delete_plaid_user(self, plaid_user_id: int) -> bool:
         """Delete a Plaid user record."""
         try:
@@ -128,37 +377,44 @@ class PlaidRepository:
             raise Exception(f"Failed to delete Plaid user: {str(e)}")
 
     # -----------------------------
-    # Upsert helpers and sync
+    # Sync helpers using SQLAlchemy
     # -----------------------------
-    def upsert_accounts(self, item_id: str, accounts: List[Dict]) -> int:
-        """Insert or update accounts for a given item_id. Returns number processed."""
+    def upsert_accounts(self, item_id: str, accounts: List[dict]) -> int:
+        """Upsert accounts into DB using SQLAlchemy. Returns number of accounts upserted."""
         count = 0
         try:
             with get_db_session() as db:
+                # lookup plaid_user id
                 plaid_user = db.query(PlaidUser).filter(PlaidUser.item_id == item_id).first()
                 if not plaid_user:
                     raise Exception("Plaid user not found")
 
+                synced_at = datetime.utcnow()
                 for acct in accounts:
-                    acc = db.query(Account).filter(Account.account_id == acct.get('account_id')).first()
-                    if acc:
-                        acc.name = acct.get('name')
-                        acc.type = acct.get('type')
-                        acc.subtype = acct.get('subtype')
-                        acc.balance_current = acct.get('balance')
-                        acc.currency = acct.get('currency')
+                    existing = db.query(Account).filter(Account.account_id == acct.get('account_id')).first()
+                    if existing:
+                        existing.name = acct.get('name')
+                        existing.type = acct.get('type')
+                        existing.subtype = acct.get('subtype')
+                        existing.balance_current = acct.get('balance')
+                        existing.balance_available = acct.get('balance_available')
+                        existing.currency = acct.get('currency')
+                        existing.nickname = acct.get('nickname') or existing.nickname
+                        existing.last_synced_at = synced_at
                     else:
-                        acc = Account(
+                        new_acc = Account(
                             plaid_user_id=plaid_user.id,
                             account_id=acct.get('account_id'),
                             name=acct.get('name'),
                             type=acct.get('type'),
                             subtype=acct.get('subtype'),
                             balance_current=acct.get('balance'),
-                            currency=acct.get('currency')
+                            balance_available=acct.get('balance_available'),
+                            currency=acct.get('currency'),
+                            nickname=acct.get('nickname') if acct.get('nickname') else None,
+                            last_synced_at=synced_at,
                         )
-                        db.add(acc)
-
+                        db.add(new_acc)
                     count += 1
 
                 db.commit()
@@ -167,50 +423,55 @@ class PlaidRepository:
             logger.error(f"Error upserting accounts: {e}")
             raise
 
-    def upsert_transactions(self, item_id: str, transactions: List[Dict]) -> int:
-        """Insert or update transactions. Resolve account via Account.account_id."""
+    def account_index(self, item_id: str) -> AccountIndex:
+        """Create an empty AccountIndex for the item's PlaidUser."""
+        with get_db_session() as db:
+            plaid_user = db.query(PlaidUser.id).filter(PlaidUser.item_id == item_id).first()
+            if not plaid_user:
+                raise Exception("Plaid user not found")
+            return AccountIndex(item_id, plaid_user.id)
+
+    def upsert_transactions(
+        self,
+        item_id: str,
+        transactions: List[dict],
+        account_index: Optional[AccountIndex] = None,
+    ) -> int:
+        """Upsert transactions. Resolve account via Account.account_id. Returns number inserted/updated count."""
         count = 0
+        account_index = account_index or self.account_index(item_id)
         try:
             with get_db_session() as db:
+                account_index.resolve(db, transactions)
                 for tx in transactions:
-                    account = db.query(Account).filter(Account.account_id == tx.get('account_id')).first()
+                    # resolve account local id; unknown accounts were reported by resolve()
+                    account = account_index.accounts.get(tx.get('account_id'))
                     if not account:
-                        logger.warning(f"Skipping tx for unknown account_id={tx.get('account_id')}")
                         continue
 
                     existing = db.query(Transaction).filter(Transaction.transaction_id == tx.get('transaction_id')).first()
-
-                    # normalize date
-                    posted = tx.get('date')
-                    if isinstance(posted, str):
-                        try:
-                            posted_dt = datetime.fromisoformat(posted)
-                        except Exception:
-                            posted_dt = datetime.strptime(posted, "%Y-%m-%d")
-                    else:
-                        posted_dt = posted
+                    posted_at = to_datetime(tx.get('date'))
 
                     if existing:
                         existing.amount = tx.get('amount')
-                        existing.date_posted = posted_dt
+                        existing.date_posted = posted_at
                         existing.merchant_name = tx.get('merchant_name')
                         existing.description = tx.get('name')
                         existing.is_pending = 1 if tx.get('pending') else 0
-                        existing.category = ','.join(tx.get('category')) if isinstance(tx.get('category'), list) else (tx.get('category') or None)
+                        existing.category = ','.join(tx.get('category')) if tx.get('category') and isinstance(tx.get('category'), list) else (tx.get('category') or None)
                     else:
                         new_tx = Transaction(
-                            account_id=account.id,
+                            account_id=account.account_id,
                             transaction_id=tx.get('transaction_id'),
                             amount=tx.get('amount'),
-                            date_posted=posted_dt,
+                            date_posted=posted_at,
                             merchant_name=tx.get('merchant_name'),
                             description=tx.get('name'),
                             iso_currency_code=tx.get('iso_currency_code') if tx.get('iso_currency_code') else None,
-                            category=','.join(tx.get('category')) if isinstance(tx.get('category'), list) else (tx.get('category') or None),
+                            category=','.join(tx.get('category')) if tx.get('category') and isinstance(tx.get('category'), list) else (tx.get('category') or None),
                             is_pending=1 if tx.get('pending') else 0,
                         )
                         db.add(new_tx)
-
                     count += 1
 
                 db.commit()
@@ -219,217 +480,178 @@ class PlaidRepository:
             logger.error(f"Error upserting transactions: {e}")
             raise
 
-    def sync_item_transactions(self, item_id: str) -> dict:
-        """Sync accounts + transactions for an item using Plaid's transactions/sync incremental flow.
+    def _staging_rows(self, transactions: List[dict]) -> List[tuple]:
+        """Map transaction dicts to #tx_staging tuples, keeping the last row per transaction_id.
 
-        Returns dict with counts {accounts_synced, transactions_synced}
+        MERGE rejects a source that matches the same target row twice, so duplicates
+        within a page are collapsed here (Plaid may repeat an id inside a page).
         """
-        # fetch PlaidUser
-        pu = self.get_plaid_user_by_item_id(item_id)
-        if not pu:
-            raise Exception("Plaid user not found")
+        rows = {}
+        # DATETIME2 has no offset; the whole page is normalized to naive UTC in one pass
+        posted = to_datetimes((tx.get('date') for tx in transactions), naive_utc=True)
+        for tx, posted_at in zip(transactions, posted):
+            transaction_id = tx.get('transaction_id')
+            if not transaction_id or not tx.get('account_id') or posted_at is None:
+                continue
+            rows[transaction_id] = (
+                transaction_id,
+                tx.get('account_id'),
+                tx.get('amount'),
+                posted_at,
+                tx.get('merchant_name'),
+                tx.get('name'),
+                tx.get('iso_currency_code') or None,
+                _category_str(tx.get('category')),
+                1 if tx.get('pending') else 0,
+            )
+        return list(rows.values())
+
+    def _apply_staged(self, db, rows: List[tuple], statement: str) -> tuple:
+        """Load rows into #tx_staging on the session's connection and run ``statement`` against it.
 
-        # Use PlaidService.sync_transactions in incremental mode to fetch all added transactions and final cursor
+        Runs inside the session's transaction; the caller is responsible for committing.
+        Returns the single result row produced by ``statement``.
+        """
+        cursor = db.connection().connection.cursor()
         try:
-            resp = plaid_service.sync_transactions(
-                access_token=pu.access_token,
-                account_ids=None,
-                cursor=pu.cursor
+            cursor.fast_executemany = True
+            cursor.execute(_TX_STAGING_CREATE)
+            cursor.executemany(_TX_STAGING_INSERT, rows)
+            cursor.execute(statement)
+            result = cursor.fetchone()
+            cursor.execute(_TX_STAGING_DROP)
+        finally:
+            cursor.close()
+        return tuple(result)
+
+    def _portable_writer(self, db) -> Callable[..., tuple]:
+        if self.portable_writer is None:
+            raise RuntimeError(
+                f"Bulk transaction writes need SQL Server; no portable writer set for {db.get_bind().dialect.name}"
             )
-        except Exception as e:
-            logger.error(f"Error calling plaid_service.sync_transactions: {e}")
-            raise
+        return self.portable_writer
 
-        # resp should be {"transactions": List[PlaidTransaction], "cursor": str}
-        transactions = resp.get('transactions', []) if isinstance(resp, dict) else []
-        new_cursor = resp.get('cursor') if isinstance(resp, dict) else None
-
-        # prepare dicts for upsert
-        tx_dicts = []
-        for t in transactions:
-            tx_dicts.append({
-                'transaction_id': t.transaction_id,
-                'account_id': t.account_id,
-                'amount': t.amount,
-                'date': t.date,
-                'merchant_name': t.merchant_name,
-                'name': t.name,
-                'pending': t.pending,
-                'category': t.category,
-                'iso_currency_code': None,
-            })
+    def _merge_transactions(self, db, transactions: List[dict], account_index: AccountIndex) -> Dict[str, int]:
+        """Upsert transactions with one staged MERGE inside the session's transaction.
 
-        transactions_synced = 0
-        if tx_dicts:
-            transactions_synced = self.upsert_transactions(item_id, tx_dicts)
+        On SQL Server this is the #tx_staging MERGE; other dialects (e.g. the SQLite
+        database the benchmarks run against) need an injected ``portable_writer``.
 
-        # persist cursor
+        Returns {"inserted", "updated", "skipped"}; skipped covers rows without an id or
+        date, duplicates within the page and rows for accounts not in the DB.
+        """
+        unknown = account_index.resolve(db, transactions)
+        rows = self._staging_rows(
+            [tx for tx in transactions if tx.get('account_id') not in unknown] if unknown else transactions
+        )
+        if not rows:
+            return {"inserted": 0, "updated": 0, "skipped": len(transactions)}
+        if db.get_bind().dialect.name == "mssql":
+            inserted, updated = self._apply_staged(db, rows, _TX_MERGE)
+        else:
+            # the MERGE's join on accounts is covered by dropping unknown accounts above
+            inserted, updated = self._portable_writer(db)(db, rows, insert_missing=True)
+        inserted, updated = int(inserted), int(updated)
+        return {"inserted": inserted, "updated": updated, "skipped": len(transactions) - inserted - updated}
+
+    def _update_transactions(self, db, transactions: List[dict]) -> Dict[str, int]:
+        """Apply Plaid ``modified`` transactions as one staged UPDATE ... FROM join.
+
+        Only rows that already exist are touched. Returns {"updated", "skipped"}.
+        """
+        rows = self._staging_rows(transactions)
+        if not rows:
+            return {"updated": 0, "skipped": len(transactions)}
+        if db.get_bind().dialect.name == "mssql":
+            (updated,) = self._apply_staged(db, rows, _TX_UPDATE)
+        else:
+            _, updated = self._portable_writer(db)(db, rows, insert_missing=False)
+        return {"updated": int(updated), "skipped": len(transactions) - int(updated)}
+
+    def _delete_transactions(self, db, transaction_ids: List[str]) -> int:
+        """Delete transactions by Plaid transaction_id in chunks that stay under SQL Server's parameter cap."""
+        deleted = 0
+        ids = list(dict.fromkeys(tid for tid in transaction_ids if tid))
+        for start in range(0, len(ids), _ID_CHUNK_SIZE):
+            chunk = ids[start:start + _ID_CHUNK_SIZE]
+            deleted += (
+                db.query(Transaction)
+                .filter(Transaction.transaction_id.in_(chunk))
+                .delete(synchronize_session=False)
+            )
+        return deleted
+
+    def bulk_upsert_transactions(
+        self,
+        item_id: str,
+        transactions: List[dict],
+        account_index: Optional[AccountIndex] = None,
+    ) -> Dict[str, int]:
+        """Set-based upsert of a page of transactions.
+
+        Loads the page into a temp staging table with fast_executemany and applies it
+        with a single MERGE keyed on transactions.transaction_id, so a page costs a
+        handful of round trips instead of two SELECTs per row.
+
+        Returns {"inserted", "updated", "skipped"}; skipped covers rows without an id or
+        date, duplicates within the page and rows for accounts not in the DB.
+        """
+        account_index = account_index or self.account_index(item_id)
         try:
             with get_db_session() as db:
-                record = db.query(PlaidUser).filter(PlaidUser.item_id == item_id).first()
-                if record:
-                    record.cursor = new_cursor
-                    db.commit()
+                counts = self._merge_transactions(db, transactions, account_index)
+                db.commit()
         except Exception as e:
-            logger.warning(f"Failed to persist cursor: {e}")
+            logger.error(f"Error bulk upserting transactions for item {item_id}: {e}")
+            raise
+        return counts
 
-        return {"accounts_synced": 0, "transactions_synced": transactions_synced}
+    def bulk_update_transactions(self, item_id: str, transactions: List[dict]) -> Dict[str, int]:
+        """Apply a page of Plaid ``modified`` transactions with one staged UPDATE.
 
-    # -----------------------------
-    # Sync helpers using SQLAlchemy
-    # -----------------------------
-    def upsert_accounts(self, item_id: str, accounts: List[dict]) -> int:
-        """Upsert accounts into DB using SQLAlchemy. Returns number of accounts upserted."""
-        count = 0
+        Only rows that already exist are touched. Returns {"updated", "skipped"}.
+        """
         try:
             with get_db_session() as db:
-                # lookup plaid_user id
-                plaid_user = db.query(PlaidUser).filter(PlaidUser.item_id == item_id).first()
-                if not plaid_user:
-                    raise Exception("Plaid user not found")
-
-                for acct in accounts:
-                    existing = db.query(Account).filter(Account.account_id == acct.get('account_id')).first()
-                    if existing:
-                        existing.name = acct.get('name')
-                        existing.type = acct.get('type')
-                        existing.subtype = acct.get('subtype')
-                        existing.balance_current = acct.get('balance')
-                        existing.currency = acct.get('currency')
-                        existing.nickname = acct.get('nickname') or existing.nickname
-                    else:
-                        new_acc = Account(
-                            plaid_user_id=plaid_user.id,
-                            account_id=acct.get('account_id'),
-                            name=acct.get('name'),
-                            type=acct.get('type'),
-                            subtype=acct.get('subtype'),
-                            balance_current=acct.get('balance'),
-                            currency=acct.get('currency'),
-                            nickname=acct.get('nickname') if acct.get('nickname') else None,
-                        )
-                        db.add(new_acc)
-                    count += 1
-
+                counts = self._update_transactions(db, transactions)
                 db.commit()
-            return count
         except Exception as e:
-            logger.error(f"Error upserting accounts: {e}")
+            logger.error(f"Error bulk updating transactions for item {item_id}: {e}")
             raise
+        return counts
 
-    def upsert_transactions(self, item_id: str, transactions: List[dict]) -> int:
-        """Upsert transactions. Resolve account via Account.account_id. Returns number inserted/updated count."""
-        count = 0
+    def bulk_delete_transactions(self, item_id: str, transaction_ids: List[str]) -> int:
+        """Delete a page of Plaid ``removed`` transactions. Returns the number of rows deleted."""
+        if not transaction_ids:
+            return 0
         try:
             with get_db_session() as db:
-                for tx in transactions:
-                    # resolve account local id
-                    account = db.query(Account).filter(Account.account_id == tx.get('account_id')).first()
-                    if not account:
-                        # skip transactions for unknown accounts
-                        logger.warning(f"Account not found for transaction account_id={tx.get('account_id')}")
-                        continue
-
-                    existing = db.query(Transaction).filter(Transaction.transaction_id == tx.get('transaction_id')).first()
-                    posted_at = tx.get('date')
-                    # Normalize posted_at into a timezone-aware datetime (UTC).
-                    # Accepts: datetime, date, ISO strings (with Z or timezone), and
-                    # strings with >6 fractional second digits (truncates to microseconds).
-                    def _to_datetime(val):
-                        if val is None:
-                            return None
-                        # already a datetime
-                        if isinstance(val, datetime):
-                            if val.tzinfo is None:
-                                return val.replace(tzinfo=timezone.utc)
-                            return val
-                        # plain date -> convert to midnight UTC
-                        if isinstance(val, date):
-                            return datetime.combine(val, datetime.min.time()).replace(tzinfo=timezone.utc)
-                        # parse strings
-                        if isinstance(val, str):
-                            s = val
-                            # normalize Z suffix
-                            if s.endswith('Z'):
-                                s = s[:-1] + '+00:00'
-
-                            # handle long fractional seconds: ensure at most 6 digits
-                            if '.' in s:
-                                # split fractional and timezone parts
-                                main, frac_tz = s.split('.', 1)
-                                # frac_tz may contain timezone (+/-) or nothing
-                                tz_idx = None
-                                for idx, ch in enumerate(frac_tz):
-                                    if ch in ['+', '-']:
-                                        tz_idx = idx
-                                        break
-                                if tz_idx is not None:
-                                    frac = frac_tz[:tz_idx]
-                                    tz = frac_tz[tz_idx:]
-                                else:
-                                    # no explicit tz in frac_tz
-                                    frac = frac_tz
-                                    tz = ''
-                                # remove any trailing Z
-                                if frac.endswith('Z'):
-                                    frac = frac[:-1]
-                                if len(frac) > 6:
-                                    frac = frac[:6]
-                                s = main + '.' + frac + tz
-
-                            try:
-                                dt = datetime.fromisoformat(s)
-                                if dt.tzinfo is None:
-                                    dt = dt.replace(tzinfo=timezone.utc)
-                                return dt
-                            except Exception:
-                                # fallback to date-only
-                                try:
-                                    dt = datetime.strptime(s, '%Y-%m-%d')
-                                    return dt.replace(tzinfo=timezone.utc)
-                                except Exception:
-                                    raise
-
-                        # unknown type - return as-is
-                        return val
-
-                    # imports used by helper
-                    from datetime import timezone, date
-
-                    posted_at = _to_datetime(posted_at)
-
-                    if existing:
-                        existing.amount = tx.get('amount')
-                        existing.date_posted = posted_at
-                        existing.merchant_name = tx.get('merchant_name')
-                        existing.description = tx.get('name')
-                        existing.is_pending = 1 if tx.get('pending') else 0
-                        existing.category = ','.join(tx.get('category')) if tx.get('category') and isinstance(tx.get('category'), list) else (tx.get('category') or None)
-                    else:
-                        new_tx = Transaction(
-                            account_id=account.account_id,
-                            transaction_id=tx.get('transaction_id'),
-                            amount=tx.get('amount'),
-                            date_posted=posted_at,
-                            merchant_name=tx.get('merchant_name'),
-                            description=tx.get('name'),
-                            iso_currency_code=tx.get('iso_currency_code') if tx.get('iso_currency_code') else None,
-                            category=','.join(tx.get('category')) if tx.get('category') and isinstance(tx.get('category'), list) else (tx.get('category') or None),
-                            is_pending=1 if tx.get('pending') else 0,
-                        )
-                        db.add(new_tx)
-                    count += 1
-
+                deleted = self._delete_transactions(db, transaction_ids)
                 db.commit()
-            return count
         except Exception as e:
-            logger.error(f"Error upserting transactions: {e}")
+            logger.error(f"Error deleting removed transactions for item {item_id}: {e}")
             raise
-
-    def sync_item_transactions(self, item_id: str) -> dict:
+        return deleted
+
+    def sync_item_transactions(
+        self,
+        item_id: str,
+        pipelined: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+        progress: Optional[Callable[[dict], None]] = None,
+        page_size: Optional[int] = None,
+    ) -> dict:
         """Run Plaid transactions/sync for the given item_id and persist results.
 
-        Uses Plaid's incremental sync cursor loop. Returns counts.
+        Uses Plaid's incremental sync cursor loop, starting from the stored cursor. Each
+        page's rows and cursor commit atomically, so an interrupted run (crash, deploy)
+        resumes from the last committed page instead of restarting the backfill. With
+        ``pipelined=True`` the next page is downloaded while the current one is written
+        (see ``_pipelined``). When a
+        ``rate_limiter`` is given, every Plaid request waits for a token first.
+        ``progress`` is called after each committed page with {"pages", "rows_written"}.
+        Pages are sized by ``AdaptivePageSize`` from observed fetch and write times unless
+        a fixed ``page_size`` is given. Returns counts.
         """
         # get plaid user record
         plaid_user = self.get_plaid_user_by_item_id(item_id)
@@ -437,7 +659,9 @@ class PlaidRepository:
             raise Exception("Plaid user not found")
 
         # Accounts - use service to get accounts and upsert
-        accounts = plaid_service.get_accounts(plaid_user.access_token)
+        if rate_limiter:
+            rate_limiter.acquire()
+        accounts = plaid_service.get_accounts(plaid_user.access_token, institution=plaid_user.institution_name)
         acct_dicts = []
         for a in accounts:
             acct_dicts.append({
@@ -446,70 +670,182 @@ class PlaidRepository:
                 'type': a.type,
                 'subtype': a.subtype,
                 'balance': a.balance,
+                'balance_available': a.balance_available,
                 'currency': a.currency,
             })
 
         accounts_synced = self.upsert_accounts(item_id, acct_dicts)
 
-        # Transactions sync (cursor loop)
+        # Transactions sync (cursor loop); accounts are resolved once per run, not per row
+        account_index = AccountIndex(item_id, plaid_user.id)
         cursor = plaid_user.cursor if hasattr(plaid_user, 'cursor') else None
-        total_tx_synced = 0
-
+        if cursor:
+            logger.info(f"Syncing item {item_id} from stored cursor")
+        totals = {"inserted": 0, "updated": 0, "skipped": 0, "modified": 0, "removed": 0, "pages": 0}
+
+        if page_size:
+            sizer = AdaptivePageSize(page_size, min_size=page_size, max_size=page_size)
+        else:
+            sizer = AdaptivePageSize.for_sync(cursor, pipelined=pipelined)
+        # the PlaidUser.access_token property decrypts the stored token (through token_cache) here
+        pages = self._sync_pages(
+            plaid_user.access_token, cursor, rate_limiter, institution=plaid_user.institution_name, page_size=sizer
+        )
+        if pipelined:
+            pages = self._pipelined(pages, get_settings().PLAID_SYNC_QUEUE_SIZE)
+        try:
+            # pages are written strictly in order, so the stored cursor never runs ahead of the data
+            for resp in pages:
+                started = time.perf_counter()
+                counts = self._write_sync_page(item_id, resp, account_index)
+                sizer.record_write(_page_rows(resp), time.perf_counter() - started)
+                for key in counts:
+                    totals[key] += counts[key]
+                totals["pages"] += 1
+                if progress:
+                    rows_written = totals["inserted"] + totals["updated"] + totals["modified"] + totals["removed"]
+                    progress({"pages": totals["pages"], "rows_written": rows_written})
+        finally:
+            pages.close()
+
+        # balances may have moved with the new transactions
+        accounts_cache.invalidate(item_id)
+
+        added = totals["inserted"] + totals["updated"]
+        return {
+            "accounts_synced": accounts_synced,
+            "transactions_synced": added + totals["modified"],
+            "transactions_added": added,
+            "transactions_modified": totals["modified"],
+            "transactions_removed": totals["removed"],
+            "transactions_inserted": totals["inserted"],
+            "transactions_updated": totals["updated"],
+            "transactions_skipped": totals["skipped"],
+            "pages": totals["pages"],
+            "page_size": sizer.size,
+            "resumed_from_cursor": bool(cursor),
+        }
+
+    def _sync_pages(
+        self,
+        access_token: str,
+        cursor: Optional[str],
+        rate_limiter: Optional[TokenBucket] = None,
+        institution: Optional[str] = None,
+        page_size: Optional[AdaptivePageSize] = None,
+    ) -> Iterator[dict]:
+        """Yield raw transactions/sync pages from ``cursor`` until Plaid reports has_more=False.
+
+        When ``page_size`` is given each request asks for its current size and the
+        download time is recorded on it.
+
+        Each request goes through ``plaid_retrier``, so rate limits and institution outages
+        are retried in place; every retry takes a fresh rate-limiter token.
+        """
         while True:
-            # build request — `get_plaid_user_by_item_id` decrypts the token at the DB boundary, so use it directly
-            req = TransactionsSyncRequest(access_token=plaid_user.access_token)
+            req = TransactionsSyncRequest(access_token=access_token)
             if cursor:
                 req.cursor = cursor
+            if page_size:
+                req.count = page_size.size
+
+            def fetch():
+                if rate_limiter:
+                    rate_limiter.acquire()
+                # time only Plaid itself; rate-limiter waits say nothing about the page size
+                started = time.perf_counter()
+                response = plaid_service.client.transactions_sync(req)
+                if page_size:
+                    page_size.record_fetch(time.perf_counter() - started)
+                return response
+
+            resp = plaid_retrier.call(fetch, institution=institution, operation="transactions_sync").to_dict()
+            yield resp
+
+            if not resp.get('has_more', False):
+                return
+            cursor = resp.get('next_cursor') or resp.get('cursor')
+
+    def _pipelined(self, pages: Iterator[dict], queue_size: int) -> Iterator[dict]:
+        """Fetch ``pages`` on a background thread while the caller writes the previous page.
+
+        Pages are handed over through a bounded queue: once ``queue_size`` pages are
+        waiting the fetcher blocks, so memory stays flat however far Plaid is ahead of
+        the database. Fetch errors are re-raised in the consumer. Closing the generator
+        (e.g. because a write failed) stops the fetcher before it requests more pages.
+        """
+        handoff: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        stop = threading.Event()
 
-            # call Plaid
-            resp = plaid_service.client.transactions_sync(req).to_dict()
-
-            added = resp.get('added', [])
-            txs_to_upsert = []
-            for t in added:
-                # map category
-                cat = None
-                if t.get('personal_finance_category'):
-                    cat = [t['personal_finance_category'].get('primary')]
-                elif t.get('category'):
-                    cat = t.get('category')
-
-                txs_to_upsert.append({
-                    'transaction_id': t.get('transaction_id'),
-                    'account_id': t.get('account_id'),
-                    'amount': t.get('amount'),
-                    'date': t.get('date'),
-                    'merchant_name': t.get('merchant_name'),
-                    'name': t.get('name'),
-                    'pending': t.get('pending', False),
-                    'category': cat,
-                    'iso_currency_code': t.get('iso_currency_code')
-                })
-
-            if txs_to_upsert:
-                count = self.upsert_transactions(item_id, txs_to_upsert)
-                total_tx_synced += count
-
-            # handle cursor and has_more
-            has_more = resp.get('has_more', False)
-            new_cursor = resp.get('next_cursor') or resp.get('cursor')
-
-            # persist new cursor on PlaidUser
-            try:
-                with get_db_session() as db:
-                    pu = db.query(PlaidUser).filter(PlaidUser.item_id == item_id).first()
-                    if pu:
-                        pu.cursor = new_cursor
-                        db.commit()
-            except Exception as e:
-                logger.warning(f"Unable to persist cursor for item {item_id}: {e}")
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    handoff.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-            if not has_more:
-                break
+        def fetch():
+            try:
+                for page in pages:
+                    if not put(page):
+                        return
+                put(_PAGES_DONE)
+            except BaseException as e:
+                put(e)
+
+        fetcher = threading.Thread(target=fetch, name="plaid-sync-fetcher", daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                item = handoff.get()
+                if item is _PAGES_DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            fetcher.join()
+
+    def _write_sync_page(self, item_id: str, resp: dict, account_index: AccountIndex) -> Dict[str, int]:
+        """Apply one transactions/sync page and advance the stored cursor in a single DB transaction.
+
+        The page's added, modified and removed deltas and the cursor update commit
+        together, so after a crash the stored cursor always points just past the last
+        fully written page and a re-run resumes from there.
+        """
+        counts = {"inserted": 0, "updated": 0, "skipped": 0, "modified": 0, "removed": 0}
+        added = [_map_sync_transaction(t) for t in resp.get('added', [])]
+        modified = [_map_sync_transaction(t) for t in resp.get('modified', [])]
+        removed = [t.get('transaction_id') for t in resp.get('removed', [])]
+        new_cursor = resp.get('next_cursor') or resp.get('cursor')
 
-            cursor = new_cursor
+        try:
+            with get_db_session() as db:
+                if added:
+                    counts.update(self._merge_transactions(db, added, account_index))
+                if modified:
+                    result = self._update_transactions(db, modified)
+                    counts["modified"] = result["updated"]
+                    counts["skipped"] += result["skipped"]
+                if removed:
+                    counts["removed"] = self._delete_transactions(db, removed)
+
+                updated = (
+                    db.query(PlaidUser)
+                    .filter(PlaidUser.item_id == item_id)
+                    .update({PlaidUser.cursor: new_cursor}, synchronize_session=False)
+                )
+                if not updated:
+                    logger.warning(f"Plaid user for item {item_id} disappeared during sync; cursor not stored")
+                db.commit()
+        except Exception as e:
+            logger.error(f"Error writing sync page for item {item_id}: {e}")
+            raise
 
-        return {"accounts_synced": accounts_synced, "transactions_synced": total_tx_synced}
+        return counts
 
 # Global instance
 plaid_repository = PlaidRepository()
\ No newline at end of file
@@ -1,11 +1,31 @@
 import logging
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload,  selectinload
+from app.cache import TTLCache
+from app.config import get_settings
 from app.database import get_db_session
+from app.metrics import metrics
 from app.models.db_models import User, PlaidUser, Account
 from app.models.db_schemas import AccountUpdate
 logger = logging.getLogger(__name__)
 
+_settings = get_settings()
+
+# Auth0 sub -> users.id; ids never change, so only upsert_user has to invalidate
+user_id_cache = TTLCache(
+    maxsize=_settings.USER_ID_CACHE_SIZE,
+    ttl_seconds=_settings.USER_ID_CACHE_TTL_SECONDS,
+)
+
+
+def user_id_cache_stats() -> dict:
+    stats = user_id_cache.stats()
+    # every hit is a users query the request path did not run; every miss ran one
+    return {**stats, "db_queries": stats["misses"], "db_queries_saved": stats["hits"]}
+
+
+metrics.register("user_id_cache", user_id_cache_stats)
+
 class UserRepository:
 
     def upsert_user(self, user: dict):
@@ -31,12 +51,24 @@ class UserRepository:
                 db.add(new_user)
                 db.commit()
                 db.refresh(new_user)
+                db_user = new_user
+            # replaces any cached id for this sub and saves the next request its lookup
+            user_id_cache.set(user["sub"], db_user.id)
 
     def get_id(self, sub: str):
         with get_db_session() as db:
             db_user = db.query(User).filter(User.sub == sub).first()
             if db_user:
                 return db_user.id
+
+    def resolve_id(self, sub: str) -> Optional[int]:
+        """get_id through user_id_cache; unknown subs are not cached, so a new user resolves once inserted."""
+        user_id = user_id_cache.get(sub)
+        if user_id is None:
+            user_id = self.get_id(sub)
+            if user_id is not None:
+                user_id_cache.set(sub, user_id)
+        return user_id
         
     def get_user_with_accounts(self, sub: str):
         with get_db_session() as db:
@@ -1,7 +1,6 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload, selectinload
-from auth0 import authentication
 
 from app.database import get_db
 from app.models.db_models import Household, HouseholdAccount, HouseholdMember
@@ -11,27 +10,13 @@ from app.models.db_schemas import (
     HouseholdMemberCreate,
     HouseholdMemberRead,
 )
-from app.security.utils import verify_token
-from app.dependencies import get_auth0_users_client
-from app.repositories.user_repository import user_repository
+from app.dependencies import get_current_user_id
 
 from pydantic import BaseModel
 
 router = APIRouter()
 
 
-def _get_current_user_id(access_token: str, auth0_users: authentication.Users) -> int:
-    """Helper to resolve Auth0 userinfo -> local user id.
-
-    Raises HTTPException(404) if local user not found.
-    """
-    userinfo = auth0_users.userinfo(access_token=access_token)
-    user_id = user_repository.get_id(userinfo.get("sub"))
-    if user_id is None:
-        raise HTTPException(status_code=404, detail="User id not found")
-    return user_id
-
-
 @router.get("/", response_model=List[HouseholdRead])
 def get_households(db: Session = Depends(get_db)):
     households = (
@@ -71,8 +56,7 @@ def get_household_by_id(household_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=HouseholdRead, status_code=status.HTTP_201_CREATED)
 def create_household(
     household_in: HouseholdCreate,
-    access_token: str = Depends(verify_token),
-    auth0_users: authentication.Users = Depends(get_auth0_users_client),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Create a household. If owner_id is not provided, default to the current user.
@@ -83,8 +67,6 @@ def create_household(
       "owner_id": 123  # optional
     }
     """
-    current_user_id = _get_current_user_id(access_token, auth0_users)
-
     owner_id = getattr(household_in, "owner_id", None) or current_user_id
 
     new_household = Household(name=household_in.name, owner_id=owner_id)
@@ -118,16 +100,13 @@ def create_household(
 @router.delete("/{household_id}")
 def delete_household(
     household_id: int,
-    access_token: str = Depends(verify_token),
-    auth0_users: authentication.Users = Depends(get_auth0_users_client),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Delete a household and cascade-delete related accounts and members.
 
     Only the household owner may delete the household.
     """
-    current_user_id = _get_current_user_id(access_token, auth0_users)
-
     household = db.query(Household).filter(Household.id == household_id).first()
     if not household:
         raise HTTPException(status_code=404, detail="Household not found")
@@ -148,9 +127,8 @@ def delete_household(
 def add_household_member(
     household_id: int,
     member_in: HouseholdMemberCreate,
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
-    access_token: str = Depends(verify_token),
-    auth0_users: authentication.Users = Depends(get_auth0_users_client),
 ):
     """Add a member to a household. Role defaults to 'member' if not provided.
 
@@ -196,16 +174,13 @@ class DeleteMembersRequest(BaseModel):
 def delete_household_members(
     household_id: int,
     body: DeleteMembersRequest,
-    access_token: str = Depends(verify_token),
-    auth0_users: authentication.Users = Depends(get_auth0_users_client),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Remove the specified user_ids from the household members list.
 
     Only the household owner may perform this action.
     """
-    current_user_id = _get_current_user_id(access_token, auth0_users)
-
     household = db.query(Household).filter(Household.id == household_id).first()
     if not household:
         raise HTTPException(status_code=404, detail="Household not found")
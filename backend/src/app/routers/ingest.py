@@ -1,5 +1,4 @@
 from fastapi import APIRouter, UploadFile, HTTPException
-import pandas as pd
 from app.models.plaid_models import TransactionIn
 from app.db import get_connection
 
@@ -7,6 +6,9 @@ router = APIRouter()
 
 @router.post("/upload")
 async def upload_transactions(file: UploadFile):
+    # pandas is only needed here; importing it lazily keeps it off the app's startup path
+    import pandas as pd
+
     try:
         df = pd.read_csv(file.file)
     except Exception as e:
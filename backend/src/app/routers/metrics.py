@@ -0,0 +1,27 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.config import get_settings
+from app.metrics import metrics
+
+router = APIRouter()
+
+
+def require_metrics_token(request: Request):
+    """Only scrapers holding METRICS_TOKEN may read /metrics; without one configured it does not exist."""
+    token = get_settings().METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    """Cache, queue and client counters for tuning TTLs and limits against Plaid spend and latency."""
+    return metrics.snapshot()
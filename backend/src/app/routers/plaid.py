@@ -1,8 +1,11 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import SecurityScopes
+from pydantic import ValidationError
 from plaid.model.accounts_get_request import AccountsGetRequest
 from plaid.model.transactions_sync_request import TransactionsSyncRequest
 
@@ -13,16 +16,25 @@ from app.models.plaid_models import (
     PlaidPublicTokenExchangeRequest,
     PlaidPublicTokenExchangeResponse,
     PlaidAccountsResponse,
+    PlaidConnectionError,
     PlaidTransactionsResponse,
     PlaidUser,
-    SyncItemRequest
+    PlaidWebhook,
+    SyncItemRequest,
+    SyncJob
 )
+from app.config import get_settings
 from app.db import get_connection
-from app.external_services.plaid_service import plaid_service
+from app.dependencies import get_current_user_id
+from app.external_services.plaid_service import plaid_service, accounts_cache
+from app.external_services.async_plaid_service import async_plaid_service
+from app.repositories.institution_repository import institution_repository
 from app.repositories.plaid_repository import plaid_repository
-from app.repositories.user_repository import user_repository
+from app.security.plaid_webhook import WebhookVerificationError, plaid_webhook_verifier, verification_required
 from app.security.utils import get_verified_token
 from app.security.access_token import AccessToken
+from app.sync.jobs import sync_job_queue
+from app.sync.webhooks import webhook_coalescer, SYNC_WEBHOOK_CODES, IGNORED
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -30,20 +42,12 @@ router = APIRouter()
 @router.post("/create_link_token", response_model=PlaidLinkTokenResponse)
 async def create_link_token(
     request: PlaidLinkTokenRequest,
-    token: AccessToken = Depends(get_verified_token)
+    token: AccessToken = Depends(get_verified_token),
+    user_id: int = Depends(get_current_user_id)
 ):
     """Create a link token for Plaid Link initialization."""
     try:
         print("Calling create_link_token")
-        # Get user ID from database using Auth0 sub
-        user_id = user_repository.get_id(token.sub)
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        print("Found user")
-        
         # Create link token
         print("Calling plaid service")
         link_token = plaid_service.create_link_token(
@@ -60,44 +64,59 @@ async def create_link_token(
             detail=f"Failed to create link token: {str(e)}"
         )
 
+def _resolve_institution_name(plaid_user_id: int, access_token: str):
+    """Look up a new connection's institution and store its name on the PlaidUser.
+
+    The name comes from the institution cache when the bank has been linked before;
+    only unknown institutions cost a Plaid /institutions/get_by_id call. A plain ``def``
+    so Starlette runs it in the threadpool: the DB calls block.
+    """
+    try:
+        institution_id = plaid_service.get_item_institution_id(access_token)
+        if not institution_id:
+            return
+        institution_name = institution_repository.get_name(institution_id)
+        if institution_name is None:
+            institution_name = plaid_service.get_institution_name_by_id(institution_id)
+            if not institution_name:
+                return
+            institution_repository.save(institution_id, institution_name)
+        plaid_repository.update_institution_name(plaid_user_id, institution_name)
+    except Exception as e:
+        logger.error(f"Error resolving institution for Plaid connection {plaid_user_id}: {e}")
+
 @router.post("/exchange_public_token", response_model=PlaidPublicTokenExchangeResponse)
 async def exchange_public_token(
     request: PlaidPublicTokenExchangeRequest,
-    token: AccessToken = Depends(get_verified_token)
+    background_tasks: BackgroundTasks,
+    user_id: int = Depends(get_current_user_id)
 ):
-    """Exchange public token for access token and store in database."""
+    """Exchange public token for access token and store in database.
+
+    The institution name is resolved in a background task after the response, so it is
+    not part of the response; it shows up on the connection shortly after.
+    """
     try:
-        # Get user ID from database using Auth0 sub
-        user_id = user_repository.get_id(token.sub)
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
         # Exchange public token for access token
         print("exchanging result")
-        exchange_result = plaid_service.exchange_public_token(request.public_token)
+        exchange_result = await async_plaid_service.exchange_public_token(request.public_token)
         access_token = exchange_result['access_token']
         item_id = exchange_result['item_id']
         print("Received response back")
         
-        # Get institution name
-        institution_name = plaid_service.get_institution_name(access_token)
-        print("Got institution name", institution_name)
-        
         # Store encrypted access token in database
         plaid_user_id = plaid_repository.create_plaid_user(
             user_id=user_id,
             access_token=access_token,
-            item_id=item_id,
-            institution_name=institution_name
+            item_id=item_id
         )
+
+        # Institution lookup (item_get + cached institution name) runs off the critical path
+        background_tasks.add_task(_resolve_institution_name, plaid_user_id, access_token)
         
         return PlaidPublicTokenExchangeResponse(
             access_token_id=str(plaid_user_id),
-            item_id=item_id,
-            institution_name=institution_name
+            item_id=item_id
         )
         
     except Exception as e:
@@ -109,48 +128,84 @@ async def exchange_public_token(
 
 @router.get("/accounts", response_model=PlaidAccountsResponse)
 async def get_accounts(
-    plaid_user_ids: Optional[List[int]] = None,
-    token: AccessToken = Depends(get_verified_token)
+    background_tasks: BackgroundTasks,
+    plaid_user_ids: Optional[List[int]] = Query(None),
+    max_staleness: Optional[int] = None,
+    user_id: int = Depends(get_current_user_id)
 ):
-    """Get accounts for the authenticated user."""
+    """Get accounts for the authenticated user.
+
+    Connections and their stored accounts are read from the DB in one query. With
+    ``max_staleness`` (seconds), connections synced within that window are served from
+    the DB and only older ones go to Plaid; the refreshed balances are written back after
+    the response. Without it every connection is fetched from Plaid (through the accounts
+    cache).
+
+    Plaid is queried concurrently (bounded by PLAID_ACCOUNTS_CONCURRENCY), each connection
+    with its own timeout. Connections that fail or time out are listed in ``errors``, with
+    their last stored accounts returned when there are any.
+    """
     try:
-        # Get user ID from database using Auth0 sub
-        user_id = user_repository.get_id(token.sub)
-        if not user_id:
+        staleness = timedelta(seconds=max_staleness) if max_staleness is not None else None
+        connections = plaid_repository.get_account_snapshot(user_id, staleness, plaid_user_ids)
+        if not connections:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
+                detail="Plaid connection not found" if plaid_user_ids else "No Plaid connection found for user"
             )
-        
-        # Get Plaid user record
-        if plaid_user_ids:
-            plaid_users = plaid_repository.get_all_plaid_users_for_user(user_id)
-            if not plaid_users or len(plaid_users) == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Plaid connection not found"
-                )
-        else:
-            plaid_users = plaid_repository.get_all_plaid_users_for_user(user_id)
-            print("Users: ", plaid_users)
-            if not plaid_users:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No Plaid connection found for user"
-                )
-        
-        # Get accounts from Plaid
+
         accounts = []
-        for user in plaid_users:
-            print("Individual user: ", user)
-            response = plaid_service.get_accounts(user.access_token)
-            print("Response:  ", response)
-            for account in response:
-                account.connection_id = user.id
+        stale = []
+        for conn in connections:
+            if conn["stale"]:
+                stale.append(conn)
+            else:
+                accounts.extend(conn["accounts"])
+
+        # Query every stale connection concurrently; a slow or failing bank only marks its own entry
+        settings = get_settings()
+        semaphore = asyncio.Semaphore(settings.PLAID_ACCOUNTS_CONCURRENCY)
+        # in DB mode the accounts table is the cache, so go to Plaid for fresh balances
+        use_cache = staleness is None
+
+        async def fetch(conn):
+            async with semaphore:
+                return await asyncio.wait_for(
+                    async_plaid_service.get_accounts(
+                        conn["access_token"],
+                        item_id=conn["item_id"] if use_cache else None,
+                        institution=conn["institution_name"],
+                    ),
+                    timeout=settings.PLAID_ACCOUNTS_TIMEOUT_SECONDS,
+                )
+
+        results = await asyncio.gather(*(fetch(conn) for conn in stale), return_exceptions=True)
+
+        errors = []
+        for conn, result in zip(stale, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.TimeoutError):
+                    message = f"Timed out after {settings.PLAID_ACCOUNTS_TIMEOUT_SECONDS}s"
+                else:
+                    message = str(result) or type(result).__name__
+                logger.error(f"Error getting accounts for connection {conn['id']}: {message}")
+                errors.append(PlaidConnectionError(
+                    connection_id=conn["id"],
+                    institution_name=conn["institution_name"],
+                    error=message,
+                ))
+                # fall back to whatever the DB last stored
+                accounts.extend(conn["accounts"])
+                continue
+            for account in result:
+                account.connection_id = conn["id"]
                 accounts.append(account)
-        #accounts = plaid_service.get_accounts(plaid_user.access_token)
-        
-        return PlaidAccountsResponse(accounts=accounts)
+            if not use_cache:
+                background_tasks.add_task(
+                    plaid_repository.upsert_accounts, conn["item_id"], [a.model_dump() for a in result]
+                )
+
+        return PlaidAccountsResponse(accounts=accounts, errors=errors)
         
     except HTTPException:
         raise
@@ -168,27 +223,24 @@ async def get_accounts(
 
 @router.get("/connections", response_model=List[PlaidUser])
 async def get_plaid_connections(
-    token: AccessToken = Depends(get_verified_token)
+    user_id: int = Depends(get_current_user_id)
 ):
     """Get all Plaid connections for the authenticated user."""
     try:
-        # Get user ID from database using Auth0 sub
-        user_id = user_repository.get_id(token.sub)
-        print("User id: ", user_id)
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        # Get all Plaid connections for the user
+        # Get all Plaid connections for the user; tokens stay encrypted since they are never read
         plaid_users = plaid_repository.get_all_plaid_users_for_user(user_id)
         
         # Don't return the actual access tokens in the response
-        for plaid_user in plaid_users:
-            plaid_user.access_token = "***encrypted***"
-        
-        return plaid_users
+        return [
+            {
+                "id": plaid_user.id,
+                "user_id": plaid_user.user_id,
+                "item_id": plaid_user.item_id,
+                "institution_name": plaid_user.institution_name,
+                "access_token": "***encrypted***",
+            }
+            for plaid_user in plaid_users
+        ]
         
     except HTTPException:
         raise
@@ -202,20 +254,11 @@ async def get_plaid_connections(
 @router.delete("/connections/{plaid_user_id}")
 async def delete_plaid_connection(
     plaid_user_id: int,
-    token: AccessToken = Depends(get_verified_token)
+    user_id: int = Depends(get_current_user_id)
 ):
     """Delete a Plaid connection for the authenticated user."""
     try:
         print("Deleting plaid connection id:", plaid_user_id)
-        # Get user ID from database using Auth0 sub
-        user_id = user_repository.get_id(token.sub)
-        print("User id: ", user_id)
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
         # Verify the Plaid connection belongs to the user
         plaid_users = plaid_repository.get_all_plaid_users_for_user(user_id)
         
@@ -245,19 +288,77 @@ async def delete_plaid_connection(
             detail=f"Failed to delete Plaid connection: {str(e)}"
         )
 
-@router.post("/sync_item")
-async def sync_item(request: SyncItemRequest):
-    """Sync accounts + transactions for a given Plaid item using the repository sync helper.
+def _owns_item(user_id: int, item_id: Optional[str]) -> bool:
+    """Whether ``item_id`` is one of ``user_id``'s Plaid connections."""
+    plaid_user = plaid_repository.get_plaid_user_by_item_id(item_id) if item_id else None
+    return plaid_user is not None and plaid_user.user_id == user_id
+
 
-    The repository implements Plaid's transactions/sync incremental cursor flow and upserts
-    accounts and transactions into the DB.
+@router.post("/sync_item", response_model=SyncJob, status_code=status.HTTP_202_ACCEPTED)
+def sync_item(request: SyncItemRequest, user_id: int = Depends(get_current_user_id)):
+    """Queue a background sync of accounts + transactions for one of the caller's Plaid items.
+
+    The job runs the repository's transactions/sync incremental cursor flow, upserts
+    accounts and transactions into the DB and applies modified/removed deltas. If the
+    item already has a queued or running job, that job is returned instead of a new one.
+    Poll GET /sync_jobs/{id} for progress; the finished job's result carries
+    transactions_added, transactions_modified and transactions_removed counts. Items
+    that are not the caller's get a 404.
     """
     item_id = request.item_id
+    if not _owns_item(user_id, item_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plaid item not found")
     try:
-        result = plaid_repository.sync_item_transactions(item_id)
-        return {"status": "ok", "item_id": item_id, **result}
-    except HTTPException:
-        raise
+        return sync_job_queue.enqueue(item_id, pipelined=request.pipelined)
     except Exception as e:
-        logger.error(f"Error syncing item {item_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to sync item: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error queueing sync for item {item_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue sync: {str(e)}")
+
+@router.get("/sync_jobs/{job_id}", response_model=SyncJob)
+def get_sync_job(job_id: str, user_id: int = Depends(get_current_user_id)):
+    """Report a sync job's status and progress: pages fetched, rows written and elapsed time.
+
+    Jobs for items that are not the caller's get the same 404 as unknown job ids.
+    """
+    job = sync_job_queue.get(job_id)
+    if not job or not _owns_item(user_id, job["item_id"]):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return job
+
+@router.post("/webhook")
+async def plaid_webhook(request: Request):
+    """Receive Plaid webhooks and trigger incremental syncs.
+
+    The Plaid-Verification JWT is checked against the raw body before anything is acted
+    on; unsigned, tampered or stale webhooks get a 401.
+
+    TRANSACTIONS sync events (SYNC_UPDATES_AVAILABLE and the legacy update codes) are
+    coalesced per item over a debounce window into a single background sync job;
+    events for items whose sync is still queued are dropped, and items syncing right now
+    get another sync after the running one. Other webhooks are acknowledged
+    and ignored. Any webhook for an item invalidates its cached accounts. The coalescer
+    reads and marks jobs in the SQLite job store, so it runs in the threadpool.
+    """
+    body = await request.body()
+    if verification_required():
+        try:
+            await plaid_webhook_verifier.verify(body, request.headers.get("Plaid-Verification"))
+        except WebhookVerificationError as e:
+            logger.warning(f"Rejected Plaid webhook: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Plaid webhook signature"
+            )
+    try:
+        webhook = PlaidWebhook.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
+
+    if webhook.item_id:
+        # any item event may change balances or accounts
+        accounts_cache.invalidate(webhook.item_id)
+    if webhook.webhook_type != "TRANSACTIONS" or webhook.webhook_code not in SYNC_WEBHOOK_CODES or not webhook.item_id:
+        logger.info(f"Ignoring Plaid webhook {webhook.webhook_type}/{webhook.webhook_code} for item {webhook.item_id}")
+        return {"status": IGNORED}
+    outcome = await run_in_threadpool(webhook_coalescer.submit, webhook.item_id)
+    return {"status": outcome, "item_id": webhook.item_id}
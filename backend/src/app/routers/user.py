@@ -6,8 +6,11 @@ from pydantic import BaseModel, AnyUrl, EmailStr
 
 from auth0.exceptions import Auth0Error
 
-from app.security.utils import verify_token
+from app.security.token_tools import TokenTools
+from app.security.userinfo import lookup_userinfo
+from app.security.utils import token_tools_factory, verify_token
 from app.dependencies import get_auth0_users_client, get_auth0_management_client, authentication, management
+from app.dependencies import get_current_user_id as current_user_id
 from app.config import get_settings, Settings
 from app.repositories.user_repository import user_repository
 
@@ -16,36 +19,26 @@ router = APIRouter()
 settings: Settings = get_settings()
 
 @router.get("/id")
-async def get_current_user_id(
-    access_token: str = Depends(verify_token),
-    auth0_users: authentication.Users = Depends(get_auth0_users_client)
-) -> int:
-    try:
-        userinfo = auth0_users.userinfo(access_token=access_token)
-        user_id = user_repository.get_id(userinfo.get("sub"))
-        print("User id: ", user_id)
-    except Auth0Error as e:
-        raise HTTPException(status_code=e.status_code, detail=e.message)
-    except:
-        raise
-    # If lookup failed, return a clear 404 instead of allowing a None to be returned
-    # which causes a ResponseValidationError in FastAPI when an int is expected.
-    if user_id is None:
-        raise HTTPException(status_code=404, detail="User id not found")
+async def get_current_user_id(user_id: int = Depends(current_user_id)) -> int:
+    """Local user id for the bearer token; resolved from its verified sub, no Auth0 call."""
     return user_id
 
 @router.get("/me")
 async def read_user_me(
-    access_token: str = Depends(verify_token), 
+    token_tools: TokenTools = Depends(token_tools_factory),
     auth0_users: authentication.Users = Depends(get_auth0_users_client)
 ) -> dict:
+    """Auth0 profile of the caller, persisted locally; Auth0 is asked once per token.
+
+    The profile is upserted only when it was freshly fetched: a cached profile was
+    persisted by the request that fetched it, so cache hits make no DB round trip.
+    """
     try:
-        userinfo = auth0_users.userinfo(access_token=access_token)
-        user_repository.upsert_user(userinfo)
+        userinfo, fetched = lookup_userinfo(token_tools, auth0_users)
+        if fetched:
+            user_repository.upsert_user(userinfo)
     except Auth0Error as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
-    except:
-        raise
     return userinfo
 
 class CreateUser(BaseModel):
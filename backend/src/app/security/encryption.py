@@ -1,22 +1,45 @@
 import base64
 import hashlib
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from app.config import get_settings
+from app.lazy import Lazy
 
 class EncryptionService:
-    """Service for encrypting and decrypting sensitive data like Plaid access tokens."""
+    """Service for encrypting and decrypting sensitive data like Plaid access tokens.
+
+    Encrypts with ``ENCRYPTION_KEY`` and decrypts with it or any key listed in
+    ``ENCRYPTION_OLD_KEYS``, so the key can be rotated without downtime: deploy the new
+    key with the old one listed, re-encrypt stored tokens (``python -m infra.rotate_tokens``),
+    then drop the old key. Keys are derived (PBKDF2) on first use, not at import.
+    """
     
     def __init__(self):
         self.settings = get_settings()
-        self._fernet = self._get_fernet()
-    
-    def _get_fernet(self) -> Fernet:
-        """Generate a Fernet instance from the encryption key."""
-        # Use the encryption key from settings
-        key = self.settings.ENCRYPTION_KEY.encode()
-        print("Found key:", key)
+        self._keys = Lazy(self._get_fernets)
+
+    def _get_fernets(self):
+        """Generate the primary Fernet and the MultiFernet over all configured keys."""
+        primary = self._fernet_for_key(self.settings.ENCRYPTION_KEY)
+        old_keys = [k.strip() for k in self.settings.ENCRYPTION_OLD_KEYS.split(",") if k.strip()]
+        return primary, MultiFernet([primary] + [self._fernet_for_key(k) for k in old_keys])
+
+    @property
+    def _primary(self) -> Fernet:
+        return self._keys.get()[0]
+
+    @property
+    def _fernet(self) -> MultiFernet:
+        return self._keys.get()[1]
+
+    def warm_up(self):
+        """Derive the keys now so the first request does not pay for it."""
+        self._keys.get()
+
+    @staticmethod
+    def _fernet_for_key(secret: str) -> Fernet:
+        key = secret.encode()
         
         # If the key is not exactly 32 bytes, derive it using PBKDF2
         if len(key) != 32:
@@ -52,5 +75,25 @@ class EncryptionService:
         except Exception as e:
             raise ValueError(f"Failed to decrypt data: {str(e)}")
 
+    def is_current(self, ciphertext: str) -> bool:
+        """True if ``ciphertext`` is empty or already encrypted with the primary key."""
+        if not ciphertext:
+            return True
+        try:
+            self._primary.decrypt(base64.urlsafe_b64decode(ciphertext.encode()))
+            return True
+        except (InvalidToken, ValueError):
+            return False
+
+    def rotate(self, ciphertext: str) -> str:
+        """Re-encrypt ``ciphertext`` (readable by any configured key) with the primary key."""
+        if not ciphertext:
+            return ciphertext
+        try:
+            rotated = self._fernet.rotate(base64.urlsafe_b64decode(ciphertext.encode()))
+        except Exception as e:
+            raise ValueError(f"Failed to rotate data: {str(e)}")
+        return base64.urlsafe_b64encode(rotated).decode()
+
 # Global instance
 encryption_service = EncryptionService()
\ No newline at end of file
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+
+from app.config import get_settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_auth0_jwks() -> dict:
+    settings = get_settings()
+    response = httpx.get(f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json", timeout=10.0)
+    response.raise_for_status()
+    return response.json()
+
+
+class JWKSStore:
+    """Signing keys indexed by ``kid``, prepared once per fetch and kept fresh.
+
+    The document is fetched on first use (or by the startup warm-up), then a daemon
+    thread refetches it every ``refresh_seconds``; a failed refresh keeps the current
+    keys. A token whose ``kid`` is unknown triggers an immediate refetch, so a key
+    rotated in by Auth0 works without a restart, but at most once per
+    ``min_refetch_seconds`` so forged kids cannot hammer Auth0. ``on_keys_removed``
+    is called when a refresh drops kids (e.g. to flush claims verified with them).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        algorithm: str,
+        refresh_seconds: float,
+        min_refetch_seconds: float,
+        on_keys_removed: Optional[Callable[[set], None]] = None,
+    ):
+        self._fetch = fetch
+        self.algorithm = algorithm
+        self.refresh_seconds = refresh_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.on_keys_removed = on_keys_removed
+        self._keys: Optional[Dict[str, Key]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        # serializes the first fetch so concurrent first requests do not all hit Auth0
+        self._load_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counts = {"fetches": 0, "fetch_failures": 0, "unknown_kid_refetches": 0, "unknown_kid_rejections": 0}
+
+    def _prepare(self, document: dict) -> Dict[str, Key]:
+        keys = {}
+        for key in document.get("keys", []):
+            if not key.get("kid") or key.get("kty") != "RSA" or key.get("use", "sig") != "sig":
+                continue
+            rsa_key = {"kty": key["kty"], "kid": key["kid"], "use": key.get("use", "sig"), "n": key["n"], "e": key["e"]}
+            keys[key["kid"]] = jwk.construct(rsa_key, self.algorithm)
+        return keys
+
+    def refresh(self) -> bool:
+        """Refetch the document now; returns False (keeping the current keys) on failure."""
+        try:
+            keys = self._prepare(self._fetch())
+        except Exception as e:
+            with self._lock:
+                self._counts["fetch_failures"] += 1
+                # back off unknown-kid refetches after a failure too
+                self._fetched_at = time.monotonic()
+            logger.warning(f"Failed to refresh JWKS: {e}")
+            return False
+        with self._lock:
+            removed = set(self._keys or {}) - set(keys)
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            self._counts["fetches"] += 1
+        if removed and self.on_keys_removed:
+            self.on_keys_removed(removed)
+        return True
+
+    def load(self):
+        """Fetch the keys if not loaded yet and start the background refresher."""
+        if self._keys is None:
+            with self._load_lock:
+                if self._keys is None and not self.refresh():
+                    raise RuntimeError("JWKS could not be fetched")
+        self._start_refresher()
+
+    def _start_refresher(self):
+        with self._lock:
+            if self._refresher is not None or self.refresh_seconds <= 0:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="jwks-refresh", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+
+    def stop(self):
+        self._stop.set()
+
+    def get_key(self, kid: Optional[str]) -> Optional[Key]:
+        """The prepared verification key for ``kid``; refetches once if it is unknown."""
+        self.load()
+        key = self._keys.get(kid) if kid else None
+        if key is not None or not kid:
+            return key
+        with self._lock:
+            now = time.monotonic()
+            may_refetch = now - self._fetched_at >= self.min_refetch_seconds
+            if may_refetch:
+                # claim the refetch slot so concurrent requests with the same new kid do not all refetch
+                self._fetched_at = now
+                self._counts["unknown_kid_refetches"] += 1
+        if may_refetch and self.refresh():
+            key = self._keys.get(kid)
+        if key is None:
+            with self._lock:
+                self._counts["unknown_kid_rejections"] += 1
+        return key
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counts,
+                "keys": len(self._keys or {}),
+                "age_seconds": time.monotonic() - self._fetched_at if self._keys is not None else None,
+            }
+
+
+_settings = get_settings()
+
+# Global instance
+jwks_store = JWKSStore(
+    fetch_auth0_jwks,
+    algorithm=_settings.AUTH0_ALGORITHMS,
+    refresh_seconds=_settings.AUTH_JWKS_REFRESH_SECONDS,
+    min_refetch_seconds=_settings.AUTH_JWKS_MIN_REFETCH_SECONDS,
+)
+metrics.register("auth_jwks", jwks_store.stats)
@@ -0,0 +1,119 @@
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from app.cache import TTLCache
+from app.config import get_settings
+from app.external_services.async_plaid_service import async_plaid_service
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# kids whose key could not be fetched are remembered this long, so forged kids cannot make us call Plaid per request
+_FAILED_KEY_SECONDS = 60.0
+
+
+class WebhookVerificationError(Exception):
+    """A Plaid webhook whose Plaid-Verification JWT is missing or does not check out."""
+
+
+class PlaidWebhookVerifier:
+    """Checks the Plaid-Verification JWT Plaid signs every webhook with.
+
+    The JWT (ES256) is verified against the key named by its ``kid``, fetched from
+    /webhook_verification_key/get and cached; keys Plaid has expired are refused. Its
+    ``iat`` must be within ``max_age_seconds`` and its ``request_body_sha256`` must match
+    the raw body, so a captured webhook cannot be replayed later or with another body.
+    """
+
+    def __init__(
+        self,
+        fetch_key: Callable[[str], Awaitable[dict]],
+        max_age_seconds: float = 300.0,
+        key_cache_seconds: float = 3600.0,
+    ):
+        self._fetch_key = fetch_key
+        self.max_age_seconds = max_age_seconds
+        # kid -> prepared Key, or False for a kid that could not be fetched recently
+        self._keys = TTLCache(maxsize=64, ttl_seconds=key_cache_seconds)
+        self._lock = threading.Lock()
+        self._counts = {"verified": 0, "rejected": 0, "key_fetches": 0}
+
+    async def _key(self, kid: str) -> Key:
+        key = self._keys.get(kid)
+        if key is False:
+            raise WebhookVerificationError(f"Plaid webhook key {kid} is unavailable")
+        if key is not None:
+            return key
+        with self._lock:
+            self._counts["key_fetches"] += 1
+        try:
+            document = await self._fetch_key(kid)
+            if document.get("expired_at"):
+                raise WebhookVerificationError(f"Plaid webhook key {kid} has expired")
+            key = jwk.construct(document, "ES256")
+        except Exception as e:
+            self._keys.set(kid, False, ttl_seconds=_FAILED_KEY_SECONDS)
+            if isinstance(e, WebhookVerificationError):
+                raise
+            raise WebhookVerificationError(f"Could not fetch Plaid webhook key {kid}: {e}")
+        self._keys.set(kid, key)
+        return key
+
+    async def verify(self, body: bytes, token: Optional[str]):
+        """Raise WebhookVerificationError unless ``token`` is Plaid's signature over ``body``."""
+        try:
+            await self._verify(body, token)
+        except WebhookVerificationError:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise
+        with self._lock:
+            self._counts["verified"] += 1
+
+    async def _verify(self, body: bytes, token: Optional[str]):
+        if not token:
+            raise WebhookVerificationError("Missing Plaid-Verification header")
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise WebhookVerificationError(f"Malformed Plaid-Verification JWT: {e}")
+        if header.get("alg") != "ES256" or not header.get("kid"):
+            raise WebhookVerificationError(f"Unexpected Plaid-Verification header {header}")
+
+        key = await self._key(header["kid"])
+        try:
+            claims = jwt.decode(token, key, algorithms=["ES256"])
+        except JWTError as e:
+            raise WebhookVerificationError(f"Invalid Plaid-Verification signature: {e}")
+
+        iat = claims.get("iat")
+        if not isinstance(iat, (int, float)) or abs(time.time() - iat) > self.max_age_seconds:
+            raise WebhookVerificationError(f"Plaid-Verification JWT issued at {iat} is too old")
+        body_sha256 = hashlib.sha256(body).hexdigest()
+        if not hmac.compare_digest(body_sha256, str(claims.get("request_body_sha256", ""))):
+            raise WebhookVerificationError("Plaid webhook body does not match its signature")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counts, "keys": self._keys.stats()["size"]}
+
+
+def verification_required() -> bool:
+    """Webhooks are always verified in production; elsewhere PLAID_WEBHOOK_VERIFICATION decides."""
+    settings = get_settings()
+    return settings.PLAID_WEBHOOK_VERIFICATION or settings.PLAID_ENV == "production"
+
+
+# Global instance
+plaid_webhook_verifier = PlaidWebhookVerifier(
+    fetch_key=async_plaid_service.get_webhook_verification_key,
+    max_age_seconds=get_settings().PLAID_WEBHOOK_MAX_AGE_SECONDS,
+)
+metrics.register("plaid_webhook_verification", plaid_webhook_verifier.stats)
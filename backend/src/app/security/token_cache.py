@@ -0,0 +1,137 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from app.cache import TTLCache
+from app.config import get_settings
+from app.metrics import metrics
+from app.security.encryption import encryption_service
+
+# Per-request tally of tokens handed out vs. actually decrypted; set by track_request()
+_request_usage: ContextVar[Optional[dict]] = ContextVar("token_usage", default=None)
+
+
+def _wipe(key, value: bytearray):
+    # overwrite the plaintext in place so an evicted token does not linger in the cache's buffer
+    value[:] = bytes(len(value))
+
+
+class TokenCache:
+    """Decrypts Plaid access tokens on demand and keeps the plaintext briefly.
+
+    Entries are keyed by a SHA-256 digest of the ciphertext, so the cache never holds
+    ciphertext and a re-encrypted (rotated) token simply misses. Plaintext is stored
+    as a ``bytearray`` that is zeroed whenever the entry leaves the cache. Expired
+    entries are swept on every lookup and, so an idle process does not keep them, by a
+    daemon thread every ``ttl_seconds / 2``: a token's plaintext is wiped at most 1.5x
+    the TTL after it was cached. Eviction and ``clear()`` wipe immediately. Callers get
+    a ``str`` copy, which Python cannot wipe, so the TTL is kept short.
+
+    ``loaded`` counts tokens handed to callers still encrypted (see
+    ``PlaidUser.access_token``); every load that never leads to a Fernet decryption is
+    a decryption avoided, either by laziness or by a cache hit. Inside
+    ``track_request()`` the same tallies are kept for the current request.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._cache = TTLCache(maxsize, ttl_seconds, on_evict=_wipe, clock=clock)
+        self.sweep_seconds = ttl_seconds / 2
+        # held around every cache access so a value is never wiped between lookup and copy
+        self._cache_lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._counts = {"loaded": 0, "decryptions": 0, "requests": 0, "avoided_in_requests": 0}
+        self._last_request_avoided = 0
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._counts[key] += n
+        usage = _request_usage.get()
+        if usage is not None:
+            usage[key] += n
+
+    def loaded(self, n: int = 1):
+        """Record ``n`` tokens handed out without being decrypted."""
+        if n:
+            self._count("loaded", n)
+
+    def decrypt(self, ciphertext: str) -> str:
+        if not ciphertext:
+            return ""
+        key = hashlib.sha256(ciphertext.encode()).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached.decode()
+        plaintext = encryption_service.decrypt(ciphertext)
+        self._count("decryptions")
+        with self._cache_lock:
+            self._cache.set(key, bytearray(plaintext.encode()))
+        self._start_sweeper()
+        return plaintext
+
+    def expire(self) -> int:
+        """Wipe and drop every expired entry now; returns how many were dropped."""
+        with self._cache_lock:
+            return self._cache.expire()
+
+    def _start_sweeper(self):
+        with self._lock:
+            if self._sweeper is not None or self.sweep_seconds <= 0:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="token-cache-sweep", daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_seconds):
+            self.expire()
+
+    def stop(self):
+        self._stop.set()
+
+    def clear(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    @contextmanager
+    def track_request(self):
+        """Tally loads and decryptions made while the block (one request) runs."""
+        usage = {"loaded": 0, "decryptions": 0}
+        reset = _request_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _request_usage.reset(reset)
+            if usage["loaded"]:
+                avoided = max(0, usage["loaded"] - usage["decryptions"])
+                with self._lock:
+                    self._counts["requests"] += 1
+                    self._counts["avoided_in_requests"] += avoided
+                    self._last_request_avoided = avoided
+
+    def stats(self) -> dict:
+        cache = self._cache.stats()
+        with self._lock:
+            counts = dict(self._counts)
+            last = self._last_request_avoided
+        requests = counts.pop("requests")
+        avoided_in_requests = counts.pop("avoided_in_requests")
+        return {
+            **counts,
+            "decryptions_avoided": max(0, counts["loaded"] - counts["decryptions"]),
+            "requests_with_tokens": requests,
+            "avoided_per_request": avoided_in_requests / requests if requests else 0.0,
+            "avoided_last_request": last,
+            "cache": cache,
+        }
+
+
+_settings = get_settings()
+
+# Global instance
+token_cache = TokenCache(_settings.TOKEN_CACHE_SIZE, _settings.TOKEN_CACHE_TTL_SECONDS)
+metrics.register("plaid_token_cache", token_cache.stats)
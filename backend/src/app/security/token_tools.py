@@ -1,8 +1,8 @@
+import hashlib
 import logging
+import time
 from typing import Optional
 
-import httpx
-
 from fastapi import HTTPException
 from fastapi import status
 from fastapi.security import SecurityScopes
@@ -10,7 +10,10 @@ from jose import JWTError
 from jose import jwt
 
 from app.security.access_token import AccessToken
+from app.cache import TTLCache
 from app.config import get_settings
+from app.metrics import metrics
+from app.security.jwks import jwks_store
 
 
 CREDENTIALS_EXCEPTION = HTTPException(
@@ -24,8 +27,19 @@ PERMISSIONS_EXCEPTION = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},  # f'Bearer scope="{security_scopes.scope_str}"'
 )
 
-settings = get_settings()
-JWKS = httpx.get(f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json").json()
+
+def _on_keys_removed(kids: set):
+    # claims verified with a key Auth0 has withdrawn must be verified again
+    logging.info(f"JWKS keys removed ({', '.join(sorted(kids))}); clearing verified claims")
+    claims_cache.clear()
+
+
+_settings = get_settings()
+
+# Verified claims keyed by a SHA-256 of the bearer token; an entry never outlives the token's exp
+claims_cache = TTLCache(maxsize=_settings.AUTH_CLAIMS_CACHE_SIZE, ttl_seconds=_settings.AUTH_CLAIMS_CACHE_TTL_SECONDS)
+metrics.register("auth_claims_cache", claims_cache.stats)
+jwks_store.on_keys_removed = _on_keys_removed
 
 
 class TokenTools:
@@ -34,7 +48,6 @@ class TokenTools:
     def __init__(self, token):
         self.token = token
         self.settings = get_settings()
-        self.jwks = JWKS
 
     @property
     def header(self) -> dict:
@@ -44,6 +57,11 @@ class TokenTools:
             logging.error(f"Invalid token: {self.token}")
             raise e
 
+    @property
+    def digest(self) -> bytes:
+        """SHA-256 of the bearer token; keys the per-token caches without holding the token itself."""
+        return hashlib.sha256(self.token.encode()).digest()
+
     @property
     def unverified_claim(self) -> AccessToken:
         claim = jwt.get_unverified_claims(self.token)
@@ -53,21 +71,26 @@ class TokenTools:
         """
         Try to decode the access token,
         return the decoded claim.
+
+        A token verified recently is served from ``claims_cache`` until it expires
+        (or AUTH_CLAIMS_CACHE_TTL_SECONDS passes); otherwise its signature is checked
+        against the JWKS key named by its ``kid``.
         """
-        kid = self.header["kid"]
-        for key in self.jwks["keys"]:
-            if key["kid"] == kid:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
+        digest = self.digest
+        cached = claims_cache.get(digest)
+        if cached is not None:
+            return cached.model_copy()
+
+        try:
+            key = jwks_store.get_key(self.header.get("kid"))
+        except JWTError:
+            raise CREDENTIALS_EXCEPTION
+        if key is None:
+            raise CREDENTIALS_EXCEPTION
         try:
             verified_claim = jwt.decode(
                 self.token,
-                key=rsa_key,
+                key=key,
                 algorithms=[self.settings.AUTH0_ALGORITHMS],
                 audience=self.settings.AUTH0_API_DEFAULT_AUDIENCE,
                 issuer=f"https://{self.settings.AUTH0_DOMAIN}/",
@@ -76,7 +99,11 @@ class TokenTools:
         except JWTError:
             raise CREDENTIALS_EXCEPTION
 
-        return AccessToken(**verified_claim)
+        claim = AccessToken(**verified_claim)
+        remaining = claim.exp - time.time()
+        if remaining > 0:
+            claims_cache.set(digest, claim, ttl_seconds=min(remaining, claims_cache.ttl_seconds))
+        return claim.model_copy()
 
     def verify(self, security_scopes: Optional[SecurityScopes] = None) -> bool:
         """
@@ -0,0 +1,47 @@
+import time
+from typing import Tuple
+
+from auth0 import authentication
+
+from app.cache import TTLCache
+from app.config import get_settings
+from app.metrics import metrics
+from app.security.token_tools import TokenTools
+
+_settings = get_settings()
+
+# Auth0 /userinfo responses keyed by the bearer token's digest; an entry never outlives the token's exp
+userinfo_cache = TTLCache(
+    maxsize=_settings.AUTH_USERINFO_CACHE_SIZE,
+    ttl_seconds=_settings.AUTH_USERINFO_CACHE_TTL_SECONDS,
+)
+metrics.register("auth_userinfo_cache", userinfo_cache.stats)
+
+
+def lookup_userinfo(token_tools: TokenTools, auth0_users: authentication.Users) -> Tuple[dict, bool]:
+    """The Auth0 profile for a bearer token and whether it was just fetched from Auth0.
+
+    The token is verified first (usually a claims cache hit), so a revoked signing key
+    or an expired token never reaches a cached profile. A cached profile is the one a
+    previous call fetched (and its caller persisted), so callers can skip work on hits.
+    """
+    claim = token_tools.verified_claim()
+    digest = token_tools.digest
+    cached = userinfo_cache.get(digest)
+    if cached is not None:
+        return dict(cached), False
+
+    userinfo = auth0_users.userinfo(access_token=token_tools.token)
+    remaining = claim.exp - time.time()
+    if remaining > 0:
+        userinfo_cache.set(digest, dict(userinfo), ttl_seconds=min(remaining, userinfo_cache.ttl_seconds))
+    return userinfo, True
+
+
+def get_userinfo(token_tools: TokenTools, auth0_users: authentication.Users) -> dict:
+    """The Auth0 profile for a bearer token, fetched from Auth0 once per token.
+
+    Only handlers that need profile fields (email, name) should call this; identity
+    comes from the verified claims.
+    """
+    return lookup_userinfo(token_tools, auth0_users)[0]
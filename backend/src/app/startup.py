@@ -0,0 +1,34 @@
+import logging
+import time
+from typing import Callable, Dict
+
+from app.database import get_engine
+from app.security.encryption import encryption_service
+from app.security.jwks import jwks_store
+
+logger = logging.getLogger(__name__)
+
+# Everything below is lazy, so importing the app stays cheap; warm-up builds it ahead of the first request
+WARM_UP_STEPS: Dict[str, Callable[[], object]] = {
+    "jwks": jwks_store.load,
+    "encryption_keys": encryption_service.warm_up,
+    "db_engine": get_engine,
+}
+
+
+def warm_up() -> Dict[str, float]:
+    """Build each lazily initialized dependency now; returns seconds per step.
+
+    A failing step (e.g. Auth0 unreachable) is logged and skipped; it is retried on first use.
+    """
+    timings = {}
+    for name, step in WARM_UP_STEPS.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed, deferring to first use: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+    logger.info("Warm-up finished: " + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in timings.items()))
+    return timings
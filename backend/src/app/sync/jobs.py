@@ -0,0 +1,326 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from app.config import get_settings
+from app.lazy import Lazy
+from app.repositories.plaid_repository import plaid_repository
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    id TEXT PRIMARY KEY,
+    item_id TEXT NOT NULL,
+    pipelined INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    pages_fetched INTEGER NOT NULL DEFAULT 0,
+    rows_written INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL,
+    rerun INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_sync_jobs_status ON sync_jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_sync_jobs_item ON sync_jobs (item_id, status);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# columns added after the first release of the table; created on open for older files
+_ADDED_COLUMNS = {"owner": "TEXT", "heartbeat_at": "REAL", "rerun": "INTEGER NOT NULL DEFAULT 0"}
+
+
+class SyncJobStore:
+    """Sync jobs persisted in a local SQLite file so queued work survives restarts.
+
+    A running job records the ``owner`` (worker process) that claimed it and a
+    ``heartbeat_at`` the owner keeps fresh; only jobs whose heartbeat has gone stale are
+    taken back, so processes sharing the file never requeue each other's live work.
+    ``rerun`` marks a running job whose item changed after it started (see mark_rerun).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_jobs)")}
+            for name, kind in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE sync_jobs ADD COLUMN {name} {kind}")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["pipelined"] = bool(job["pipelined"])
+        job["rerun"] = bool(job["rerun"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        end = job["finished_at"] or time.time()
+        job["elapsed_s"] = end - job["started_at"] if job["started_at"] else 0.0
+        return job
+
+    def create(self, item_id: str, pipelined: bool = False) -> dict:
+        """Queue a job for ``item_id`` unless one is already queued or running; returns the active job."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM sync_jobs WHERE item_id = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                    (item_id, *ACTIVE_STATUSES),
+                ).fetchone()
+                if row is None:
+                    job_id = uuid.uuid4().hex
+                    conn.execute(
+                        "INSERT INTO sync_jobs (id, item_id, pipelined, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (job_id, item_id, int(pipelined), QUEUED, time.time()),
+                    )
+                    row = conn.execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(row)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def is_active(self, item_id: str) -> bool:
+        return self.active_status(item_id) is not None
+
+    def active_status(self, item_id: str) -> Optional[str]:
+        """QUEUED or RUNNING if ``item_id`` has an active job, else None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status FROM sync_jobs WHERE item_id = ? AND status IN (?, ?) LIMIT 1",
+                (item_id, *ACTIVE_STATUSES),
+            ).fetchone()
+        return row["status"] if row else None
+
+    def mark_rerun(self, item_id: str) -> bool:
+        """Flag the item's running job to be followed by another sync; False if none is running."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE sync_jobs SET rerun = 1 WHERE item_id = ? AND status = ?", (item_id, RUNNING)
+            )
+            return cur.rowcount > 0
+
+    def claim_next(self, owner: str) -> Optional[dict]:
+        """Atomically move the oldest queued job to running under ``owner`` and return it."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM sync_jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE sync_jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? WHERE id = ?",
+                    (RUNNING, now, owner, now, row["id"]),
+                )
+                job = conn.execute("SELECT * FROM sync_jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(job)
+
+    def update_progress(self, job_id: str, pages_fetched: int, rows_written: int):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_jobs SET pages_fetched = ?, rows_written = ?, heartbeat_at = ? WHERE id = ?",
+                (pages_fetched, rows_written, time.time(), job_id),
+            )
+
+    def heartbeat(self, owner: str) -> int:
+        """Mark every job ``owner`` is running as alive; returns how many there are."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE sync_jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?",
+                (time.time(), owner, RUNNING),
+            )
+            return cur.rowcount
+
+    def finish(
+        self, job_id: str, owner: str, result: Optional[dict] = None, error: Optional[str] = None
+    ) -> Optional[dict]:
+        """Record the outcome and return the finished job; None if it was requeued away from ``owner`` meanwhile.
+
+        Runs in one write transaction with mark_rerun's UPDATE, so a rerun request is
+        either seen here or finds the job no longer running.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.execute(
+                    "UPDATE sync_jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+                    "WHERE id = ? AND owner = ? AND status = ?",
+                    (
+                        FAILED if error else SUCCEEDED,
+                        json.dumps(result) if result else None,
+                        error,
+                        time.time(),
+                        job_id,
+                        owner,
+                        RUNNING,
+                    ),
+                )
+                job = conn.execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,)).fetchone() if cur.rowcount else None
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(job) if job else None
+
+    def requeue_stale(self, stale_seconds: float) -> int:
+        """Put running jobs whose owner stopped heartbeating (crashed or killed) back on the queue."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE sync_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL, rerun = 0 "
+                "WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (QUEUED, RUNNING, time.time() - stale_seconds),
+            )
+            return cur.rowcount
+
+
+class SyncJobQueue:
+    """Runs queued item syncs on a fixed number of background worker threads.
+
+    Every queue has its own ``owner`` id and heartbeats the jobs it runs. A monitor
+    thread requeues jobs whose heartbeat is older than ``stale_seconds`` (their process
+    died); because the sync commits its cursor after every page, a re-run only fetches
+    the pages that were not written. The store is opened on first use, so importing the
+    app does not create the SQLite file.
+    """
+
+    def __init__(
+        self,
+        store_factory: Callable[[], SyncJobStore],
+        workers: int,
+        heartbeat_seconds: float,
+        stale_seconds: float,
+    ):
+        self._store = Lazy(store_factory)
+        self.workers = workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    @property
+    def store(self) -> SyncJobStore:
+        return self._store.get()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self._requeue_stale()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"sync-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        monitor = threading.Thread(target=self._monitor, name="sync-job-heartbeat", daemon=True)
+        monitor.start()
+        self._threads.append(monitor)
+
+    def _requeue_stale(self):
+        requeued = self.store.requeue_stale(self.stale_seconds)
+        if requeued:
+            logger.info(f"Re-queued {requeued} sync jobs whose worker stopped heartbeating")
+            self._wakeup.set()
+
+    def _monitor(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                self.store.heartbeat(self.owner)
+                self._requeue_stale()
+            except Exception as e:
+                logger.error(f"Sync job heartbeat failed: {e}")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, item_id: str, pipelined: bool = False) -> dict:
+        job = self.store.create(item_id, pipelined)
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self.store.claim_next(self.owner)
+            if job is None:
+                self._wakeup.wait(timeout=1.0)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: dict):
+        job_id = job["id"]
+
+        def progress(totals: dict):
+            self.store.update_progress(job_id, totals["pages"], totals["rows_written"])
+
+        try:
+            result = plaid_repository.sync_item_transactions(
+                job["item_id"], pipelined=job["pipelined"], progress=progress
+            )
+            finished = self.store.finish(job_id, self.owner, result=result)
+        except Exception as e:
+            logger.error(f"Sync job {job_id} for item {job['item_id']} failed: {e}")
+            finished = self.store.finish(job_id, self.owner, error=str(e))
+        if finished is None:
+            logger.warning(f"Sync job {job_id} was requeued while running here; its new run records the outcome")
+        elif finished["rerun"]:
+            # the item changed after this run started; the data it missed needs another pass
+            logger.info(f"Item {job['item_id']} changed during sync job {job_id}; queueing another sync")
+            self.enqueue(job["item_id"], pipelined=job["pipelined"])
+
+
+_settings = get_settings()
+
+# Global instance
+sync_job_queue = SyncJobQueue(
+    lambda: SyncJobStore(_settings.SYNC_JOBS_DB_PATH),
+    _settings.SYNC_JOB_WORKERS,
+    heartbeat_seconds=_settings.SYNC_JOB_HEARTBEAT_SECONDS,
+    stale_seconds=_settings.SYNC_JOB_STALE_SECONDS,
+)
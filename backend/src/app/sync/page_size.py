@@ -0,0 +1,83 @@
+import threading
+from typing import Optional
+
+from app.config import get_settings
+
+# transactions/sync accepts count in [1, 500]
+PLAID_MAX_PAGE_SIZE = 500
+
+
+class AdaptivePageSize:
+    """Picks the transactions/sync ``count`` for each page of one sync run.
+
+    A backfill (no stored cursor) starts at the largest page Plaid allows, since fewer
+    round trips is what makes years of history fast; an incremental catch-up starts
+    small because it usually fits in one page and the first page comes back sooner.
+    After every page the observed fetch and write times adjust the size: a full page
+    that finished well under ``target_seconds`` doubles it (more data is waiting and
+    per-page overhead dominates), and a page that took longer than the target scales
+    it down proportionally, so a slow institution or a loaded database never holds a
+    single page for more than about ``target_seconds``.
+
+    With a pipelined sync fetch and write overlap, so a page costs the slower of the
+    two rather than their sum. Fetch and write are recorded from different threads.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_size: int,
+        max_size: int = PLAID_MAX_PAGE_SIZE,
+        target_seconds: float = 5.0,
+        pipelined: bool = False,
+    ):
+        self.min_size = max(1, min(min_size, max_size))
+        self.max_size = min(max_size, PLAID_MAX_PAGE_SIZE)
+        self.target_seconds = target_seconds
+        self.pipelined = pipelined
+        self._size = self._clamp(initial)
+        self._fetch_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_sync(cls, cursor: Optional[str], pipelined: bool = False) -> "AdaptivePageSize":
+        """Sizer for a sync run: backfill when there is no cursor, catch-up otherwise."""
+        settings = get_settings()
+        return cls(
+            initial=settings.PLAID_SYNC_INCREMENTAL_PAGE_SIZE if cursor else settings.PLAID_SYNC_MAX_PAGE_SIZE,
+            min_size=settings.PLAID_SYNC_MIN_PAGE_SIZE,
+            max_size=settings.PLAID_SYNC_MAX_PAGE_SIZE,
+            target_seconds=settings.PLAID_SYNC_TARGET_PAGE_SECONDS,
+            pipelined=pipelined,
+        )
+
+    def _clamp(self, size: float) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record_fetch(self, seconds: float):
+        """Record how long the latest page took to download; applied by the next ``record_write``."""
+        with self._lock:
+            self._fetch_seconds = seconds
+
+    def record_write(self, rows: int, seconds: float):
+        """Record how long a page with ``rows`` updates took to write, and adapt."""
+        with self._lock:
+            fetch = self._fetch_seconds
+        page_seconds = max(fetch, seconds) if self.pipelined else fetch + seconds
+        self._adapt(rows, page_seconds)
+
+    def record_page(self, rows: int, seconds: float):
+        """Record a page whose whole cost is ``seconds`` (fetch-only callers)."""
+        self._adapt(rows, seconds)
+
+    def _adapt(self, rows: int, page_seconds: float):
+        with self._lock:
+            size = self._size
+            if page_seconds > self.target_seconds:
+                self._size = self._clamp(size * self.target_seconds / page_seconds)
+            elif rows >= size and page_seconds < self.target_seconds / 2:
+                self._size = self._clamp(size * 2)
@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.repositories.plaid_repository import plaid_repository
+from app.sync.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (pct in 0-100); None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class SyncScheduler:
+    """Runs sync_item_transactions for many Plaid items over a bounded worker pool.
+
+    Concurrency is capped globally by ``max_workers`` and per institution by
+    ``per_institution``, so one bank never sees more than a few syncs at once. Every
+    Plaid request made by the syncs draws from a shared token bucket sized to the
+    client-wide Plaid rate limit.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        per_institution: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        pipelined: bool = False,
+    ):
+        settings = get_settings()
+        self.max_workers = max_workers or settings.PLAID_SYNC_MAX_WORKERS
+        self.per_institution = per_institution or settings.PLAID_SYNC_PER_INSTITUTION
+        self.rate_limiter = TokenBucket.per_minute(requests_per_minute or settings.PLAID_RATE_LIMIT_PER_MINUTE)
+        self.pipelined = pipelined
+        self._institution_slots: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, institution: str) -> threading.Semaphore:
+        with self._lock:
+            if institution not in self._institution_slots:
+                self._institution_slots[institution] = threading.Semaphore(self.per_institution)
+            return self._institution_slots[institution]
+
+    @staticmethod
+    def _interleave(items: List[dict]) -> List[dict]:
+        """Round-robin items across institutions so workers do not queue up behind one bank's cap."""
+        by_institution: "OrderedDict[str, List[dict]]" = OrderedDict()
+        for item in items:
+            by_institution.setdefault(item.get("institution_name") or "unknown", []).append(item)
+        ordered = []
+        while by_institution:
+            for institution in list(by_institution):
+                ordered.append(by_institution[institution].pop(0))
+                if not by_institution[institution]:
+                    del by_institution[institution]
+        return ordered
+
+    def _sync_one(self, item: dict) -> dict:
+        institution = item.get("institution_name") or "unknown"
+        queued = time.perf_counter()
+        with self._slot(institution):
+            started = time.perf_counter()
+            result = {"item_id": item["item_id"], "institution": institution, "queued_s": started - queued}
+            try:
+                result.update(plaid_repository.sync_item_transactions(
+                    item["item_id"], pipelined=self.pipelined, rate_limiter=self.rate_limiter,
+                ))
+                result["status"] = "ok"
+            except Exception as e:
+                logger.error(f"Scheduled sync failed for item {item['item_id']}: {e}")
+                result["status"] = "error"
+                result["error"] = str(e)
+            result["latency_s"] = time.perf_counter() - started
+        return result
+
+    def run(self, items: List[dict]) -> dict:
+        """Sync every item in ``items`` (dicts with item_id and institution_name) and return a run report."""
+        started = time.perf_counter()
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plaid-sync") as pool:
+            futures = [pool.submit(self._sync_one, item) for item in self._interleave(items)]
+            for future in as_completed(futures):
+                results.append(future.result())
+        elapsed = time.perf_counter() - started
+
+        latencies = [r["latency_s"] for r in results]
+        return {
+            "items": len(results),
+            "succeeded": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] != "ok"),
+            "elapsed_s": elapsed,
+            "items_per_min": len(results) / elapsed * 60 if elapsed else 0.0,
+            "latency_p50_s": percentile(latencies, 50),
+            "latency_p95_s": percentile(latencies, 95),
+            "latency_max_s": max(latencies) if latencies else None,
+            "transactions_synced": sum(r.get("transactions_synced", 0) for r in results),
+            "results": results,
+        }
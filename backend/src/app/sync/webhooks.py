@@ -0,0 +1,111 @@
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from app.config import get_settings
+from app.metrics import metrics
+from app.sync.jobs import QUEUED, RUNNING, sync_job_queue
+
+logger = logging.getLogger(__name__)
+
+# Plaid TRANSACTIONS webhook codes that mean new data is available through /transactions/sync
+SYNC_WEBHOOK_CODES = {
+    "SYNC_UPDATES_AVAILABLE",
+    "INITIAL_UPDATE",
+    "HISTORICAL_UPDATE",
+    "DEFAULT_UPDATE",
+    "TRANSACTIONS_REMOVED",
+}
+
+SCHEDULED = "scheduled"
+COALESCED = "coalesced"
+DROPPED_QUEUED = "dropped_queued"
+DEFERRED_RUNNING = "deferred_running"
+IGNORED = "ignored"
+
+
+class WebhookCoalescer:
+    """Collapses bursts of sync webhooks for the same item into a single sync.
+
+    The first event for an item opens a debounce window; further events for that item
+    inside the window are absorbed, and one sync is dispatched when the window closes.
+    Events for items whose sync is still queued are dropped, since that sync has not
+    fetched anything yet. A running sync may already be past the new data, so the item
+    is marked for another sync once that job finishes (``mark_rerun``).
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float,
+        dispatch: Callable[[str], None],
+        job_status: Callable[[str], Optional[str]],
+        mark_rerun: Callable[[str], bool],
+    ):
+        self.debounce_seconds = debounce_seconds
+        self._dispatch = dispatch
+        self._job_status = job_status
+        self._mark_rerun = mark_rerun
+        self._pending: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._counts = {
+            "received": 0, SCHEDULED: 0, COALESCED: 0, DROPPED_QUEUED: 0, DEFERRED_RUNNING: 0, "dispatched": 0
+        }
+
+    def submit(self, item_id: str) -> str:
+        """Register a sync event for ``item_id``; returns what happened to it."""
+        with self._lock:
+            self._counts["received"] += 1
+            if item_id in self._pending:
+                self._counts[COALESCED] += 1
+                return COALESCED
+        status = self._job_status(item_id)
+        if status == QUEUED:
+            with self._lock:
+                self._counts[DROPPED_QUEUED] += 1
+            return DROPPED_QUEUED
+        # False when the job finished in the meantime: then a fresh sync is scheduled below
+        if status == RUNNING and self._mark_rerun(item_id):
+            with self._lock:
+                self._counts[DEFERRED_RUNNING] += 1
+            return DEFERRED_RUNNING
+        with self._lock:
+            if item_id in self._pending:
+                self._counts[COALESCED] += 1
+                return COALESCED
+            timer = threading.Timer(self.debounce_seconds, self._fire, args=(item_id,))
+            timer.daemon = True
+            self._pending[item_id] = timer
+            self._counts[SCHEDULED] += 1
+        timer.start()
+        return SCHEDULED
+
+    def _fire(self, item_id: str):
+        with self._lock:
+            self._pending.pop(item_id, None)
+            self._counts["dispatched"] += 1
+        try:
+            self._dispatch(item_id)
+        except Exception as e:
+            logger.error(f"Failed to dispatch webhook sync for item {item_id}: {e}")
+
+    def flush(self):
+        """Dispatch every pending item immediately (used on shutdown)."""
+        with self._lock:
+            pending = list(self._pending.items())
+        for item_id, timer in pending:
+            timer.cancel()
+            self._fire(item_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counts, "pending": len(self._pending)}
+
+
+# Global instance
+webhook_coalescer = WebhookCoalescer(
+    debounce_seconds=get_settings().PLAID_WEBHOOK_DEBOUNCE_SECONDS,
+    dispatch=lambda item_id: sync_job_queue.enqueue(item_id),
+    job_status=lambda item_id: sync_job_queue.store.active_status(item_id),
+    mark_rerun=lambda item_id: sync_job_queue.store.mark_rerun(item_id),
+)
+metrics.register("plaid_webhooks", webhook_coalescer.stats)
@@ -0,0 +1,146 @@
+"""Auth overhead per request: bearer-token verification with and without the caches.
+
+Mints RS256 tokens with a throwaway key pair, serves the matching JWKS to jwks_store
+in process (no Auth0 calls), and times:
+
+  legacy  - the previous path: scan the JWKS list, rebuild the key dict, full RS256 decode
+  cold    - TokenTools.verified_claim with an empty claims cache (kid lookup + decode)
+  warm    - TokenTools.verified_claim for a token verified before (claims cache hit)
+  http    - a FastAPI route behind get_verified_token vs. the same route without auth,
+            cycling through --tokens distinct tokens; the difference is the per-request cost
+
+    python -m infra.bench_auth --iterations 2000 --tokens 50
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+
+from app.config import get_settings
+from app.security.jwks import jwks_store
+from app.security.token_tools import TokenTools, claims_cache
+from app.security.utils import get_verified_token
+from app.sync.scheduler import percentile
+
+
+def make_keys(count: int):
+    """``count`` RSA key pairs; returns (private PEM of the last, JWKS document)."""
+    keys, private_pem = [], None
+    for i in range(count):
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        public = jwk.construct(
+            private.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo),
+            "RS256",
+        ).to_dict()
+        keys.append({**public, "kid": f"bench-{i}", "use": "sig"})
+        # sign with the last key so the legacy scan walks the whole list
+        private_pem = pem
+    return private_pem, {"keys": keys}
+
+
+def mint(private_pem: bytes, kid: str, sub: str) -> str:
+    settings = get_settings()
+    now = int(time.time())
+    claims = {
+        "iss": f"https://{settings.AUTH0_DOMAIN}/",
+        "sub": sub,
+        "aud": [settings.AUTH0_API_DEFAULT_AUDIENCE],
+        "iat": now,
+        "exp": now + 3600,
+        "azp": "bench",
+        "scope": "openid profile email",
+        "permissions": [],
+    }
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def legacy_verify(token: str, document: dict):
+    """The verification path before the JWKS store and claims cache."""
+    settings = get_settings()
+    kid = jwt.get_unverified_header(token)["kid"]
+    for key in document["keys"]:
+        if key["kid"] == kid:
+            rsa_key = {"kty": key["kty"], "kid": key["kid"], "use": key["use"], "n": key["n"], "e": key["e"]}
+    return jwt.decode(
+        token,
+        key=rsa_key,
+        algorithms=[settings.AUTH0_ALGORITHMS],
+        audience=settings.AUTH0_API_DEFAULT_AUDIENCE,
+        issuer=f"https://{settings.AUTH0_DOMAIN}/",
+    )
+
+
+def timed(fn: Callable[[int], object], iterations: int) -> List[float]:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float]):
+    print(f"  {label:<16} p50 {percentile(samples, 50) * 1e6:9.1f} us  p99 {percentile(samples, 99) * 1e6:9.1f} us  "
+          f"{len(samples) / sum(samples):10.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=50, help="distinct bearer tokens cycled through")
+    parser.add_argument("--keys", type=int, default=2, help="keys in the JWKS document")
+    args = parser.parse_args()
+
+    private_pem, document = make_keys(args.keys)
+    kid = document["keys"][-1]["kid"]
+    jwks_store._fetch = lambda: document
+    jwks_store.refresh_seconds = 0
+    jwks_store.refresh()
+    tokens = [mint(private_pem, kid, f"auth0|bench-{i}") for i in range(args.tokens)]
+
+    print(f"🔐 Auth benchmark: {args.iterations} iterations, {args.tokens} tokens, {args.keys} JWKS keys")
+    report("legacy", timed(lambda i: legacy_verify(tokens[i % len(tokens)], document), args.iterations))
+
+    def cold(i):
+        claims_cache.clear()
+        TokenTools(tokens[i % len(tokens)]).verified_claim()
+
+    report("cold", timed(cold, args.iterations))
+    for token in tokens:
+        TokenTools(token).verified_claim()
+    report("warm", timed(lambda i: TokenTools(tokens[i % len(tokens)]).verified_claim(), args.iterations))
+
+    app = FastAPI()
+
+    @app.get("/open")
+    def open_route():
+        return {}
+
+    @app.get("/auth")
+    def auth_route(claim=Depends(get_verified_token)):
+        return {}
+
+    client = TestClient(app)
+    open_samples = timed(lambda i: client.get("/open"), args.iterations)
+    auth_samples = timed(
+        lambda i: client.get("/auth", headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"}),
+        args.iterations,
+    )
+    report("http no auth", open_samples)
+    report("http auth", auth_samples)
+    overhead = statistics.median(auth_samples) - statistics.median(open_samples)
+    print(f"📊 Auth overhead per request (median): {overhead * 1e6:.1f} us; "
+          f"claims cache hit rate {claims_cache.stats()['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Microbenchmark: per-row cost of normalizing Plaid dates, before and after.
+
+"before" reproduces the old upsert_transactions loop body, which defined the
+_to_datetime closure and re-imported timezone/date for every row. "after" uses
+app.external_services.plaid_dates, per row and in batched (whole page) mode.
+
+    python -m infra.bench_date_normalize --rows 100000
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from app.external_services.plaid_dates import to_datetime, to_datetimes
+
+
+def legacy_row(val):
+    """The pre-change per-row normalization, closure definition included."""
+    def _to_datetime(val):
+        if val is None:
+            return None
+        # already a datetime
+        if isinstance(val, datetime):
+            if val.tzinfo is None:
+                return val.replace(tzinfo=timezone.utc)
+            return val
+        # plain date -> convert to midnight UTC
+        if isinstance(val, date):
+            return datetime.combine(val, datetime.min.time()).replace(tzinfo=timezone.utc)
+        # parse strings
+        if isinstance(val, str):
+            s = val
+            # normalize Z suffix
+            if s.endswith('Z'):
+                s = s[:-1] + '+00:00'
+
+            # handle long fractional seconds: ensure at most 6 digits
+            if '.' in s:
+                # split fractional and timezone parts
+                main, frac_tz = s.split('.', 1)
+                # frac_tz may contain timezone (+/-) or nothing
+                tz_idx = None
+                for idx, ch in enumerate(frac_tz):
+                    if ch in ['+', '-']:
+                        tz_idx = idx
+                        break
+                if tz_idx is not None:
+                    frac = frac_tz[:tz_idx]
+                    tz = frac_tz[tz_idx:]
+                else:
+                    # no explicit tz in frac_tz
+                    frac = frac_tz
+                    tz = ''
+                # remove any trailing Z
+                if frac.endswith('Z'):
+                    frac = frac[:-1]
+                if len(frac) > 6:
+                    frac = frac[:6]
+                s = main + '.' + frac + tz
+
+            try:
+                dt = datetime.fromisoformat(s)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                return dt
+            except Exception:
+                # fallback to date-only
+                try:
+                    dt = datetime.strptime(s, '%Y-%m-%d')
+                    return dt.replace(tzinfo=timezone.utc)
+                except Exception:
+                    raise
+
+        # unknown type - return as-is
+        return val
+
+    # imports used by helper
+    from datetime import timezone, date
+
+    return _to_datetime(val)
+
+
+def synthetic_values(n: int):
+    """Mostly date objects and YYYY-MM-DD strings, plus some ISO datetimes as Plaid sends them."""
+    today = date.today()
+    values = []
+    for _ in range(n):
+        day = today - timedelta(days=random.randint(0, 730))
+        roll = random.random()
+        if roll < 0.6:
+            values.append(day)
+        elif roll < 0.9:
+            values.append(day.isoformat())
+        else:
+            values.append(f"{day.isoformat()}T{random.randint(0, 23):02d}:{random.randint(0, 59):02d}:00.{random.randint(0, 10**9):09d}Z")
+    return values
+
+
+def measure(label: str, fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms  {elapsed / n * 1e9:8.0f} ns/row")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    values = synthetic_values(args.rows)
+
+    # results must agree before timings mean anything
+    sample = values[:1000]
+    assert [legacy_row(v) for v in sample] == [to_datetime(v) for v in sample] == to_datetimes(sample)
+
+    before = measure("before: closure per row", lambda: [legacy_row(v) for v in values], args.rows)
+    per_row = measure("after: to_datetime per row", lambda: [to_datetime(v) for v in values], args.rows)
+    batched = measure("after: to_datetimes batched", lambda: to_datetimes(values), args.rows)
+    print(f"Speedup: per row {before / per_row:.1f}x, batched {before / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Import-time and startup benchmark for the API, with budgets CI can enforce.
+
+Each run imports the module in a fresh interpreter under ``-X importtime`` and reports
+the wall-clock import time, the slowest modules by self time, and any modules on the
+forbidden list (heavy dependencies that belong behind a lazy import). With --lifespan
+the app's lifespan startup is timed too. Network access is blocked in the child: an
+import that opens a connection (e.g. fetching JWKS) fails the run.
+
+Exits 1 when the median import or startup time is over budget, a forbidden module is
+imported, or the import touched the network.
+
+    python -m infra.bench_startup --runs 5 --budget-ms 1500
+    python -m infra.bench_startup --lifespan --startup-budget-ms 200 --output bench_results/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+CHILD = r"""
+import asyncio, importlib, json, socket, sys, time
+
+attempts = []
+
+def blocked(kind):
+    def deny(*args, **kwargs):
+        attempts.append(f"{kind} {args[1] if kind == 'connect' else args[0]!r}")
+        raise OSError("network access is blocked during the startup benchmark")
+    return deny
+
+socket.socket.connect = blocked("connect")
+socket.getaddrinfo = blocked("getaddrinfo")
+
+module_name, lifespan = sys.argv[1], sys.argv[2] == "1"
+result = {}
+started = time.perf_counter()
+try:
+    module = importlib.import_module(module_name)
+except Exception as e:
+    result.update(error=f"{type(e).__name__}: {e}", network=attempts)
+    print(json.dumps(result))
+    sys.exit(0)
+result["import_s"] = time.perf_counter() - started
+# only the import itself must stay offline; the lifespan warm-up is expected to fetch
+result["network"] = list(attempts)
+
+if lifespan:
+    app = module.app
+
+    async def run():
+        started = time.perf_counter()
+        async with app.router.lifespan_context(app):
+            return time.perf_counter() - started
+
+    result["startup_s"] = asyncio.run(run())
+print(json.dumps(result))
+"""
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Parse ``-X importtime`` lines into {module, self_us, cumulative_us}."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return modules
+
+
+def run_once(module: str, lifespan: bool) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, module, "1" if lifespan else "0"],
+        capture_output=True,
+        text=True,
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"benchmark child failed ({proc.returncode}): {proc.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    result["modules"] = parse_importtime(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="module to import (default app.main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lifespan", action="store_true", help="also time the app's lifespan startup")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median import time exceeds this")
+    parser.add_argument("--startup-budget-ms", type=float, help="fail if the median lifespan startup exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=["pandas", "numpy"],
+                        help="top-level packages that must not be imported at startup")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    print(f"🚀 Import benchmark for {args.module} ({args.runs} fresh interpreters)")
+    runs = []
+    for _ in range(args.runs):
+        result = run_once(args.module, args.lifespan)
+        if "error" in result:
+            print(f"❌ Importing {args.module} failed: {result['error']}")
+            if result["network"]:
+                print(f"   network access attempted: {result['network']}")
+            sys.exit(1)
+        runs.append(result)
+
+    import_ms = statistics.median(r["import_s"] for r in runs) * 1000
+    print(f"  import   median {import_ms:8.1f} ms  (min {min(r['import_s'] for r in runs) * 1000:.1f}, "
+          f"max {max(r['import_s'] for r in runs) * 1000:.1f})")
+    startup_ms = None
+    if args.lifespan:
+        startup_ms = statistics.median(r["startup_s"] for r in runs) * 1000
+        print(f"  lifespan median {startup_ms:8.1f} ms")
+
+    # module breakdown from the last run (the first may pay for bytecode compilation and cold caches)
+    modules = runs[-1]["modules"]
+    print("  slowest modules by self time:")
+    for m in sorted(modules, key=lambda m: m["self_us"], reverse=True)[:args.top]:
+        print(f"    {m['self_us'] / 1000:8.1f} ms self  {m['cumulative_us'] / 1000:8.1f} ms cumulative  {m['module']}")
+
+    imported: Dict[str, int] = {m["module"]: m["cumulative_us"] for m in modules}
+    forbidden = [name for name in args.forbid if name in imported]
+    network = sorted({a for r in runs for a in r["network"]})
+
+    failures = []
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        failures.append(f"import took {import_ms:.1f} ms, budget {args.budget_ms:.1f} ms")
+    if args.startup_budget_ms is not None and startup_ms is not None and startup_ms > args.startup_budget_ms:
+        failures.append(f"lifespan startup took {startup_ms:.1f} ms, budget {args.startup_budget_ms:.1f} ms")
+    for name in forbidden:
+        failures.append(f"{name} is imported at startup ({imported[name] / 1000:.1f} ms cumulative)")
+    if network:
+        failures.append(f"network access during import: {network}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "module": args.module,
+                "runs": len(runs),
+                "import_ms": [round(r["import_s"] * 1000, 3) for r in runs],
+                "startup_ms": [round(r["startup_s"] * 1000, 3) for r in runs] if args.lifespan else None,
+                "modules": modules,
+                "failures": failures,
+            }, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
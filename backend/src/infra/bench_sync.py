@@ -0,0 +1,288 @@
+"""Sync throughput benchmark: PlaidRepository ingest paths end to end on an embedded database.
+
+Each scenario runs in a fresh process against a fresh SQLite file, with plaid_service's
+client replaced by the deterministic synthetic Plaid from infra.plaid_standin. SQLite
+cannot run the SQL Server #tx_staging MERGE, so page writes go through the portable
+executemany writer from infra.portable_writes: these numbers measure that path, not the
+production MERGE (see infra.bench_upsert for that):
+
+  sync  - sync_item_transactions: accounts upsert plus every transactions/sync page
+  orm   - the per-row upsert_transactions path over the same pages (sizes up to --orm-max)
+
+The sync scenario runs once per --page-sizes entry: a fixed transactions/sync count, or
+"adaptive" for the engine's own sizing (AdaptivePageSize). --latency-ms adds a simulated
+Plaid round trip to every request, which is where bigger pages pay off most.
+
+Reported per scenario: rows/sec, DB round trips per page (statements sent to the driver),
+peak RSS and p50/p99 per-page latency, plus the cost of one upsert_accounts call. Results
+are written as JSON tagged with the git commit; --compare diffs against an earlier run.
+
+    python -m infra.bench_sync --sizes 1000 10000 100000 --output bench_results/sync.json
+    python -m infra.bench_sync --sizes 100000 --page-sizes 100 500 adaptive --latency-ms 150
+    python -m infra.bench_sync --compare bench_results/sync.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Optional, Union
+
+from sqlalchemy import create_engine, event
+
+from app.database import SessionLocal, get_db_session
+from app.external_services.plaid_service import plaid_service
+from app.models.db_models import Base, PlaidUser, Transaction, User
+from app.repositories.plaid_repository import plaid_repository
+from app.security.encryption import encryption_service
+from app.sync.scheduler import percentile
+from infra.plaid_standin import SyntheticPlaid
+from infra.portable_writes import apply_rows_portable
+
+ITEM_ID = "bench-item"
+ACCESS_TOKEN = "access-bench"
+WRITE_PATH = "portable executemany (infra.portable_writes), not the SQL Server MERGE"
+
+
+class _Response(dict):
+    def to_dict(self) -> dict:
+        return self
+
+
+class SyntheticPlaidClient:
+    """The slice of plaid_api.PlaidApi the repository uses, served from SyntheticPlaid."""
+
+    def __init__(self, plaid: SyntheticPlaid, latency_ms: float = 0.0):
+        self.plaid = plaid
+        self.latency = latency_ms / 1000.0
+
+    def accounts_get(self, req):
+        return _Response(accounts=self.plaid.accounts(self.plaid.item_id(req.access_token)))
+
+    def transactions_sync(self, req):
+        if self.latency:
+            time.sleep(self.latency)
+        cursor = getattr(req, "cursor", None)
+        count = getattr(req, "count", None) or 100
+        return _Response(self.plaid.sync_page(req.access_token, cursor, count, None))
+
+
+class RoundTrips:
+    """Counts statements SQLAlchemy sends to the driver (an executemany counts once)."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+class PageTimer:
+    """Per-page latency and round trips, fed from the sync progress callback."""
+
+    def __init__(self, trips: RoundTrips):
+        self.trips = trips
+        self.latencies: List[float] = []
+        self.page_trips: List[int] = []
+        self.start()
+
+    def start(self):
+        self._t = time.perf_counter()
+        self._trips = self.trips.count
+
+    def page(self, *args):
+        now = time.perf_counter()
+        self.latencies.append(now - self._t)
+        self.page_trips.append(self.trips.count - self._trips)
+        self._t, self._trips = now, self.trips.count
+
+    def stats(self, rows: int, elapsed: float) -> dict:
+        return {
+            "rows": rows,
+            "pages": len(self.latencies),
+            "elapsed_s": round(elapsed, 4),
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+            "round_trips_per_page": round(sum(self.page_trips) / len(self.page_trips), 2) if self.page_trips else 0.0,
+            "page_latency_p50_ms": round(percentile(self.latencies, 50) * 1000, 3),
+            "page_latency_p99_ms": round(percentile(self.latencies, 99) * 1000, 3),
+        }
+
+
+def peak_rss_bytes() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def setup(path: str, size: int, latency_ms: float = 0.0) -> RoundTrips:
+    """Point the app's sessions at a fresh SQLite file with one Plaid item, and Plaid at synthetic data."""
+    engine = create_engine(f"sqlite:///{path}")
+    SessionLocal.configure(bind=engine)
+    plaid_repository.portable_writer = apply_rows_portable
+    Base.metadata.create_all(engine)
+    with get_db_session() as db:
+        user = User(email="bench@example.com", name="bench", sub="bench|1")
+        db.add(user)
+        db.flush()
+        db.add(PlaidUser(
+            user_id=user.id,
+            access_token_encrypted=encryption_service.encrypt(ACCESS_TOKEN),
+            item_id=ITEM_ID,
+            institution_name="Bench Bank",
+        ))
+        db.commit()
+    plaid_service.client = SyntheticPlaidClient(SyntheticPlaid(history=size, accounts_per_item=3, seed=42), latency_ms)
+    return RoundTrips(engine)
+
+
+def stored_transactions() -> int:
+    with get_db_session() as db:
+        return db.query(Transaction).count()
+
+
+def bench_upsert_accounts(trips: RoundTrips) -> dict:
+    accounts = [a.model_dump() for a in plaid_service.get_accounts(ACCESS_TOKEN)]
+    start, before = time.perf_counter(), trips.count
+    plaid_repository.upsert_accounts(ITEM_ID, accounts)
+    return {
+        "accounts": len(accounts),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "round_trips": trips.count - before,
+    }
+
+
+def run_scenario(scenario: str, size: int, pipelined: bool, page_size: Union[int, str], latency_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        trips = setup(os.path.join(tmp, "bench.db"), size, latency_ms)
+        upsert_accounts = bench_upsert_accounts(trips)
+        timer = PageTimer(trips)
+
+        if scenario == "sync":
+            start = time.perf_counter()
+            timer.start()
+            result = plaid_repository.sync_item_transactions(
+                ITEM_ID,
+                pipelined=pipelined,
+                progress=timer.page,
+                page_size=None if page_size == "adaptive" else page_size,
+            )
+            elapsed = time.perf_counter() - start
+            rows = result["transactions_synced"]
+            final_page_size = result["page_size"]
+        else:
+            index = plaid_repository.account_index(ITEM_ID)
+            rows, elapsed, final_page_size = 0, 0.0, page_size
+            for page in plaid_repository._sync_pages(ACCESS_TOKEN, None):
+                added = page.get("added", [])
+                start = time.perf_counter()
+                timer.start()
+                rows += plaid_repository.upsert_transactions(ITEM_ID, added, account_index=index)
+                timer.page()
+                elapsed += time.perf_counter() - start
+
+        return {
+            "scenario": scenario,
+            "size": size,
+            "pipelined": pipelined,
+            "page_size": page_size,
+            "final_page_size": final_page_size,
+            "latency_ms": latency_ms,
+            **timer.stats(rows, elapsed),
+            "stored": stored_transactions(),
+            "upsert_accounts": upsert_accounts,
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(r: dict):
+    print(f"  {r['scenario']:<5} {r['size']:>7} rows  {str(r['page_size']):>8}/page  {r['pages']:>5} pages  "
+          f"{r['rows_per_sec']:>10.0f} rows/s  "
+          f"{r['round_trips_per_page']:>6.1f} trips/page  p50 {r['page_latency_p50_ms']:>8.2f} ms  "
+          f"p99 {r['page_latency_p99_ms']:>8.2f} ms  RSS {r['peak_rss_bytes'] / 1024 / 1024:7.1f} MiB")
+
+
+def compare(current: List[dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    # runs from before --page-sizes existed used Plaid's default count of 100
+    before = {(r["scenario"], r["size"], r.get("page_size", 100)): r for r in baseline["results"]}
+    print(f"Compared with {baseline_path} (commit {baseline.get('commit')}):")
+    for r in current:
+        old = before.get((r["scenario"], r["size"], r["page_size"]))
+        if not old or not old["rows_per_sec"]:
+            continue
+        change = (r["rows_per_sec"] - old["rows_per_sec"]) / old["rows_per_sec"] * 100
+        print(f"  {r['scenario']:<5} {r['size']:>7} rows  {str(r['page_size']):>8}/page  {old['rows_per_sec']:>10.0f} -> "
+              f"{r['rows_per_sec']:>10.0f} rows/s ({change:+.1f}%)")
+
+
+def page_size_arg(value: str) -> Union[int, str]:
+    if value == "adaptive":
+        return value
+    size = int(value)
+    if not 1 <= size <= 500:
+        raise argparse.ArgumentTypeError("page size must be between 1 and 500, or 'adaptive'")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--orm-max", type=int, default=10_000, help="largest size to run the per-row ORM path at")
+    parser.add_argument("--pipelined", action="store_true", help="run sync_item_transactions pipelined")
+    parser.add_argument("--page-sizes", type=page_size_arg, nargs="+", default=[100, "adaptive"],
+                        help="transactions/sync counts to run the sync scenario with, or 'adaptive'")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated Plaid latency per request")
+    parser.add_argument("--output", help="write results JSON here (default bench_results/sync_<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare rows/sec against")
+    args = parser.parse_args()
+
+    scenarios = [("sync", size, page_size) for size in args.sizes for page_size in args.page_sizes]
+    scenarios += [("orm", size, 100) for size in args.sizes if size <= args.orm_max]
+
+    # one fresh process per scenario so peak RSS is the scenario's own
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    print(f"📊 Sync benchmark on SQLite ({len(scenarios)} scenarios)")
+    print(f"   Write path: {WRITE_PATH}")
+    for scenario, size, page_size in scenarios:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_scenario, (scenario, size, args.pipelined, page_size, args.latency_ms))
+        print_result(result)
+        results.append(result)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": "sqlite",
+        "write_path": WRITE_PATH,
+        "results": results,
+    }
+    output = args.output or os.path.join("bench_results", f"sync_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
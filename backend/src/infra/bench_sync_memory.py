@@ -0,0 +1,111 @@
+"""Check that streaming transactions/sync keeps peak memory flat as history grows.
+
+Drives PlaidService.iter_sync_transactions against an in-process fake Plaid client that
+generates synthetic pages on demand, and records the tracemalloc peak for each history
+size. Exits non-zero if the peak at the largest size exceeds the peak at the smallest
+by more than --tolerance. --compare also measures the accumulating sync_transactions.
+
+    python -m infra.bench_sync_memory --sizes 1000 10000 100000 500000
+"""
+import argparse
+import sys
+import tracemalloc
+from datetime import date, timedelta
+
+from app.external_services.plaid_service import plaid_service
+
+
+class _Response:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def to_dict(self) -> dict:
+        return self._payload
+
+
+class FakeTransactionsClient:
+    """Generates ``total`` synthetic transactions, page by page, like /transactions/sync."""
+
+    def __init__(self, total: int):
+        self.total = total
+
+    def transactions_sync(self, req) -> _Response:
+        offset = int(getattr(req, "cursor", None) or 0)
+        count = getattr(req, "count", None) or 100
+        end = min(self.total, offset + count)
+        start_day = date(2020, 1, 1)
+        added = [
+            {
+                "transaction_id": f"tx-{i:09d}",
+                "account_id": f"acct-{i % 4}",
+                "amount": round((i % 5000) / 7.0, 2),
+                "date": start_day + timedelta(days=i % 1500),
+                "name": f"Merchant purchase {i}",
+                "merchant_name": f"Merchant {i % 300}",
+                "pending": False,
+                "personal_finance_category": {"primary": "GENERAL_MERCHANDISE", "detailed": "GENERAL_MERCHANDISE_OTHER"},
+            }
+            for i in range(offset, end)
+        ]
+        return _Response({
+            "added": added,
+            "modified": [],
+            "removed": [],
+            "has_more": end < self.total,
+            "next_cursor": str(end),
+        })
+
+
+def peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def stream(count: int):
+    seen = 0
+    for page, _cursor in plaid_service.iter_sync_transactions("access-token", count=count):
+        seen += len(page)
+    return seen
+
+
+def accumulate(count: int):
+    return len(plaid_service.sync_transactions("access-token", count=count)["transactions"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="max allowed peak(largest) / peak(smallest)")
+    parser.add_argument("--compare", action="store_true", help="also measure the accumulating sync_transactions")
+    args = parser.parse_args()
+
+    real_client = plaid_service.client
+    peaks = []
+    try:
+        for size in args.sizes:
+            plaid_service.client = FakeTransactionsClient(size)
+            peak = peak_bytes(lambda: stream(args.page_size))
+            peaks.append(peak)
+            line = f"{size:>9} transactions  streaming peak {peak / 1024 / 1024:8.2f} MiB"
+            if args.compare:
+                full = peak_bytes(lambda: accumulate(args.page_size))
+                line += f"  accumulating peak {full / 1024 / 1024:8.2f} MiB"
+            print(line)
+    finally:
+        plaid_service.client = real_client
+
+    ratio = peaks[-1] / peaks[0]
+    print(f"Peak ratio {args.sizes[-1]} vs {args.sizes[0]}: {ratio:.2f} (tolerance {args.tolerance})")
+    if ratio > args.tolerance:
+        print("❌ Streaming peak memory grows with history size")
+        sys.exit(1)
+    print("✅ Streaming peak memory is flat")
+
+
+if __name__ == "__main__":
+    main()
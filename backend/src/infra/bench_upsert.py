@@ -0,0 +1,92 @@
+"""Compare transaction upsert throughput: per-row ORM loop vs staged MERGE.
+
+Runs against the database in AZURE_SQL_CONN using an existing Plaid item's accounts.
+Synthetic rows are tagged with a unique transaction_id prefix and deleted afterwards.
+
+    python -m infra.bench_upsert --item-id <plaid item_id> --rows 10000
+"""
+import argparse
+import datetime as dt
+import random
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.database import get_db_session
+from app.models.db_models import Account, PlaidUser
+from app.repositories.plaid_repository import plaid_repository
+
+
+def synthetic_transactions(account_ids, n: int, prefix: str):
+    today = dt.date.today()
+    return [
+        {
+            "transaction_id": f"{prefix}{i}",
+            "account_id": random.choice(account_ids),
+            "amount": round(random.uniform(1, 500), 2),
+            "date": today - dt.timedelta(days=random.randint(0, 730)),
+            "merchant_name": random.choice(["Walmart", "Starbucks", "Uber", "Amazon", None]),
+            "name": f"bench transaction {i}",
+            "pending": random.random() < 0.05,
+            "category": [random.choice(["FOOD_AND_DRINK", "TRANSPORTATION", "GENERAL_MERCHANDISE"])],
+            "iso_currency_code": "USD",
+        }
+        for i in range(n)
+    ]
+
+
+def account_ids_for_item(item_id: str):
+    with get_db_session() as db:
+        rows = (
+            db.query(Account.account_id)
+            .join(PlaidUser, PlaidUser.id == Account.plaid_user_id)
+            .filter(PlaidUser.item_id == item_id)
+            .all()
+        )
+    return [r[0] for r in rows]
+
+
+def cleanup(prefix: str):
+    with get_db_session() as db:
+        db.execute(text("DELETE FROM transactions WHERE transaction_id LIKE :p"), {"p": prefix + "%"})
+        db.commit()
+
+
+def timed(label: str, fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(rows):>8} rows  {elapsed:8.2f}s  {len(rows) / elapsed:10.0f} rows/sec")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--item-id", required=True, help="Plaid item_id whose accounts receive the synthetic rows")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    account_ids = account_ids_for_item(args.item_id)
+    if not account_ids:
+        raise SystemExit(f"No accounts found for item {args.item_id}; run /plaid/sync_item first")
+
+    run_id = uuid.uuid4().hex[:8]
+    orm_prefix = f"bench-orm-{run_id}-"
+    bulk_prefix = f"bench-bulk-{run_id}-"
+    orm_rows = synthetic_transactions(account_ids, args.rows, orm_prefix)
+    bulk_rows = synthetic_transactions(account_ids, args.rows, bulk_prefix)
+
+    try:
+        orm_insert = timed("ORM loop (insert)", lambda: plaid_repository.upsert_transactions(args.item_id, orm_rows), orm_rows)
+        orm_update = timed("ORM loop (update)", lambda: plaid_repository.upsert_transactions(args.item_id, orm_rows), orm_rows)
+        bulk_insert = timed("MERGE (insert)", lambda: plaid_repository.bulk_upsert_transactions(args.item_id, bulk_rows), bulk_rows)
+        bulk_update = timed("MERGE (update)", lambda: plaid_repository.bulk_upsert_transactions(args.item_id, bulk_rows), bulk_rows)
+        print(f"Speedup: insert {orm_insert / bulk_insert:.1f}x, update {orm_update / bulk_update:.1f}x")
+    finally:
+        cleanup(orm_prefix)
+        cleanup(bulk_prefix)
+
+
+if __name__ == "__main__":
+    main()
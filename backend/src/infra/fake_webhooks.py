@@ -0,0 +1,76 @@
+"""Fire bursts of fake Plaid SYNC_UPDATES_AVAILABLE webhooks at /plaid/webhook.
+
+Each item receives --events-per-item events spread randomly over --spread seconds, so
+the run shows how many events the debounce window coalesces into a single sync.
+
+The events are unsigned, so the target API must run with PLAID_WEBHOOK_VERIFICATION=false
+(which is ignored when PLAID_ENV=production).
+
+    python -m infra.fake_webhooks --url http://localhost:8000/plaid/webhook --items 20 --events-per-item 10
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+import httpx
+
+
+async def fire(client: httpx.AsyncClient, url: str, item_id: str, delay: float, tally: Counter):
+    await asyncio.sleep(delay)
+    payload = {
+        "webhook_type": "TRANSACTIONS",
+        "webhook_code": "SYNC_UPDATES_AVAILABLE",
+        "item_id": item_id,
+        "initial_update_complete": True,
+        "historical_update_complete": True,
+        "environment": "sandbox",
+    }
+    try:
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+        tally[response.json().get("status", "unknown")] += 1
+    except httpx.HTTPError as e:
+        tally[f"error: {type(e).__name__}"] += 1
+
+
+async def run(args) -> Counter:
+    item_ids = args.item_id or [f"fake-item-{i}" for i in range(args.items)]
+    tally: Counter = Counter()
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        tasks = [
+            fire(client, args.url, item_id, random.uniform(0, args.spread), tally)
+            for item_id in item_ids
+            for _ in range(args.events_per_item)
+        ]
+        await asyncio.gather(*tasks)
+    return tally
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/plaid/webhook")
+    parser.add_argument("--items", type=int, default=10, help="number of synthetic item_ids")
+    parser.add_argument("--item-id", action="append", help="use real item_id(s) instead of synthetic ones")
+    parser.add_argument("--events-per-item", type=int, default=10)
+    parser.add_argument("--spread", type=float, default=3.0, help="seconds over which each item's events arrive")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tally = asyncio.run(run(args))
+    elapsed = time.perf_counter() - start
+
+    sent = sum(tally.values())
+    syncs = tally.get("scheduled", 0)
+    print(f"📨 Sent {sent} webhooks in {elapsed:.1f}s ({sent / elapsed:.0f}/s)")
+    for status, count in tally.most_common():
+        print(f"  {status:<20} {count}")
+    if syncs:
+        print(f"Coalescing ratio: {sent / syncs:.1f} events per scheduled sync")
+
+
+if __name__ == "__main__":
+    main()
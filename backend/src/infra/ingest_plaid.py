@@ -5,6 +5,7 @@ import datetime as dt
 import time
 from typing import List, Dict
 from app.config import get_settings
+from app.external_services.plaid_service import get_plaid_host
 
 settings = get_settings()
 
@@ -29,7 +30,7 @@ if not PLAID_CLIENT_ID or not PLAID_SECRET:
 
 # --- Create client (current SDK pattern) ---
 configuration = plaid.Configuration(
-    host=plaid.Environment.Sandbox,
+    host=get_plaid_host(settings.PLAID_ENV),
     api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
 )
 api_client = plaid.ApiClient(configuration)
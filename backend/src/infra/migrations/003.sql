@@ -0,0 +1,13 @@
+-- 003.sql
+
+-- ==========================================
+-- Institution metadata cache (Plaid institution_id -> name)
+-- ==========================================
+IF OBJECT_ID('dbo.institutions', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.institutions (
+        institution_id NVARCHAR(64) NOT NULL PRIMARY KEY,
+        name NVARCHAR(255) NOT NULL,
+        updated_at DATETIME2 DEFAULT SYSUTCDATETIME()
+    );
+END
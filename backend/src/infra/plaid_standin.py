@@ -0,0 +1,476 @@
+"""Local Plaid stand-in for load-testing the sync path without sandbox limits.
+
+Implements the endpoints the app and infra scripts use: /link/token/create,
+/item/public_token/exchange, /item/get, /item/webhook/update, /institutions/get_by_id,
+/accounts/get, /transactions/sync and the sandbox helpers used by ingest_plaid.
+Transaction history is generated deterministically per item, page by page, so a large
+history costs no memory. A seeded share of it (--modified-rate, --removed-rate) comes back
+as modified or removed deltas --delta-lag positions later in the stream, each exactly once
+whatever the page sizes.
+
+Point the app at it with PLAID_ENV=local (host taken from PLAID_LOCAL_HOST).
+
+    # synthetic: 50k transactions per item, Plaid-like latency, 2% rate limiting
+    python -m infra.plaid_standin --history 50000 --latency-ms 150 --jitter-ms 50 \\
+        --errors RATE_LIMIT_EXCEEDED:0.02
+
+    # record a real sandbox session, then replay it offline
+    python -m infra.plaid_standin --record plaid_session.jsonl --upstream https://sandbox.plaid.com
+    python -m infra.plaid_standin --replay plaid_session.jsonl
+
+Recorded sessions never hold real access or public tokens: both are replaced with a stable
+pseudonym, in requests and responses alike, so replayed clients still match.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Plaid error code -> (HTTP status, error_type)
+PLAID_ERRORS = {
+    "RATE_LIMIT_EXCEEDED": (429, "RATE_LIMIT_EXCEEDED"),
+    "INTERNAL_SERVER_ERROR": (500, "API_ERROR"),
+    "PLANNED_MAINTENANCE": (503, "API_ERROR"),
+    "INSTITUTION_DOWN": (400, "INSTITUTION_ERROR"),
+    "INSTITUTION_NOT_RESPONDING": (400, "INSTITUTION_ERROR"),
+    "ITEM_LOGIN_REQUIRED": (400, "ITEM_ERROR"),
+    "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION": (400, "TRANSACTIONS_ERROR"),
+}
+
+MAX_SYNC_COUNT = 500
+SECRET_FIELDS = ("client_id", "secret")
+TOKEN_FIELDS = ("access_token", "public_token")
+REDACTED_PREFIX = "redacted-"
+
+MERCHANTS = [
+    ("Starbucks", "FOOD_AND_DRINK"),
+    ("Whole Foods", "FOOD_AND_DRINK"),
+    ("Shell", "TRANSPORTATION"),
+    ("Uber", "TRANSPORTATION"),
+    ("Amazon", "GENERAL_MERCHANDISE"),
+    ("Target", "GENERAL_MERCHANDISE"),
+    ("Netflix", "ENTERTAINMENT"),
+    ("Comcast", "RENT_AND_UTILITIES"),
+    ("CVS", "MEDICAL"),
+    ("Delta", "TRAVEL"),
+]
+
+
+def parse_errors(spec: str) -> List[Tuple[str, float]]:
+    """Parse ``CODE:rate,CODE:rate`` into an error-injection profile."""
+    profile = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        code, _, rate = part.partition(":")
+        code = code.strip().upper()
+        if code not in PLAID_ERRORS:
+            raise argparse.ArgumentTypeError(f"Unknown Plaid error code {code}; choose from {', '.join(PLAID_ERRORS)}")
+        profile.append((code, float(rate or 0.0)))
+    return profile
+
+
+def plaid_error(code: str) -> JSONResponse:
+    status, error_type = PLAID_ERRORS[code]
+    return JSONResponse(status_code=status, content={
+        "error_type": error_type,
+        "error_code": code,
+        "error_message": f"injected {code}",
+        "display_message": None,
+        "request_id": uuid.uuid4().hex[:16],
+        "causes": [],
+        "status": status,
+        "documentation_url": "",
+        "suggested_action": None,
+    })
+
+
+def _request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class SyntheticPlaid:
+    """Deterministic fake Plaid data: items are derived from their access tokens."""
+
+    def __init__(self, history: int, accounts_per_item: int, seed: int,
+                 modified_rate: float = 0.02, removed_rate: float = 0.01, delta_lag: int = 100):
+        self.history = history
+        self.accounts_per_item = accounts_per_item
+        self.seed = seed
+        self.modified_rate = modified_rate
+        self.removed_rate = removed_rate
+        self.delta_lag = delta_lag
+        self.extra: Dict[str, List[dict]] = {}  # sandbox-created transactions per item
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def item_id(access_token: str) -> str:
+        return "item-" + hashlib.sha1(access_token.encode()).hexdigest()[:16]
+
+    def institution_id(self, item_id: str) -> str:
+        return f"ins_{int(hashlib.sha1(item_id.encode()).hexdigest(), 16) % 20 + 1}"
+
+    def account_ids(self, item_id: str) -> List[str]:
+        return [f"{item_id}-acct-{i}" for i in range(self.accounts_per_item)]
+
+    def accounts(self, item_id: str) -> List[dict]:
+        accounts = []
+        for i, account_id in enumerate(self.account_ids(item_id)):
+            rng = random.Random(f"{self.seed}:{account_id}")
+            credit = i % 3 == 2
+            current = round(rng.uniform(100, 20000), 2)
+            accounts.append({
+                "account_id": account_id,
+                "balances": {
+                    "available": None if credit else current,
+                    "current": current,
+                    "limit": 10000.0 if credit else None,
+                    "iso_currency_code": "USD",
+                    "unofficial_currency_code": None,
+                },
+                "mask": f"{rng.randint(0, 9999):04d}",
+                "name": "Plaid Credit Card" if credit else f"Plaid Checking {i}",
+                "official_name": None,
+                "type": "credit" if credit else "depository",
+                "subtype": "credit card" if credit else "checking",
+            })
+        return accounts
+
+    def item(self, item_id: str) -> dict:
+        return {
+            "item_id": item_id,
+            "institution_id": self.institution_id(item_id),
+            "webhook": None,
+            "error": None,
+            "available_products": [],
+            "billed_products": ["transactions"],
+            "products": ["transactions"],
+            "consent_expiration_time": None,
+            "update_type": "background",
+        }
+
+    def transaction(self, item_id: str, index: int) -> dict:
+        rng = random.Random(f"{self.seed}:{item_id}:{index}")
+        merchant, category = rng.choice(MERCHANTS)
+        accounts = self.account_ids(item_id)
+        day = date.today() - timedelta(days=(self.history - index) * 730 // max(self.history, 1))
+        return {
+            "transaction_id": f"{item_id}-tx-{index:09d}",
+            "account_id": accounts[index % len(accounts)],
+            "amount": round(rng.uniform(1, 250), 2),
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+            "date": day.isoformat(),
+            "authorized_date": day.isoformat(),
+            "authorized_datetime": None,
+            "datetime": None,
+            "name": merchant.upper(),
+            "merchant_name": merchant,
+            "pending": False,
+            "pending_transaction_id": None,
+            "account_owner": None,
+            "payment_channel": "in store",
+            "transaction_code": None,
+            "category": None,
+            "category_id": None,
+            "location": {
+                "address": None, "city": None, "region": None, "postal_code": None,
+                "country": None, "lat": None, "lon": None, "store_number": None,
+            },
+            "payment_meta": {
+                "reference_number": None, "ppd_id": None, "payee": None, "by_order_of": None,
+                "payer": None, "payment_method": None, "payment_processor": None, "reason": None,
+            },
+            "personal_finance_category": {"primary": category, "detailed": f"{category}_OTHER", "confidence_level": "HIGH"},
+        }
+
+    def fate(self, item_id: str, index: int) -> Optional[str]:
+        """What later happens to history transaction ``index``: "removed", "modified" or None."""
+        roll = random.Random(f"{self.seed}:{item_id}:{index}:fate").random()
+        if roll < self.removed_rate:
+            return "removed"
+        if roll < self.removed_rate + self.modified_rate:
+            return "modified"
+        return None
+
+    def deltas(self, item_id: str, offset: int, end: int) -> Tuple[List[dict], List[dict]]:
+        """Modified and removed entries due in the page covering stream positions [offset, end).
+
+        History transaction i is due at position min(i + delta_lag, history - 1): never before
+        it was added, and in exactly one page however the stream is paged.
+        """
+        modified, removed = [], []
+        if not (self.modified_rate or self.removed_rate) or offset >= self.history:
+            return modified, removed
+        for index in range(max(0, offset - self.delta_lag), min(self.history, end)):
+            if not offset <= min(index + self.delta_lag, self.history - 1) < end:
+                continue
+            fate = self.fate(item_id, index)
+            if fate == "removed":
+                tx = self.transaction(item_id, index)
+                removed.append({"transaction_id": tx["transaction_id"], "account_id": tx["account_id"]})
+            elif fate == "modified":
+                tx = self.transaction(item_id, index)
+                tx["amount"] = round(tx["amount"] + 1.25, 2)
+                tx["name"] = tx["name"] + " ADJ"
+                modified.append(tx)
+        return modified, removed
+
+    def sync_page(self, access_token: str, cursor: Optional[str], count: int, account_ids: Optional[List[str]]) -> dict:
+        item_id = self.item_id(access_token)
+        with self._lock:
+            extra = list(self.extra.get(item_id, []))
+        total = self.history + len(extra)
+        offset = int(cursor) if cursor else 0
+        end = min(total, offset + count)
+        added = []
+        for index in range(offset, end):
+            added.append(self.transaction(item_id, index) if index < self.history else extra[index - self.history])
+        modified, removed = self.deltas(item_id, offset, end)
+        if account_ids:
+            added = [t for t in added if t["account_id"] in account_ids]
+            modified = [t for t in modified if t["account_id"] in account_ids]
+            removed = [t for t in removed if t["account_id"] in account_ids]
+        return {
+            "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+            "accounts": self.accounts(item_id),
+            "added": added,
+            "modified": modified,
+            "removed": removed,
+            "next_cursor": str(end),
+            "has_more": end < total,
+            "request_id": _request_id(),
+        }
+
+    def add_transactions(self, access_token: str, transactions: List[dict]):
+        item_id = self.item_id(access_token)
+        accounts = self.account_ids(item_id)
+        with self._lock:
+            extra = self.extra.setdefault(item_id, [])
+            for t in transactions:
+                tx = self.transaction(item_id, self.history + len(extra))
+                tx.update({
+                    "transaction_id": f"{item_id}-sbx-{len(extra):06d}",
+                    "account_id": accounts[0],
+                    "amount": t.get("amount", tx["amount"]),
+                    "date": str(t.get("date_posted") or tx["date"]),
+                    "authorized_date": str(t.get("date_transacted") or tx["date"]),
+                    "name": t.get("description") or tx["name"],
+                })
+                extra.append(tx)
+
+
+def create_synthetic_app(args) -> FastAPI:
+    app = FastAPI(title="Plaid stand-in")
+    plaid = SyntheticPlaid(
+        args.history, args.accounts_per_item, args.seed,
+        modified_rate=args.modified_rate, removed_rate=args.removed_rate, delta_lag=args.delta_lag,
+    )
+    errors = args.errors
+    rng = random.Random(args.seed)
+    stats = {"requests": 0, "injected_errors": 0}
+
+    @app.middleware("http")
+    async def latency_and_errors(request: Request, call_next):
+        stats["requests"] += 1
+        if args.latency_ms or args.jitter_ms:
+            delay = max(0.0, rng.gauss(args.latency_ms, args.jitter_ms)) / 1000
+            await asyncio.sleep(delay)
+        if request.url.path != "/_stats":
+            roll = rng.random()
+            for code, rate in errors:
+                if roll < rate:
+                    stats["injected_errors"] += 1
+                    return plaid_error(code)
+                roll -= rate
+        return await call_next(request)
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/link/token/create")
+    async def link_token_create():
+        return {"link_token": f"link-local-{uuid.uuid4()}", "expiration": "2099-01-01T00:00:00Z", "request_id": _request_id()}
+
+    @app.post("/sandbox/public_token/create")
+    async def sandbox_public_token_create(body: dict):
+        return {"public_token": f"public-local-{body.get('institution_id', 'ins_1')}-{uuid.uuid4()}", "request_id": _request_id()}
+
+    @app.post("/item/public_token/exchange")
+    async def item_public_token_exchange(body: dict):
+        access_token = "access-local-" + hashlib.sha1(body["public_token"].encode()).hexdigest()
+        return {"access_token": access_token, "item_id": plaid.item_id(access_token), "request_id": _request_id()}
+
+    @app.post("/item/webhook/update")
+    async def item_webhook_update(body: dict):
+        item = {**plaid.item(plaid.item_id(body["access_token"])), "webhook": body.get("webhook")}
+        return {"item": item, "request_id": _request_id()}
+
+    @app.post("/item/get")
+    async def item_get(body: dict):
+        return {"item": plaid.item(plaid.item_id(body["access_token"])), "request_id": _request_id()}
+
+    @app.post("/institutions/get_by_id")
+    async def institutions_get_by_id(body: dict):
+        institution_id = body["institution_id"]
+        return {
+            "institution": {
+                "institution_id": institution_id,
+                "name": f"Local Bank {institution_id.split('_')[-1]}",
+                "products": ["transactions"],
+                "country_codes": ["US"],
+                "routing_numbers": [],
+                "oauth": False,
+                "connection_availability": "SUPPORTED",
+            },
+            "request_id": _request_id(),
+        }
+
+    @app.post("/accounts/get")
+    async def accounts_get(body: dict):
+        item_id = plaid.item_id(body["access_token"])
+        return {"accounts": plaid.accounts(item_id), "item": plaid.item(item_id), "request_id": _request_id()}
+
+    @app.post("/transactions/sync")
+    async def transactions_sync(body: dict):
+        count = min(int(body.get("count") or 100), args.max_page_size)
+        account_ids = (body.get("options") or {}).get("account_ids")
+        return plaid.sync_page(body["access_token"], body.get("cursor"), count, account_ids)
+
+    @app.post("/sandbox/transactions/create")
+    async def sandbox_transactions_create(body: dict):
+        plaid.add_transactions(body["access_token"], body.get("transactions") or [])
+        return {"request_id": _request_id()}
+
+    return app
+
+
+def _redact_token(value):
+    """Stable pseudonym for a token; pseudonyms pass through so redacting twice is a no-op."""
+    if not isinstance(value, str) or value.startswith(REDACTED_PREFIX):
+        return value
+    return REDACTED_PREFIX + hashlib.sha256(value.encode()).hexdigest()[:24]
+
+
+def redact(payload):
+    """Copy of ``payload`` with every TOKEN_FIELDS value, at any depth, pseudonymised."""
+    if isinstance(payload, dict):
+        return {k: _redact_token(v) if k in TOKEN_FIELDS else redact(v) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [redact(v) for v in payload]
+    return payload
+
+
+def _record_key(path: str, body: dict) -> str:
+    public = redact({k: v for k, v in body.items() if k not in SECRET_FIELDS})
+    return path + " " + json.dumps(public, sort_keys=True, default=str)
+
+
+def create_record_app(args) -> FastAPI:
+    """Proxy every request to --upstream and append request/response pairs, tokens redacted, to --record."""
+    client = httpx.AsyncClient(base_url=args.upstream, timeout=60)
+    lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await client.aclose()
+
+    app = FastAPI(title="Plaid stand-in (record)", lifespan=lifespan)
+
+    @app.post("/{path:path}")
+    async def proxy(path: str, request: Request):
+        body = await request.json()
+        upstream = await client.post(f"/{path}", json=body)
+        payload = upstream.json()
+        entry = {
+            "path": f"/{path}",
+            "request": redact({k: v for k, v in body.items() if k not in SECRET_FIELDS}),
+            "status": upstream.status_code,
+            "response": redact(payload),
+        }
+        async with lock:
+            with open(args.record, "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        return JSONResponse(status_code=upstream.status_code, content=payload)
+
+    return app
+
+
+def create_replay_app(args) -> FastAPI:
+    """Serve responses recorded with --record; exact request matches first, then in order per path."""
+    app = FastAPI(title="Plaid stand-in (replay)")
+    exact: Dict[str, dict] = {}
+    by_path: Dict[str, List[dict]] = {}
+    with open(args.replay) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                exact[_record_key(entry["path"], entry["request"])] = entry
+                by_path.setdefault(entry["path"], []).append(entry)
+    positions: Dict[str, int] = {}
+
+    @app.post("/{path:path}")
+    async def replay(path: str, request: Request):
+        path = f"/{path}"
+        body = await request.json()
+        entry = exact.get(_record_key(path, body))
+        if entry is None:
+            entries = by_path.get(path)
+            if not entries:
+                return JSONResponse(status_code=404, content={"error_code": "NOT_RECORDED", "error_message": path})
+            entry = entries[positions.get(path, 0) % len(entries)]
+            positions[path] = positions.get(path, 0) + 1
+        return JSONResponse(status_code=entry["status"], content=entry["response"])
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--history", type=int, default=1000, help="transactions per item")
+    parser.add_argument("--accounts-per-item", type=int, default=3)
+    parser.add_argument("--max-page-size", type=int, default=MAX_SYNC_COUNT, help="cap on /transactions/sync count")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="std deviation of the added latency")
+    parser.add_argument("--errors", type=parse_errors, default=[],
+                        help="error-injection profile, e.g. RATE_LIMIT_EXCEEDED:0.02,INTERNAL_SERVER_ERROR:0.01")
+    parser.add_argument("--modified-rate", type=float, default=0.02, help="share of history later sent as modified")
+    parser.add_argument("--removed-rate", type=float, default=0.01, help="share of history later sent as removed")
+    parser.add_argument("--delta-lag", type=int, default=100, help="stream positions between an add and its delta")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--record", help="proxy to --upstream and append the session to this JSONL file")
+    parser.add_argument("--upstream", default="https://sandbox.plaid.com")
+    parser.add_argument("--replay", help="serve a session recorded with --record")
+    args = parser.parse_args()
+
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.record:
+        app = create_record_app(args)
+        print(f"🎙️  Recording {args.upstream} to {args.record}")
+    elif args.replay:
+        app = create_replay_app(args)
+        print(f"▶️  Replaying {args.replay}")
+    else:
+        app = create_synthetic_app(args)
+        print(f"🏦 Synthetic Plaid: {args.history} transactions/item, latency {args.latency_ms}±{args.jitter_ms} ms")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
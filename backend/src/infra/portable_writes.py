@@ -0,0 +1,49 @@
+"""Dialect-neutral stand-in for the repository's SQL Server bulk writes.
+
+PlaidRepository applies transaction pages with a #tx_staging MERGE / UPDATE that only
+SQL Server runs. Tools that drive the repository against an embedded database (the
+sync benchmark, the tests) inject ``apply_rows_portable`` as its ``portable_writer``:
+
+    plaid_repository.portable_writer = apply_rows_portable
+
+Numbers measured through it describe this executemany path, not the MERGE; use
+infra.bench_upsert against SQL Server for those.
+"""
+from typing import List
+
+from sqlalchemy import bindparam
+
+from app.models.db_models import Transaction
+from app.repositories.plaid_repository import _ID_CHUNK_SIZE, _TX_STAGING_COLUMNS
+
+UPDATED_COLUMNS = ("amount", "date_posted", "merchant_name", "description", "is_pending", "category")
+
+
+def apply_rows_portable(db, rows: List[tuple], insert_missing: bool) -> tuple:
+    """Apply #tx_staging-shaped rows with plain SQLAlchemy; returns (inserted, updated).
+
+    Looks up which ids already exist (chunked IN queries), then applies one executemany
+    UPDATE and, with ``insert_missing``, one executemany INSERT.
+    """
+    table = Transaction.__table__
+    params = [dict(zip(_TX_STAGING_COLUMNS, row)) for row in rows]
+    ids = [p["transaction_id"] for p in params]
+    existing = set()
+    for start in range(0, len(ids), _ID_CHUNK_SIZE):
+        chunk = ids[start:start + _ID_CHUNK_SIZE]
+        existing.update(
+            tid for (tid,) in db.query(Transaction.transaction_id).filter(Transaction.transaction_id.in_(chunk))
+        )
+
+    updates = [{"b_" + k: v for k, v in p.items()} for p in params if p["transaction_id"] in existing]
+    if updates:
+        db.execute(
+            table.update()
+            .where(table.c.transaction_id == bindparam("b_transaction_id"))
+            .values({column: bindparam("b_" + column) for column in UPDATED_COLUMNS}),
+            updates,
+        )
+    inserts = [p for p in params if p["transaction_id"] not in existing] if insert_missing else []
+    if inserts:
+        db.execute(table.insert(), inserts)
+    return len(inserts), len(updates)
@@ -0,0 +1,173 @@
+"""Re-encrypt stored Plaid access tokens with the current ENCRYPTION_KEY.
+
+Rotation without downtime:
+  1. set ENCRYPTION_KEY to the new key and ENCRYPTION_OLD_KEYS to the old one, and deploy
+     (the app now writes with the new key and still reads tokens under the old one)
+  2. run this tool until it reports nothing left to rotate
+  3. remove the old key from ENCRYPTION_OLD_KEYS and deploy again
+
+plaid_users rows are streamed in keyset-paged chunks (WHERE id > last ORDER BY id), and
+each chunk is split into batches that are re-encrypted across a process pool while the
+next chunk is read. Each chunk's updates commit on their own and are followed by a
+checkpoint file, so an interrupted run resumes after the last committed chunk; rows
+already under the new key are skipped either way. An update only applies if the row
+still holds the ciphertext that was read, so tokens rewritten concurrently are left alone.
+
+    python -m infra.rotate_tokens --dry-run
+    python -m infra.rotate_tokens --chunk-size 2000 --workers 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam
+
+from app.config import get_settings
+from app.database import get_db_session
+from app.models.db_models import PlaidUser
+from app.security.encryption import encryption_service
+
+DEFAULT_CHECKPOINT = "rotate_tokens.checkpoint.json"
+
+
+def rotate_batch(rows: List[Tuple[int, str]]) -> dict:
+    """Re-encrypt one batch in a worker process; returns updates plus skipped/failed ids."""
+    updates, current, failed = [], 0, []
+    for row_id, ciphertext in rows:
+        if encryption_service.is_current(ciphertext):
+            current += 1
+            continue
+        try:
+            updates.append({"b_id": row_id, "b_old": ciphertext, "b_new": encryption_service.rotate(ciphertext)})
+        except ValueError:
+            failed.append(row_id)
+    return {"updates": updates, "current": current, "failed": failed}
+
+
+def key_fingerprint() -> str:
+    """Identifies the target key in the checkpoint without storing the key itself."""
+    return hashlib.sha256(b"rotate_tokens:" + get_settings().ENCRYPTION_KEY.encode()).hexdigest()[:16]
+
+
+def load_checkpoint(path: str, restart: bool) -> dict:
+    fresh = {"key": key_fingerprint(), "last_id": 0, "scanned": 0, "rotated": 0, "current": 0, "failed": [], "conflicts": 0}
+    if restart or not os.path.exists(path):
+        return fresh
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("key") != fresh["key"]:
+        print(f"⚠️  {path} was written for a different ENCRYPTION_KEY; starting over")
+        return fresh
+    print(f"↩️  Resuming after plaid_users.id {checkpoint['last_id']} ({checkpoint['scanned']} rows already scanned)")
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp, path)
+
+
+def chunks(after_id: int, chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Keyset-paged plaid_users (id, encrypted token); one short session per chunk."""
+    last_id = after_id
+    while True:
+        with get_db_session() as db:
+            rows = (
+                db.query(PlaidUser.id, PlaidUser.access_token_encrypted)
+                .filter(PlaidUser.id > last_id)
+                .order_by(PlaidUser.id)
+                .limit(chunk_size)
+                .all()
+            )
+        if not rows:
+            return
+        yield [(row_id, token) for row_id, token in rows]
+        last_id = rows[-1][0]
+
+
+def apply_updates(updates: List[dict]) -> int:
+    """Write one chunk's new ciphertexts in a single transaction; returns rows changed."""
+    table = PlaidUser.__table__
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .where(table.c.access_token == bindparam("b_old"))
+        .values(access_token=bindparam("b_new"))
+    )
+    with get_db_session() as db:
+        result = db.execute(stmt, updates)
+        db.commit()
+    # some drivers report -1 for executemany; then assume every row matched
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows read and committed per chunk")
+    parser.add_argument("--batch-size", type=int, default=100, help="rows handed to a worker at a time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="count rows needing rotation without writing")
+    args = parser.parse_args()
+
+    checkpoint = load_checkpoint(args.checkpoint, args.restart or args.dry_run)
+    started = time.perf_counter()
+    scanned_at_start = checkpoint["scanned"]
+
+    def commit(rows: List[Tuple[int, str]], futures: List[Future]):
+        results = [future.result() for future in futures]
+        updates = [u for r in results for u in r["updates"]]
+        if updates and not args.dry_run:
+            changed = apply_updates(updates)
+            checkpoint["conflicts"] += len(updates) - changed
+            checkpoint["rotated"] += changed
+        elif args.dry_run:
+            checkpoint["rotated"] += len(updates)
+        checkpoint["current"] += sum(r["current"] for r in results)
+        checkpoint["failed"] += [row_id for r in results for row_id in r["failed"]]
+        checkpoint["scanned"] += len(rows)
+        checkpoint["last_id"] = rows[-1][0]
+        if not args.dry_run:
+            save_checkpoint(args.checkpoint, checkpoint)
+        elapsed = time.perf_counter() - started
+        rate = (checkpoint["scanned"] - scanned_at_start) / elapsed if elapsed else 0.0
+        print(f"  ✅ through id {checkpoint['last_id']:>10}  {checkpoint['scanned']:>8} scanned  "
+              f"{checkpoint['rotated']:>8} rotated  {rate:10.0f} rows/sec")
+
+    print(f"🔑 Re-encrypting plaid_users tokens with {args.workers} workers"
+          f"{' (dry run)' if args.dry_run else ''}")
+    pending: Optional[Tuple[List[Tuple[int, str]], List[Future]]] = None
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # submit a chunk, then commit the previous one while the pool works and the next chunk is read
+        for rows in chunks(checkpoint["last_id"], args.chunk_size):
+            futures = [
+                pool.submit(rotate_batch, rows[i:i + args.batch_size])
+                for i in range(0, len(rows), args.batch_size)
+            ]
+            if pending:
+                commit(*pending)
+            pending = (rows, futures)
+        if pending:
+            commit(*pending)
+
+    elapsed = time.perf_counter() - started
+    scanned = checkpoint["scanned"] - scanned_at_start
+    print(f"📊 {scanned} rows in {elapsed:.2f}s ({scanned / elapsed if elapsed else 0.0:.0f} rows/sec): "
+          f"{checkpoint['rotated']} rotated, {checkpoint['current']} already current, "
+          f"{checkpoint['conflicts']} changed concurrently, {len(checkpoint['failed'])} undecryptable")
+    if checkpoint["failed"]:
+        print(f"❌ No configured key decrypts plaid_users ids: {checkpoint['failed'][:20]}")
+    if not args.dry_run and not checkpoint["failed"] and os.path.exists(args.checkpoint):
+        # a clean finish needs no resume point; rerunning just verifies every row is current
+        os.remove(args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Register PLAID_WEBHOOK_URL on items linked before it was set (or when it changes).
+
+New items get the webhook at Link time; this backfills the existing ones through
+/item/webhook/update.
+
+    python -m infra.set_item_webhooks --dry-run
+    python -m infra.set_item_webhooks --url https://api.example.com/plaid/webhook
+"""
+import argparse
+
+from app.config import get_settings
+from app.external_services.plaid_service import plaid_service
+from app.repositories.plaid_repository import plaid_repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=get_settings().PLAID_WEBHOOK_URL, help="webhook URL (default PLAID_WEBHOOK_URL)")
+    parser.add_argument("--item", action="append", dest="items", help="only update this item_id (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="list the items without calling Plaid")
+    args = parser.parse_args()
+
+    if not args.url:
+        parser.error("no webhook URL: set PLAID_WEBHOOK_URL or pass --url")
+    items = plaid_repository.list_items()
+    if args.items:
+        items = [i for i in items if i["item_id"] in set(args.items)]
+
+    print(f"🔗 Pointing {len(items)} items at {args.url}{' (dry run)' if args.dry_run else ''}")
+    failed = 0
+    for item in items:
+        if args.dry_run:
+            print(f"  {item['item_id']}")
+            continue
+        try:
+            plaid_user = plaid_repository.get_plaid_user_by_item_id(item["item_id"])
+            plaid_service.update_item_webhook(plaid_user.access_token, args.url)
+            print(f"  ✅ {item['item_id']}")
+        except Exception as e:
+            failed += 1
+            print(f"  ❌ {item['item_id']}: {e}")
+    print(f"📊 {len(items) - failed} updated, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
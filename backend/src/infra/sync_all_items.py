@@ -0,0 +1,54 @@
+"""Refresh every linked Plaid item through the concurrent sync scheduler.
+
+    python -m infra.sync_all_items --workers 8 --per-institution 2 --rate-per-minute 1000
+"""
+import argparse
+import json
+
+from app.repositories.plaid_repository import plaid_repository
+from app.sync.scheduler import SyncScheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, help="global concurrency cap (default PLAID_SYNC_MAX_WORKERS)")
+    parser.add_argument("--per-institution", type=int, help="concurrent syncs per institution (default PLAID_SYNC_PER_INSTITUTION)")
+    parser.add_argument("--rate-per-minute", type=float, help="Plaid requests per minute (default PLAID_RATE_LIMIT_PER_MINUTE)")
+    parser.add_argument("--pipelined", action="store_true", help="overlap Plaid page fetches with DB writes")
+    parser.add_argument("--item", action="append", dest="items", help="only sync this item_id (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    items = plaid_repository.list_items()
+    if args.items:
+        items = [i for i in items if i["item_id"] in set(args.items)]
+    if not items:
+        print("No Plaid items to sync")
+        return
+
+    scheduler = SyncScheduler(
+        max_workers=args.workers,
+        per_institution=args.per_institution,
+        requests_per_minute=args.rate_per_minute,
+        pipelined=args.pipelined,
+    )
+    print(f"🔄 Syncing {len(items)} items with {scheduler.max_workers} workers "
+          f"({scheduler.per_institution} per institution)")
+    report = scheduler.run(items)
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+
+    for r in sorted(report["results"], key=lambda r: r["latency_s"], reverse=True):
+        status = "✅" if r["status"] == "ok" else f"❌ {r.get('error')}"
+        print(f"  {r['item_id']:<40} {r['institution']:<30} {r['latency_s']:7.2f}s "
+              f"{r.get('transactions_synced', 0):>7} tx  {status}")
+    print(f"Items: {report['items']} ({report['succeeded']} ok, {report['failed']} failed) "
+          f"in {report['elapsed_s']:.1f}s -> {report['items_per_min']:.1f} items/min")
+    print(f"Per-item latency: p50 {report['latency_p50_s']:.2f}s, p95 {report['latency_p95_s']:.2f}s, "
+          f"max {report['latency_max_s']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+# Required settings without defaults; the tests never reach Auth0, Plaid or Azure SQL
+os.environ.setdefault("AUTH0_DOMAIN", "example.auth0.com")
+for _name in (
+    "AUTH0_API_DEFAULT_AUDIENCE",
+    "AUTH0_APPLICATION_CLIENT_ID",
+    "AUTH0_APPLICATION_CLIENT_SECRET",
+    "PLAID_CLIENT_ID",
+    "PLAID_SECRET",
+    "AZURE_SQL_CONN",
+    "AUTH0_MANAGEMENT_API_CLIENT_ID",
+    "AUTH0_MANAGEMENT_API_CLIENT_SECRET",
+    "AUTH0_MANAGEMENT_API_AUDIENCE",
+):
+    os.environ.setdefault(_name, "test")
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.external_services import async_plaid_service as module
+from app.external_services.async_plaid_service import AsyncPlaidService
+from app.external_services.plaid_retry import PlaidRetrier
+from infra.plaid_standin import SyntheticPlaid
+
+ACCESS_TOKEN = "access-async"
+
+
+def make_service(handler) -> tuple:
+    requests = []
+
+    def record(request: httpx.Request):
+        requests.append(json.loads(request.content))
+        return handler(request)
+
+    service = AsyncPlaidService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(record), base_url="https://plaid.test")
+    return service, requests
+
+
+def plaid_error(status, error_type, error_code):
+    return httpx.Response(status, json={"error_type": error_type, "error_code": error_code, "error_message": "nope"})
+
+
+def test_plaid_errors_are_wrapped_like_the_sync_service():
+    service, _ = make_service(lambda request: plaid_error(400, "INVALID_INPUT", "INVALID_PUBLIC_TOKEN"))
+
+    with pytest.raises(Exception, match="Failed to exchange public token: nope") as raised:
+        asyncio.run(service.exchange_public_token("public-bad"))
+    assert type(raised.value) is Exception
+    with pytest.raises(Exception, match="Failed to get accounts") as raised:
+        asyncio.run(service.get_accounts(ACCESS_TOKEN))
+    assert type(raised.value) is Exception
+
+
+def test_open_circuit_is_wrapped(monkeypatch):
+    retrier = PlaidRetrier(max_attempts=1, base_delay=0.0, max_delay=1.0, failure_threshold=1, reset_seconds=60.0)
+    retrier.breaker("Bank").record_failure()
+    monkeypatch.setattr(module, "plaid_retrier", retrier)
+    service, requests = make_service(lambda request: httpx.Response(200, json={"accounts": []}))
+
+    with pytest.raises(Exception, match="Failed to get accounts") as raised:
+        asyncio.run(service.get_accounts(ACCESS_TOKEN, institution="Bank"))
+    assert type(raised.value) is Exception
+    assert requests == []
+
+
+def test_sync_transactions_streams_page_by_page():
+    plaid = SyntheticPlaid(history=250, accounts_per_item=2, seed=5, modified_rate=0.0, removed_rate=0.0)
+
+    def handler(request):
+        body = json.loads(request.content)
+        return httpx.Response(200, json=plaid.sync_page(body["access_token"], body.get("cursor"), body["count"], None))
+
+    service, requests = make_service(handler)
+
+    async def walk():
+        pages = []
+        async for page, cursor in service.iter_sync_transactions(ACCESS_TOKEN, count=100):
+            # the next page is only requested once this one has been consumed
+            assert len(requests) == len(pages) + 1
+            pages.append((len(page), cursor))
+        return pages
+
+    assert asyncio.run(walk()) == [(100, "100"), (100, "200"), (50, "250")]
+    result = asyncio.run(service.sync_transactions(ACCESS_TOKEN, count=100))
+    assert len(result["transactions"]) == 250 and result["cursor"] == "250"
@@ -0,0 +1,92 @@
+from app.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(maxsize=3, ttl=10.0):
+    clock, evicted = FakeClock(), []
+    cache = TTLCache(maxsize, ttl, on_evict=lambda key, value: evicted.append((key, value)), clock=clock)
+    return cache, clock, evicted
+
+
+def test_entries_expire_after_ttl():
+    cache, clock, evicted = make_cache()
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a", "gone") == "gone"
+    assert evicted == [("a", 1)]
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_per_entry_ttl_overrides_the_default():
+    cache, clock, _ = make_cache(ttl=10.0)
+    cache.set("short", 1, ttl_seconds=1.0)
+    cache.set("long", 2)
+    clock.now += 2.0
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_full_cache_evicts_least_recently_used():
+    cache, _, evicted = make_cache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert evicted == [("b", 2)]
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_overwrite_invalidate_and_clear_report_evictions():
+    cache, _, evicted = make_cache()
+    cache.set("a", 1)
+    cache.set("a", 2)
+    assert evicted == [("a", 1)]
+    assert cache.get("a") == 2
+
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+    cache.set("b", 3)
+    cache.set("c", 4)
+    cache.clear()
+    assert evicted == [("a", 1), ("a", 2), ("b", 3), ("c", 4)]
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 4
+
+
+def test_hit_rate():
+    cache, _, _ = make_cache()
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats()["hit_rate"] == 2 / 3
+
+
+def test_expired_entries_are_swept_without_being_read_again():
+    cache, clock, evicted = make_cache(ttl=10.0)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=30.0)
+    clock.now += 10.0
+    cache.get("b")  # touches another key only
+    assert evicted == [("a", 1)]
+    assert len(cache) == 1
+
+    cache.set("c", 3)
+    clock.now += 30.0
+    assert cache.expire() == 2
+    assert evicted == [("a", 1), ("b", 2), ("c", 3)]
+    assert cache.stats()["expirations"] == 3
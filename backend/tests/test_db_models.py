@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+from app.models.db_models import PlaidUser
+from app.security.encryption import encryption_service
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def test_models_import_without_settings_or_keys():
+    code = "import sys, app.models.db_models; print(sorted(m for m in sys.modules if m.startswith('app.')))"
+    env = {k: v for k, v in os.environ.items() if not k.startswith(("AUTH0_", "PLAID_", "AZURE_", "ENCRYPTION_"))}
+    env["PYTHONPATH"] = SRC
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=SRC, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "['app.models', 'app.models.db_models']"
+
+
+def test_access_token_is_decrypted_when_read():
+    plaid_user = PlaidUser(access_token_encrypted=encryption_service.encrypt("access-sandbox-123"))
+    assert plaid_user.access_token == "access-sandbox-123"
+    assert PlaidUser(access_token_encrypted=None).access_token is None
@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import get_db
+from app.dependencies import get_current_user_id
+from app.models.db_models import Base, Household, User
+from app.routers import households
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        owner = User(email="owner@example.com", name="owner", sub="auth0|owner")
+        db.add(owner)
+        db.flush()
+        db.add(Household(id=1, name="Home", owner_id=owner.id))
+        db.commit()
+    return factory
+
+
+def make_client(session_factory, authenticated=True):
+    def db():
+        with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(households.router, prefix="/households")
+    app.dependency_overrides[get_db] = db
+    if authenticated:
+        app.dependency_overrides[get_current_user_id] = lambda: 1
+    return TestClient(app)
+
+
+def test_add_member_resolves_the_caller(session_factory):
+    response = make_client(session_factory).post("/households/1/members", json={"household_id": 1, "user_id": 2, "role": None})
+    assert response.status_code == 201
+    assert response.json()["role"] == "member"
+
+
+def test_add_member_requires_a_bearer_token(session_factory):
+    response = make_client(session_factory, authenticated=False).post("/households/1/members", json={"household_id": 1, "user_id": 2, "role": None})
+    assert response.status_code in (401, 403)
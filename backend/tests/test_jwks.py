@@ -0,0 +1,124 @@
+import types
+
+import pytest
+
+from app.security import jwks
+from app.security.jwks import JWKSStore
+from app.security.token_tools import TokenTools, claims_cache, jwks_store
+from infra.bench_auth import make_keys, mint
+
+PRIVATE_PEM, DOCUMENT = make_keys(2)
+OLD_KEY, NEW_KEY = DOCUMENT["keys"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 5000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(jwks, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+class Upstream:
+    """Serves a settable JWKS document and counts fetches."""
+
+    def __init__(self, *keys):
+        self.keys = list(keys)
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("auth0 down")
+        return {"keys": self.keys}
+
+
+def make_store(upstream, min_refetch=30.0, on_keys_removed=None):
+    # refresh_seconds=0 keeps the background refresher off
+    return JWKSStore(upstream, "RS256", refresh_seconds=0, min_refetch_seconds=min_refetch, on_keys_removed=on_keys_removed)
+
+
+def test_unknown_kid_refetches_at_most_once_per_interval(clock):
+    upstream = Upstream(OLD_KEY)
+    store = make_store(upstream)
+    assert store.get_key(OLD_KEY["kid"]) is not None
+    assert upstream.calls == 1
+
+    clock.now += 30.0
+    for _ in range(5):
+        assert store.get_key("forged") is None
+    assert upstream.calls == 2
+
+    clock.now += 29.0
+    assert store.get_key("forged") is None
+    assert upstream.calls == 2
+    stats = store.stats()
+    assert stats["unknown_kid_refetches"] == 1 and stats["unknown_kid_rejections"] == 6
+
+
+def test_rotated_in_key_is_picked_up_by_the_refetch(clock):
+    upstream = Upstream(OLD_KEY)
+    store = make_store(upstream)
+    store.load()
+    upstream.keys.append(NEW_KEY)
+    # a refetch just happened (the load), so the new kid waits for the interval
+    assert store.get_key(NEW_KEY["kid"]) is None
+    clock.now += 30.0
+    assert store.get_key(NEW_KEY["kid"]) is not None
+    assert upstream.calls == 2
+
+
+def test_failed_refetch_keeps_keys_and_backs_off(clock):
+    upstream = Upstream(OLD_KEY)
+    store = make_store(upstream)
+    store.load()
+    upstream.fail = True
+    clock.now += 30.0
+    assert store.get_key("forged") is None
+    assert store.get_key(OLD_KEY["kid"]) is not None
+    clock.now += 10.0
+    assert store.get_key("forged") is None
+    assert upstream.calls == 2
+    assert store.stats()["fetch_failures"] == 1
+
+
+def test_first_fetch_failure_raises():
+    upstream = Upstream(OLD_KEY)
+    upstream.fail = True
+    with pytest.raises(RuntimeError):
+        make_store(upstream).load()
+
+
+def test_removed_kids_are_reported():
+    removed = []
+    upstream = Upstream(OLD_KEY, NEW_KEY)
+    store = make_store(upstream, on_keys_removed=removed.append)
+    store.load()
+    upstream.keys = [NEW_KEY]
+    assert store.refresh() is True
+    assert removed == [{OLD_KEY["kid"]}]
+    assert store.get_key(OLD_KEY["kid"]) is None
+
+
+def test_withdrawn_key_clears_verified_claims(monkeypatch):
+    upstream = Upstream(OLD_KEY, NEW_KEY)
+    monkeypatch.setattr(jwks_store, "_fetch", upstream)
+    monkeypatch.setattr(jwks_store, "_keys", None)
+    monkeypatch.setattr(jwks_store, "refresh_seconds", 0)
+    claims_cache.clear()
+
+    token = mint(PRIVATE_PEM, NEW_KEY["kid"], "auth0|jwks-test")
+    assert TokenTools(token).verified_claim().sub == "auth0|jwks-test"
+    assert len(claims_cache) == 1
+
+    upstream.keys = [OLD_KEY]
+    jwks_store.refresh()
+    assert len(claims_cache) == 0
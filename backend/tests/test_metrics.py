@@ -0,0 +1,29 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.metrics import metrics
+from app.routers import metrics as metrics_router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(metrics_router.router, prefix="/metrics")
+    return TestClient(app)
+
+
+def test_metrics_are_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_require_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "METRICS_TOKEN", "scrape-secret")
+    metrics.register("test_source", lambda: {"hits": 1})
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.json()["test_source"] == {"hits": 1}
@@ -0,0 +1,27 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_current_user_id
+from app.routers import plaid
+
+
+def test_plaid_user_ids_filter_is_read_from_the_query_string(monkeypatch):
+    calls = []
+
+    def snapshot(user_id, staleness, plaid_user_ids):
+        calls.append((user_id, plaid_user_ids))
+        return []
+
+    monkeypatch.setattr(plaid.plaid_repository, "get_account_snapshot", snapshot)
+    app = FastAPI()
+    app.include_router(plaid.router, prefix="/plaid")
+    app.dependency_overrides[get_current_user_id] = lambda: 7
+    client = TestClient(app)
+
+    response = client.get("/plaid/accounts", params=[("plaid_user_ids", 1), ("plaid_user_ids", 2)])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Plaid connection not found"
+    assert calls == [(7, [1, 2])]
+
+    client.get("/plaid/accounts")
+    assert calls[-1] == (7, None)
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+from app.external_services.plaid_retry import CircuitBreaker, CircuitOpenError, PlaidError, PlaidRetrier
+
+
+def make_retrier(max_attempts=1, failure_threshold=1, reset_seconds=0.0):
+    return PlaidRetrier(
+        max_attempts=max_attempts,
+        base_delay=0.0,
+        max_delay=1.0,
+        failure_threshold=failure_threshold,
+        reset_seconds=reset_seconds,
+    )
+
+
+def institution_down():
+    raise PlaidError("down", status=400, error_type="INSTITUTION_ERROR", error_code="INSTITUTION_DOWN")
+
+
+def rate_limited():
+    raise PlaidError("slow down", status=429, error_type="RATE_LIMIT_EXCEEDED", error_code="RATE_LIMIT_EXCEEDED")
+
+
+def open_breaker(retrier, institution="Bank"):
+    with pytest.raises(PlaidError):
+        retrier.call(institution_down, institution=institution)
+    assert retrier.breaker(institution).state == CircuitBreaker.OPEN
+
+
+def test_retries_retryable_errors_then_succeeds():
+    retrier = make_retrier(max_attempts=3, failure_threshold=5)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            rate_limited()
+        return "ok"
+
+    assert retrier.call(flaky, institution="Bank") == "ok"
+    assert retrier.stats()["retries"] == 2
+
+
+def test_non_retryable_error_is_raised_immediately():
+    retrier = make_retrier(max_attempts=3)
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise PlaidError("bad", status=400, error_type="INVALID_REQUEST", error_code="MISSING_FIELDS")
+
+    with pytest.raises(PlaidError):
+        retrier.call(bad_request)
+    assert len(attempts) == 1
+
+
+def test_open_breaker_rejects_calls_until_reset():
+    retrier = make_retrier(reset_seconds=60.0)
+    open_breaker(retrier)
+    with pytest.raises(CircuitOpenError):
+        retrier.call(lambda: "ok", institution="Bank")
+
+
+def test_successful_trial_closes_breaker():
+    retrier = make_retrier()
+    open_breaker(retrier)
+    assert retrier.call(lambda: "ok", institution="Bank") == "ok"
+    assert retrier.breaker("Bank").state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_reopens_breaker():
+    retrier = make_retrier()
+    open_breaker(retrier)
+    open_breaker(retrier)
+
+
+def test_rate_limited_trial_releases_the_slot():
+    retrier = make_retrier()
+    open_breaker(retrier)
+    with pytest.raises(PlaidError):
+        retrier.call(rate_limited, institution="Bank")
+    # inconclusive: still half-open, and the next call gets to be the trial
+    assert retrier.breaker("Bank").state == CircuitBreaker.HALF_OPEN
+    assert retrier.call(lambda: "ok", institution="Bank") == "ok"
+    assert retrier.breaker("Bank").state == CircuitBreaker.CLOSED
+
+
+def test_unclassified_error_in_trial_releases_the_slot():
+    retrier = make_retrier()
+    open_breaker(retrier)
+
+    def broken():
+        raise ValueError("not a Plaid failure")
+
+    with pytest.raises(ValueError):
+        retrier.call(broken, institution="Bank")
+    assert retrier.call(lambda: "ok", institution="Bank") == "ok"
+
+
+def test_cancelled_async_trial_releases_the_slot():
+    retrier = make_retrier()
+    open_breaker(retrier)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(retrier.acall(hang, institution="Bank"), timeout=0.01)
+        return await retrier.acall(ok, institution="Bank")
+
+    assert asyncio.run(scenario()) == "ok"
+    assert retrier.breaker("Bank").state == CircuitBreaker.CLOSED
+
+
+def test_stale_release_does_not_free_a_newer_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure()
+    first = breaker.before_call("Bank")
+    breaker.record_failure()
+    second = breaker.before_call("Bank")
+    breaker.release_trial(first)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("Bank")
+    breaker.release_trial(second)
+    assert breaker.before_call("Bank") is not None
+
+
+@pytest.mark.parametrize("error", [
+    PlaidError("lost response"),
+    PlaidError("bad gateway", status=502),
+    PlaidError("oops", status=500, error_type="API_ERROR", error_code="INTERNAL_SERVER_ERROR"),
+])
+def test_non_idempotent_operation_is_not_retried_after_ambiguous_failure(error):
+    retrier = make_retrier(max_attempts=3)
+    attempts = []
+
+    def exchange():
+        attempts.append(1)
+        raise error
+
+    for operation in ("item_public_token_exchange", "/item/public_token/exchange"):
+        attempts.clear()
+        with pytest.raises(PlaidError):
+            retrier.call(exchange, operation=operation)
+        assert len(attempts) == 1
+
+    # the same failure on an idempotent call is retried
+    attempts.clear()
+    with pytest.raises(PlaidError):
+        retrier.call(exchange, operation="accounts_get")
+    assert len(attempts) == 3
+
+
+def test_non_idempotent_operation_is_retried_when_rate_limited():
+    retrier = make_retrier(max_attempts=3)
+    attempts = []
+
+    def exchange():
+        attempts.append(1)
+        if len(attempts) == 1:
+            rate_limited()
+        if len(attempts) == 2:
+            raise PlaidError("too many requests", status=429)
+        return "ok"
+
+    assert asyncio.run(_acall(retrier, exchange, "/item/public_token/exchange")) == "ok"
+    assert len(attempts) == 3
+
+
+async def _acall(retrier, fn, operation):
+    async def call():
+        return fn()
+
+    return await retrier.acall(call, operation=operation)
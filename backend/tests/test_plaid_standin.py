@@ -0,0 +1,103 @@
+import argparse
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from infra import plaid_standin
+from infra.plaid_standin import SyntheticPlaid, create_record_app, create_replay_app, create_synthetic_app, redact
+
+ACCESS_TOKEN = "access-sandbox-1234"
+
+
+def synthetic_args(**overrides):
+    args = dict(history=200, accounts_per_item=3, seed=7, errors=[], latency_ms=0.0, jitter_ms=0.0,
+                max_page_size=500, modified_rate=0.1, removed_rate=0.05, delta_lag=20)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def drain(plaid, count, account_ids=None):
+    pages, cursor = [], None
+    while True:
+        page = plaid.sync_page(ACCESS_TOKEN, cursor, count, account_ids)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return pages
+
+
+def delta_ids(pages, key):
+    return [t["transaction_id"] for page in pages for t in page[key]]
+
+
+def test_deltas_come_on_later_pages_and_only_once_whatever_the_page_size():
+    plaid = SyntheticPlaid(history=200, accounts_per_item=3, seed=7, modified_rate=0.1, removed_rate=0.05, delta_lag=20)
+    by_size = {}
+    for count in (7, 50, 500):
+        pages = drain(plaid, count)
+        modified, removed = delta_ids(pages, "modified"), delta_ids(pages, "removed")
+        assert modified and removed
+        assert len(set(modified)) == len(modified) and len(set(removed)) == len(removed)
+        assert not set(modified) & set(removed)
+        by_size[count] = (sorted(modified), sorted(removed))
+
+        added_so_far = set()
+        for page in pages:
+            added_so_far.update(t["transaction_id"] for t in page["added"])
+            assert set(delta_ids([page], "modified")) <= added_so_far
+            assert set(delta_ids([page], "removed")) <= added_so_far
+    assert by_size[7] == by_size[50] == by_size[500]
+    # the first page with a small count is too early for any delta
+    assert not drain(plaid, 7)[0]["modified"] and not drain(plaid, 7)[0]["removed"]
+
+
+def test_modified_rows_change_and_account_filter_applies_to_deltas():
+    plaid = SyntheticPlaid(history=200, accounts_per_item=3, seed=7, modified_rate=0.1, removed_rate=0.05, delta_lag=20)
+    item_id = plaid.item_id(ACCESS_TOKEN)
+    page = plaid.sync_page(ACCESS_TOKEN, None, 500, None)
+    for tx in page["modified"]:
+        index = int(tx["transaction_id"].rsplit("-", 1)[1])
+        assert tx["amount"] != plaid.transaction(item_id, index)["amount"]
+
+    account = plaid.account_ids(item_id)[0]
+    filtered = plaid.sync_page(ACCESS_TOKEN, None, 500, [account])
+    assert all(t["account_id"] == account for key in ("added", "modified", "removed") for t in filtered[key])
+
+
+def test_zero_rates_emit_no_deltas():
+    plaid = SyntheticPlaid(history=100, accounts_per_item=3, seed=7, modified_rate=0.0, removed_rate=0.0)
+    page = plaid.sync_page(ACCESS_TOKEN, None, 500, None)
+    assert len(page["added"]) == 100 and page["modified"] == [] and page["removed"] == []
+
+
+def test_redact_is_stable_nested_and_idempotent():
+    payload = {"access_token": ACCESS_TOKEN, "item": {"public_token": "public-1"}, "list": [{"access_token": "a"}], "n": 1}
+    redacted = redact(payload)
+    assert ACCESS_TOKEN not in json.dumps(redacted) and "public-1" not in json.dumps(redacted)
+    assert redacted["access_token"] == redact({"access_token": ACCESS_TOKEN})["access_token"]
+    assert redacted["n"] == 1
+    assert redact(redacted) == redacted
+
+
+def test_recorded_session_has_no_real_tokens_and_replays(tmp_path, monkeypatch):
+    upstream = create_synthetic_app(synthetic_args())
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        plaid_standin.httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.ASGITransport(app=upstream), **kwargs),
+    )
+    record = tmp_path / "session.jsonl"
+    with TestClient(create_record_app(argparse.Namespace(upstream="http://upstream", record=str(record)))) as client:
+        exchange = client.post("/item/public_token/exchange", json={"public_token": "public-real", "secret": "s"}).json()
+        real_token = exchange["access_token"]
+        page = client.post("/transactions/sync", json={"access_token": real_token, "count": 50}).json()
+
+    recorded = record.read_text()
+    assert real_token not in recorded and "public-real" not in recorded and '"secret"' not in recorded
+
+    replay = TestClient(create_replay_app(argparse.Namespace(replay=str(record))))
+    pseudonym = replay.post("/item/public_token/exchange", json={"public_token": "public-real"}).json()["access_token"]
+    assert pseudonym.startswith("redacted-")
+    replayed = replay.post("/transactions/sync", json={"access_token": pseudonym, "count": 50}).json()
+    assert [t["transaction_id"] for t in replayed["added"]] == [t["transaction_id"] for t in page["added"]]
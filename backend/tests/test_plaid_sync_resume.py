@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.database import SessionLocal, get_db_session
+from app.external_services.plaid_service import plaid_service
+from app.models.db_models import Base, PlaidUser, Transaction, User
+from app.repositories.plaid_repository import plaid_repository
+from app.security.encryption import encryption_service
+from infra.bench_sync import SyntheticPlaidClient
+from infra.plaid_standin import SyntheticPlaid
+from infra.portable_writes import apply_rows_portable
+
+ITEM_ID = "resume-item"
+ACCESS_TOKEN = "access-resume"
+HISTORY = 400
+PAGE_SIZE = 50
+
+
+class CrashingClient(SyntheticPlaidClient):
+    """Synthetic Plaid whose transactions/sync fails once, on call ``crash_on``."""
+
+    def __init__(self, plaid: SyntheticPlaid, crash_on: int):
+        super().__init__(plaid)
+        self.crash_on = crash_on
+        self.calls = 0
+
+    def transactions_sync(self, req):
+        self.calls += 1
+        if self.calls == self.crash_on:
+            raise RuntimeError("fetcher crashed")
+        return super().transactions_sync(req)
+
+
+@pytest.fixture
+def plaid(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    monkeypatch.setitem(SessionLocal.kw, "bind", engine)
+    monkeypatch.setattr(plaid_repository, "portable_writer", apply_rows_portable)
+    Base.metadata.create_all(engine)
+    with get_db_session() as db:
+        user = User(email="resume@example.com", name="resume", sub="resume|1")
+        db.add(user)
+        db.flush()
+        db.add(PlaidUser(
+            user_id=user.id,
+            access_token_encrypted=encryption_service.encrypt(ACCESS_TOKEN),
+            item_id=ITEM_ID,
+            institution_name="Resume Bank",
+        ))
+        db.commit()
+    synthetic = SyntheticPlaid(history=HISTORY, accounts_per_item=3, seed=11, modified_rate=0.1, removed_rate=0.05, delta_lag=30)
+    monkeypatch.setattr(plaid_service, "client", SyntheticPlaidClient(synthetic))
+    return synthetic
+
+
+def stored_cursor() -> str:
+    with get_db_session() as db:
+        return db.query(PlaidUser).filter(PlaidUser.item_id == ITEM_ID).one().cursor
+
+
+def stored_transactions() -> dict:
+    with get_db_session() as db:
+        return {t.transaction_id: t.amount for t in db.query(Transaction).all()}
+
+
+def expected_transactions(synthetic: SyntheticPlaid) -> dict:
+    item_id = synthetic.item_id(ACCESS_TOKEN)
+    expected = {}
+    for index in range(synthetic.history):
+        tx = synthetic.transaction(item_id, index)
+        fate = synthetic.fate(item_id, index)
+        if fate == "removed":
+            continue
+        expected[tx["transaction_id"]] = round(tx["amount"] + 1.25, 2) if fate == "modified" else tx["amount"]
+    return expected
+
+
+def sync(**kwargs):
+    return plaid_repository.sync_item_transactions(ITEM_ID, pipelined=True, page_size=PAGE_SIZE, **kwargs)
+
+
+def fetcher_threads():
+    return [t for t in threading.enumerate() if t.name == "plaid-sync-fetcher"]
+
+
+def test_pipelined_sync_writes_every_page_and_delta(plaid):
+    result = sync()
+    assert result["pages"] == HISTORY // PAGE_SIZE
+    assert result["transactions_modified"] and result["transactions_removed"]
+    assert stored_transactions() == expected_transactions(plaid)
+    assert stored_cursor() == str(HISTORY)
+
+
+def test_resume_after_fetch_crash(plaid, monkeypatch):
+    monkeypatch.setattr(plaid_service, "client", CrashingClient(plaid, crash_on=4))
+    with pytest.raises(RuntimeError, match="fetcher crashed"):
+        sync()
+    assert not fetcher_threads()
+    # the three pages fetched before the crash were all written, cursor included
+    assert stored_cursor() == str(3 * PAGE_SIZE)
+
+    result = sync()
+    assert result["resumed_from_cursor"] is True
+    assert result["pages"] == HISTORY // PAGE_SIZE - 3
+    assert stored_transactions() == expected_transactions(plaid)
+    assert stored_cursor() == str(HISTORY)
+
+
+def test_resume_after_write_crash(plaid, monkeypatch):
+    write_page = plaid_repository._write_sync_page
+    written = []
+
+    def crash_on_third_page(item_id, resp, account_index):
+        if len(written) == 2:
+            raise RuntimeError("database went away")
+        written.append(resp["next_cursor"])
+        return write_page(item_id, resp, account_index)
+
+    monkeypatch.setattr(plaid_repository, "_write_sync_page", crash_on_third_page)
+    with pytest.raises(RuntimeError, match="database went away"):
+        sync()
+    assert not fetcher_threads()
+    # the failed page left nothing behind: the cursor still points past page two
+    assert stored_cursor() == written[-1] == str(2 * PAGE_SIZE)
+    assert len(stored_transactions()) <= 2 * PAGE_SIZE
+
+    monkeypatch.setattr(plaid_repository, "_write_sync_page", write_page)
+    result = sync()
+    assert result["resumed_from_cursor"] is True
+    assert stored_transactions() == expected_transactions(plaid)
+    assert stored_cursor() == str(HISTORY)
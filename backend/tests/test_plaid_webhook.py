@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+
+from app.security.plaid_webhook import PlaidWebhookVerifier, WebhookVerificationError
+
+BODY = json.dumps({"webhook_type": "TRANSACTIONS", "webhook_code": "SYNC_UPDATES_AVAILABLE", "item_id": "item-1"}).encode()
+
+
+def make_key(kid="kid-1"):
+    private = ec.generate_private_key(ec.SECP256R1())
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    document = {**jwk.construct(public, "ES256").to_dict(), "kid": kid, "use": "sig", "expired_at": None}
+    return pem, document
+
+
+def sign(pem, body=BODY, kid="kid-1", iat=None):
+    claims = {"iat": int(time.time()) if iat is None else iat, "request_body_sha256": hashlib.sha256(body).hexdigest()}
+    return jwt.encode(claims, pem, algorithm="ES256", headers={"kid": kid})
+
+
+def make_verifier(documents):
+    fetches = []
+
+    async def fetch_key(kid):
+        fetches.append(kid)
+        if kid not in documents:
+            raise LookupError(kid)
+        return documents[kid]
+
+    return PlaidWebhookVerifier(fetch_key, max_age_seconds=300.0), fetches
+
+
+def verify(verifier, body, token):
+    asyncio.run(verifier.verify(body, token))
+
+
+def test_valid_signature_is_accepted_and_key_cached():
+    pem, document = make_key()
+    verifier, fetches = make_verifier({"kid-1": document})
+    verify(verifier, BODY, sign(pem))
+    verify(verifier, BODY, sign(pem))
+    assert fetches == ["kid-1"]
+    assert verifier.stats()["verified"] == 2
+
+
+@pytest.mark.parametrize("token_for", [
+    lambda pem: None,
+    lambda pem: "not-a-jwt",
+    lambda pem: sign(pem, body=b'{"item_id": "other"}'),
+    lambda pem: sign(pem, iat=int(time.time()) - 3600),
+    lambda pem: sign(make_key()[0]),
+], ids=["missing", "malformed", "other_body", "stale", "wrong_key"])
+def test_bad_webhooks_are_rejected(token_for):
+    pem, document = make_key()
+    verifier, _ = make_verifier({"kid-1": document})
+    with pytest.raises(WebhookVerificationError):
+        verify(verifier, BODY, token_for(pem))
+    assert verifier.stats()["rejected"] == 1
+
+
+def test_expired_key_is_refused():
+    pem, document = make_key()
+    verifier, _ = make_verifier({"kid-1": {**document, "expired_at": 1700000000}})
+    with pytest.raises(WebhookVerificationError):
+        verify(verifier, BODY, sign(pem))
+
+
+def test_unknown_kid_is_not_refetched_on_every_request():
+    pem, _ = make_key()
+    verifier, fetches = make_verifier({})
+    for _ in range(3):
+        with pytest.raises(WebhookVerificationError):
+            verify(verifier, BODY, sign(pem, kid="forged"))
+    assert fetches == ["forged"]
+
+
+def test_endpoint_rejects_unsigned_webhooks_without_acting(monkeypatch):
+    from app.routers import plaid
+
+    pem, document = make_key()
+    verifier, _ = make_verifier({"kid-1": document})
+    submitted = []
+    monkeypatch.setattr(plaid, "plaid_webhook_verifier", verifier)
+    monkeypatch.setattr(plaid, "verification_required", lambda: True)
+    monkeypatch.setattr(plaid.webhook_coalescer, "submit", lambda item_id: submitted.append(item_id) or "scheduled")
+    app = FastAPI()
+    app.include_router(plaid.router, prefix="/plaid")
+    client = TestClient(app)
+
+    assert client.post("/plaid/webhook", content=BODY).status_code == 401
+    assert client.post("/plaid/webhook", content=BODY, headers={"Plaid-Verification": sign(pem, body=b"{}")}).status_code == 401
+    assert submitted == []
+
+    response = client.post("/plaid/webhook", content=BODY, headers={"Plaid-Verification": sign(pem)})
+    assert response.status_code == 200
+    assert submitted == ["item-1"]
+
+
+def test_endpoint_submits_off_the_event_loop(monkeypatch):
+    from app.routers import plaid
+
+    on_loop = []
+
+    def submit(item_id):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return "scheduled"
+
+    monkeypatch.setattr(plaid, "verification_required", lambda: False)
+    monkeypatch.setattr(plaid.webhook_coalescer, "submit", submit)
+    app = FastAPI()
+    app.include_router(plaid.router, prefix="/plaid")
+
+    response = TestClient(app).post("/plaid/webhook", content=BODY)
+    assert response.json() == {"status": "scheduled", "item_id": "item-1"}
+    assert on_loop == [False]
@@ -0,0 +1,35 @@
+import asyncio
+import inspect
+import threading
+
+from fastapi import BackgroundTasks
+
+from app.routers import plaid
+
+
+def test_institution_lookup_runs_off_the_event_loop(monkeypatch):
+    threads = []
+    saved = {}
+
+    def record(name, value):
+        threads.append(threading.current_thread())
+        return value
+
+    monkeypatch.setattr(plaid.plaid_service, "get_item_institution_id", lambda token: record("item", "ins_3"))
+    monkeypatch.setattr(plaid.institution_repository, "get_name", lambda institution_id: record("get", None))
+    monkeypatch.setattr(plaid.plaid_service, "get_institution_name_by_id", lambda institution_id: record("plaid", "Bank 3"))
+    monkeypatch.setattr(plaid.institution_repository, "save", lambda institution_id, name: saved.setdefault(institution_id, name))
+    monkeypatch.setattr(plaid.plaid_repository, "update_institution_name",
+                        lambda plaid_user_id, name: record("update", saved.setdefault(plaid_user_id, name)))
+
+    assert not inspect.iscoroutinefunction(plaid._resolve_institution_name)
+
+    async def run():
+        tasks = BackgroundTasks()
+        tasks.add_task(plaid._resolve_institution_name, 5, "access-token")
+        await tasks()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert saved == {"ins_3": "Bank 3", 5: "Bank 3"}
+    assert threads and all(t is not loop_thread for t in threads)
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_current_user_id
+from app.routers import plaid
+
+OWNERS = {"item-mine": 7, "item-theirs": 8}
+
+
+def make_client(monkeypatch, authenticated=True):
+    queued = []
+
+    def enqueue(item_id, pipelined=False):
+        queued.append(item_id)
+        return {"id": f"job-{item_id}", "item_id": item_id, "status": "queued"}
+
+    jobs = {f"job-{item_id}": {"id": f"job-{item_id}", "item_id": item_id, "status": "running"} for item_id in OWNERS}
+    monkeypatch.setattr(plaid.plaid_repository, "get_plaid_user_by_item_id",
+                        lambda item_id: SimpleNamespace(user_id=OWNERS[item_id]) if item_id in OWNERS else None)
+    monkeypatch.setattr(plaid.sync_job_queue, "enqueue", enqueue)
+    monkeypatch.setattr(plaid.sync_job_queue, "get", jobs.get)
+    app = FastAPI()
+    app.include_router(plaid.router, prefix="/plaid")
+    if authenticated:
+        app.dependency_overrides[get_current_user_id] = lambda: 7
+    return TestClient(app), queued
+
+
+def test_sync_item_queues_only_the_callers_items(monkeypatch):
+    client, queued = make_client(monkeypatch)
+    assert client.post("/plaid/sync_item", json={"item_id": "item-mine"}).status_code == 202
+    for item_id in ("item-theirs", "item-unknown"):
+        response = client.post("/plaid/sync_item", json={"item_id": item_id})
+        assert response.status_code == 404
+    assert queued == ["item-mine"]
+
+
+def test_sync_job_is_only_visible_to_the_item_owner(monkeypatch):
+    client, _ = make_client(monkeypatch)
+    assert client.get("/plaid/sync_jobs/job-item-mine").json()["item_id"] == "item-mine"
+    assert client.get("/plaid/sync_jobs/job-item-theirs").status_code == 404
+    assert client.get("/plaid/sync_jobs/job-missing").status_code == 404
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", "/plaid/sync_item", {"item_id": "item-mine"}),
+    ("get", "/plaid/sync_jobs/job-item-mine", None),
+])
+def test_sync_endpoints_require_a_bearer_token(monkeypatch, method, path, body):
+    client, queued = make_client(monkeypatch, authenticated=False)
+    response = client.request(method, path, json=body)
+    assert response.status_code in (401, 403)
+    assert queued == []
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.sync import jobs
+from app.sync.jobs import QUEUED, RUNNING, SUCCEEDED, FAILED, SyncJobQueue, SyncJobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SyncJobStore(str(tmp_path / "sync_jobs.db"))
+
+
+def age_heartbeat(store, job_id, seconds):
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE sync_jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?", (seconds, job_id))
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_create_returns_the_active_job_for_an_item(store):
+    first = store.create("item-1")
+    assert store.create("item-1")["id"] == first["id"]
+    store.claim_next("worker-a")
+    assert store.create("item-1")["id"] == first["id"]
+    assert store.create("item-2")["id"] != first["id"]
+
+
+def test_claim_records_owner_and_heartbeat(store):
+    job = store.create("item-1")
+    claimed = store.claim_next("worker-a")
+    assert claimed["id"] == job["id"]
+    assert claimed["status"] == RUNNING
+    assert claimed["owner"] == "worker-a"
+    assert claimed["heartbeat_at"] is not None
+    assert store.claim_next("worker-b") is None
+
+
+def test_live_jobs_of_other_workers_are_not_requeued(store):
+    job = store.create("item-1")
+    store.claim_next("worker-a")
+    assert store.requeue_stale(stale_seconds=60) == 0
+    assert store.get(job["id"])["status"] == RUNNING
+
+
+def test_stale_jobs_are_requeued_and_their_old_owner_cannot_finish_them(store):
+    job = store.create("item-1")
+    store.claim_next("worker-a")
+    age_heartbeat(store, job["id"], 120)
+    assert store.requeue_stale(stale_seconds=60) == 1
+    assert store.get(job["id"])["status"] == QUEUED
+
+    assert store.claim_next("worker-b")["id"] == job["id"]
+    assert not store.finish(job["id"], "worker-a", result={"added": 1})
+    assert store.finish(job["id"], "worker-b", result={"added": 2})
+    assert store.get(job["id"])["result"] == {"added": 2}
+
+
+def test_heartbeat_keeps_a_slow_job_alive(store):
+    job = store.create("item-1")
+    store.claim_next("worker-a")
+    age_heartbeat(store, job["id"], 120)
+    assert store.heartbeat("worker-a") == 1
+    assert store.requeue_stale(stale_seconds=60) == 0
+
+
+def test_store_adds_columns_to_an_existing_file(tmp_path):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE sync_jobs (id TEXT PRIMARY KEY, item_id TEXT NOT NULL, pipelined INTEGER NOT NULL DEFAULT 0, "
+            "status TEXT NOT NULL, pages_fetched INTEGER NOT NULL DEFAULT 0, rows_written INTEGER NOT NULL DEFAULT 0, "
+            "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+    store = SyncJobStore(path)
+    store.create("item-1")
+    assert store.claim_next("worker-a")["owner"] == "worker-a"
+
+
+def test_queue_runs_jobs_and_records_failures(store, monkeypatch):
+    def sync(item_id, pipelined=False, progress=None):
+        if item_id == "broken":
+            raise RuntimeError("Plaid is down")
+        progress({"pages": 1, "rows_written": 3})
+        return {"added": 3}
+
+    monkeypatch.setattr(jobs.plaid_repository, "sync_item_transactions", sync)
+    queue = SyncJobQueue(lambda: store, workers=2, heartbeat_seconds=0.05, stale_seconds=60)
+    queue.start()
+    try:
+        ok = queue.enqueue("item-1")
+        broken = queue.enqueue("broken")
+        assert wait_for(lambda: queue.get(ok["id"])["status"] == SUCCEEDED)
+        assert wait_for(lambda: queue.get(broken["id"])["status"] == FAILED)
+    finally:
+        queue.stop(timeout=5)
+    assert queue.get(ok["id"])["rows_written"] == 3
+    assert queue.get(broken["id"])["error"] == "Plaid is down"
+
+
+def test_importing_the_queue_does_not_create_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "lazy.db"
+    queue = SyncJobQueue(lambda: SyncJobStore(str(path)), workers=1, heartbeat_seconds=1, stale_seconds=60)
+    assert not path.exists()
+    queue.enqueue("item-1")
+    assert path.exists()
@@ -0,0 +1,52 @@
+import tracemalloc
+
+from app.external_services.plaid_service import plaid_service
+from infra.bench_sync import SyntheticPlaidClient
+from infra.plaid_standin import SyntheticPlaid
+
+PAGE_SIZE = 500
+# scaled down from the 1k -> 500k benchmark (python -m infra.bench_sync_memory) to keep the suite fast
+SMALL, LARGE = 1_000, 10_000
+TOLERANCE = 1.5
+
+
+def peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def stream() -> int:
+    seen = 0
+    for page, _cursor in plaid_service.iter_sync_transactions("access-memory", count=PAGE_SIZE):
+        seen += len(page)
+    return seen
+
+
+def accumulate() -> int:
+    return len(plaid_service.sync_transactions("access-memory", count=PAGE_SIZE)["transactions"])
+
+
+def peaks(fn, monkeypatch):
+    result = []
+    for size in (SMALL, LARGE):
+        plaid = SyntheticPlaid(history=size, accounts_per_item=3, seed=3, modified_rate=0.0, removed_rate=0.0)
+        monkeypatch.setattr(plaid_service, "client", SyntheticPlaidClient(plaid))
+        # warm up so one-off imports and caches do not count toward the smaller run
+        fn()
+        result.append(peak_bytes(fn))
+    return result
+
+
+def test_streaming_peak_memory_is_flat_as_history_grows(monkeypatch):
+    small, large = peaks(stream, monkeypatch)
+    assert large / small <= TOLERANCE, f"streaming peak grew {large / small:.2f}x from {SMALL} to {LARGE} transactions"
+
+
+def test_accumulating_sync_peak_grows_with_history(monkeypatch):
+    # guards the check above: the same measurement does see the accumulating path grow
+    small, large = peaks(accumulate, monkeypatch)
+    assert large / small > TOLERANCE
@@ -0,0 +1,50 @@
+import time
+
+from app.security.encryption import encryption_service
+from app.security.token_cache import TokenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def cached_buffers(cache: TokenCache) -> list:
+    return [value for _, value in cache._cache._data.values()]
+
+
+def test_expired_plaintext_is_zeroed_without_reading_the_key_again():
+    clock = FakeClock()
+    cache = TokenCache(maxsize=16, ttl_seconds=60, clock=clock)
+    cache.stop()
+    assert cache.decrypt(encryption_service.encrypt("access-first")) == "access-first"
+    buffer = cached_buffers(cache)[0]
+    assert bytes(buffer) == b"access-first"
+
+    clock.now += 60
+    # a lookup of a different token sweeps the expired one
+    cache.decrypt(encryption_service.encrypt("access-second"))
+    assert bytes(buffer) == bytes(len(buffer))
+    assert len(cached_buffers(cache)) == 1
+
+    second = cached_buffers(cache)[0]
+    clock.now += 60
+    assert cache.expire() == 1
+    assert bytes(second) == bytes(len(second))
+
+
+def test_idle_cache_is_wiped_by_the_sweeper():
+    cache = TokenCache(maxsize=16, ttl_seconds=0.1)
+    try:
+        cache.decrypt(encryption_service.encrypt("access-idle"))
+        buffer = cached_buffers(cache)[0]
+        deadline = time.monotonic() + 2
+        while any(buffer) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not any(buffer)
+        assert cached_buffers(cache) == []
+    finally:
+        cache.stop()
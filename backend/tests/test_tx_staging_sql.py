@@ -0,0 +1,138 @@
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import mssql
+from sqlalchemy.schema import CreateTable
+
+from app.models.db_models import Transaction
+from app.repositories import plaid_repository as repo_module
+from app.repositories.plaid_repository import (
+    _TX_MERGE,
+    _TX_STAGING_COLUMNS,
+    _TX_STAGING_CREATE,
+    _TX_STAGING_DROP,
+    _TX_STAGING_INSERT,
+    _TX_UPDATE,
+    plaid_repository,
+)
+
+TABLE_COLUMNS = {c.name for c in Transaction.__table__.columns}
+
+
+class FakeCursor:
+    """Records what the staged write sends to pyodbc."""
+
+    def __init__(self, result):
+        self.result = result
+        self.fast_executemany = False
+        self.calls = []
+        self.closed = False
+
+    def execute(self, sql):
+        self.calls.append(("execute", sql))
+
+    def executemany(self, sql, rows):
+        assert self.fast_executemany, "rows must be staged with fast_executemany"
+        self.calls.append(("executemany", sql, list(rows)))
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        self.closed = True
+
+
+def mssql_session(result):
+    cursor = FakeCursor(result)
+    db = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=mssql.dialect()),
+        connection=lambda: SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor)),
+    )
+    return db, cursor
+
+
+def tx(transaction_id, amount=10.0, account_id="acct-1"):
+    return {
+        "transaction_id": transaction_id,
+        "account_id": account_id,
+        "amount": amount,
+        "date": "2024-03-01",
+        "merchant_name": "Shop",
+        "name": "SHOP",
+        "pending": False,
+        "category": ["GENERAL_MERCHANDISE"],
+        "iso_currency_code": "USD",
+    }
+
+
+def column_list(sql, pattern):
+    return [c.strip() for c in re.search(pattern, sql, re.S).group(1).split(",")]
+
+
+def set_columns(sql):
+    assignments = re.search(r"UPDATE (?:t )?SET(.*?)(?:WHEN|FROM)", sql, re.S).group(1)
+    return re.findall(r"t\.(\w+) = s\.\1", assignments)
+
+
+def test_staging_table_matches_the_staging_columns():
+    created = re.findall(r"^\s+(\w+) \w+", _TX_STAGING_CREATE.split("CREATE TABLE #tx_staging (")[1], re.M)
+    assert tuple(created) == _TX_STAGING_COLUMNS
+    assert _TX_STAGING_INSERT.count("?") == len(_TX_STAGING_COLUMNS)
+    assert set(_TX_STAGING_COLUMNS) <= TABLE_COLUMNS
+
+
+def test_merge_and_update_only_touch_real_columns():
+    inserted = column_list(_TX_MERGE, r"INSERT\s*\((.*?)\)\s*VALUES")
+    values = column_list(_TX_MERGE, r"VALUES\s*\((.*?)\)\s*OUTPUT")
+    assert sorted(inserted) == sorted(_TX_STAGING_COLUMNS)
+    assert values == [f"s.{c}" for c in inserted]
+    assert set_columns(_TX_MERGE) == set_columns(_TX_UPDATE)
+    assert set(set_columns(_TX_MERGE)) <= set(_TX_STAGING_COLUMNS) - {"transaction_id", "account_id"}
+    # the statements target the tables the ORM model maps, as compiled for SQL Server
+    ddl = str(CreateTable(Transaction.__table__).compile(dialect=mssql.dialect()))
+    assert ddl.startswith("\nCREATE TABLE transactions")
+    assert "MERGE dbo.transactions" in _TX_MERGE and "FROM dbo.transactions t" in _TX_UPDATE
+
+
+def test_merge_stages_rows_and_runs_in_order():
+    db, cursor = mssql_session((2, 1))
+    index = SimpleNamespace(resolve=lambda db, transactions: set())
+    page = [tx("t1"), tx("t2"), tx("t1", amount=12.5), tx("t3")]
+
+    counts = plaid_repository._merge_transactions(db, page, index)
+
+    assert [c[0] for c in cursor.calls] == ["execute", "executemany", "execute", "execute"]
+    assert cursor.calls[0][1] == _TX_STAGING_CREATE
+    assert cursor.calls[1][1] == _TX_STAGING_INSERT
+    assert cursor.calls[2][1] == _TX_MERGE
+    assert cursor.calls[3][1] == _TX_STAGING_DROP
+    assert cursor.closed
+
+    rows = cursor.calls[1][2]
+    # duplicate ids within a page are collapsed to the last row, which MERGE requires
+    assert [r[0] for r in rows] == ["t1", "t2", "t3"]
+    assert all(len(r) == len(_TX_STAGING_COLUMNS) for r in rows)
+    staged = dict(zip(_TX_STAGING_COLUMNS, rows[0]))
+    assert staged["amount"] == 12.5
+    assert staged["date_posted"] == datetime(2024, 3, 1)
+    assert staged["date_posted"].tzinfo is None
+    assert staged["category"] == "GENERAL_MERCHANDISE"
+    assert staged["is_pending"] == 0
+    # the fourth row was a duplicate: inserted 2 + updated 1 + skipped 1
+    assert counts == {"inserted": 2, "updated": 1, "skipped": 1}
+
+
+def test_update_uses_the_staged_update():
+    db, cursor = mssql_session((1,))
+    counts = plaid_repository._update_transactions(db, [tx("t1"), {"transaction_id": None}])
+    assert cursor.calls[2][1] == _TX_UPDATE
+    assert counts == {"updated": 1, "skipped": 1}
+
+
+def test_other_dialects_need_an_injected_writer(monkeypatch):
+    monkeypatch.setattr(repo_module.PlaidRepository, "portable_writer", None)
+    db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="sqlite")))
+    with pytest.raises(RuntimeError, match="need SQL Server"):
+        plaid_repository._update_transactions(db, [tx("t1")])
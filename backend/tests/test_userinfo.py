@@ -0,0 +1,41 @@
+import time
+from types import SimpleNamespace
+
+from app.security.userinfo import get_userinfo, lookup_userinfo, userinfo_cache
+
+
+class FakeTokenTools:
+    def __init__(self, token):
+        self.token = token
+        self.digest = f"digest-{token}"
+
+    def verified_claim(self):
+        return SimpleNamespace(sub="auth0|me", exp=time.time() + 600)
+
+
+class FakeUsers:
+    def __init__(self):
+        self.calls = 0
+
+    def userinfo(self, access_token):
+        self.calls += 1
+        return {"sub": "auth0|me", "email": "me@example.com", "name": "Me"}
+
+
+def test_only_the_fetching_lookup_reports_a_fetch():
+    userinfo_cache.clear()
+    users = FakeUsers()
+    tools = FakeTokenTools("token-1")
+
+    userinfo, fetched = lookup_userinfo(tools, users)
+    assert fetched is True
+    assert userinfo["email"] == "me@example.com"
+
+    # later requests with the same token are cache hits: no Auth0 call, nothing to persist
+    for _ in range(3):
+        assert lookup_userinfo(tools, users) == (userinfo, False)
+    assert get_userinfo(tools, users) == userinfo
+    assert users.calls == 1
+
+    assert lookup_userinfo(FakeTokenTools("token-2"), users)[1] is True
+    assert users.calls == 2
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from app.sync import jobs
+from app.sync.jobs import QUEUED, RUNNING, SyncJobQueue, SyncJobStore
+from app.sync.webhooks import COALESCED, DEFERRED_RUNNING, DROPPED_QUEUED, SCHEDULED, WebhookCoalescer
+
+
+def make_coalescer(status=None, running_marks=None, debounce=0.05):
+    dispatched = []
+    marked = []
+
+    def mark_rerun(item_id):
+        marked.append(item_id)
+        return running_marks if running_marks is not None else True
+
+    coalescer = WebhookCoalescer(
+        debounce_seconds=debounce,
+        dispatch=dispatched.append,
+        job_status=lambda item_id: status,
+        mark_rerun=mark_rerun,
+    )
+    return coalescer, dispatched, marked
+
+
+def test_burst_is_coalesced_into_one_dispatch():
+    coalescer, dispatched, _ = make_coalescer()
+    assert coalescer.submit("item-1") == SCHEDULED
+    assert coalescer.submit("item-1") == COALESCED
+    assert coalescer.submit("item-2") == SCHEDULED
+    time.sleep(0.2)
+    assert sorted(dispatched) == ["item-1", "item-2"]
+    assert coalescer.stats()["pending"] == 0
+
+
+def test_events_for_a_queued_job_are_dropped():
+    coalescer, dispatched, marked = make_coalescer(status=QUEUED)
+    assert coalescer.submit("item-1") == DROPPED_QUEUED
+    assert marked == []
+    coalescer.flush()
+    assert dispatched == []
+
+
+def test_events_for_a_running_job_mark_it_for_rerun():
+    coalescer, dispatched, marked = make_coalescer(status=RUNNING)
+    assert coalescer.submit("item-1") == DEFERRED_RUNNING
+    assert marked == ["item-1"]
+    coalescer.flush()
+    assert dispatched == []
+
+
+def test_job_finishing_before_the_mark_falls_back_to_scheduling():
+    coalescer, dispatched, _ = make_coalescer(status=RUNNING, running_marks=False)
+    assert coalescer.submit("item-1") == SCHEDULED
+    coalescer.flush()
+    assert dispatched == ["item-1"]
+
+
+def test_flush_dispatches_pending_items_immediately():
+    coalescer, dispatched, _ = make_coalescer(debounce=60)
+    coalescer.submit("item-1")
+    coalescer.flush()
+    assert dispatched == ["item-1"]
+
+
+def test_update_during_a_running_sync_is_synced_afterwards(tmp_path, monkeypatch):
+    store = SyncJobStore(str(tmp_path / "sync_jobs.db"))
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def sync(item_id, pipelined=False, progress=None):
+        runs.append(item_id)
+        if len(runs) == 1:
+            started.set()
+            release.wait(5)
+        return {"added": 0}
+
+    monkeypatch.setattr(jobs.plaid_repository, "sync_item_transactions", sync)
+    queue = SyncJobQueue(lambda: store, workers=1, heartbeat_seconds=0.05, stale_seconds=60)
+    coalescer = WebhookCoalescer(0.01, queue.enqueue, store.active_status, store.mark_rerun)
+    queue.start()
+    try:
+        queue.enqueue("item-1")
+        assert started.wait(5)
+        assert coalescer.submit("item-1") == DEFERRED_RUNNING
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(runs) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        queue.stop(timeout=5)
+    assert runs == ["item-1", "item-1"]
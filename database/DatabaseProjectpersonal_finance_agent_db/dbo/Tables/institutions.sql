@@ -0,0 +1,10 @@
+CREATE TABLE [dbo].[institutions] (
+    [institution_id] NVARCHAR (64)  NOT NULL,
+    [name]           NVARCHAR (255) NOT NULL,
+    [updated_at]     DATETIME2 (7)  DEFAULT (sysutcdatetime()) NULL,
+    PRIMARY KEY CLUSTERED ([institution_id] ASC)
+);
+
+
+GO
+